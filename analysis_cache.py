@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+
+class AnalysisCache:
+    """Persistent memo of AI analyses keyed by a player stat fingerprint
+
+    Entries live in a small SQLite table and are mirrored in memory once
+    read, so repeat lookups never touch disk. The key covers everything
+    that changes the model's answer: the formatted stats, the prompt
+    template version, the model name and the temperature.
+    """
+
+    def __init__(self, db_path: str = 'data/cache/analysis_cache.sqlite',
+                 max_entries: int = 10000):
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.memory = {}  # key -> analysis JSON text
+        self.pending_access = {}  # key -> last access time, flushed lazily
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS analyses (
+                key TEXT PRIMARY KEY,
+                player_name TEXT,
+                analysis TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )""")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_analyses_player "
+                          "ON analyses (player_name)")
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(player_stats: Dict, prompt_version: str, model: str,
+                 temperature: float) -> str:
+        """Fingerprint the inputs that determine an analysis"""
+        canonical = json.dumps({
+            'stats': player_stats,
+            'prompt_version': prompt_version,
+            'model': model,
+            'temperature': temperature
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a cached analysis or None"""
+        with self.lock:
+            text = self.memory.get(key)
+            if text is None:
+                row = self.conn.execute(
+                    "SELECT analysis FROM analyses WHERE key = ?",
+                    (key,)).fetchone()
+                if row is None:
+                    self.misses += 1
+                    return None
+                text = self.memory[key] = row[0]
+            self.pending_access[key] = time.time()
+            self.hits += 1
+        return json.loads(text)
+
+    def put(self, key: str, player_name: str, analysis: Dict):
+        """Store an analysis and evict the least recently used entries"""
+        text = json.dumps(analysis)
+        now = time.time()
+        with self.lock:
+            self.memory[key] = text
+            self._flush_access()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO analyses VALUES (?, ?, ?, ?, ?)",
+                (key, player_name, text, now, now))
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        """Keep at most max_entries rows (caller holds the lock)"""
+        count = self.conn.execute(
+            "SELECT COUNT(*) FROM analyses").fetchone()[0]
+        if count <= self.max_entries:
+            return
+        evicted = self.conn.execute(
+            "SELECT key FROM analyses ORDER BY last_access LIMIT ?",
+            (count - self.max_entries,)).fetchall()
+        self.conn.executemany("DELETE FROM analyses WHERE key = ?", evicted)
+        for (key,) in evicted:
+            self.memory.pop(key, None)
+
+    def _flush_access(self):
+        """Write buffered access times (caller holds the lock)"""
+        if self.pending_access:
+            self.conn.executemany(
+                "UPDATE analyses SET last_access = ? WHERE key = ?",
+                [(t, k) for k, t in self.pending_access.items()])
+            self.pending_access = {}
+
+    def invalidate(self, key: str) -> bool:
+        """Drop a single cached analysis"""
+        with self.lock:
+            self.memory.pop(key, None)
+            self.pending_access.pop(key, None)
+            deleted = self.conn.execute(
+                "DELETE FROM analyses WHERE key = ?", (key,)).rowcount
+            self.conn.commit()
+        return deleted > 0
+
+    def invalidate_player(self, player_name: str) -> int:
+        """Drop every cached analysis for a player"""
+        with self.lock:
+            keys = [row[0] for row in self.conn.execute(
+                "SELECT key FROM analyses WHERE player_name = ?",
+                (player_name,))]
+            for key in keys:
+                self.memory.pop(key, None)
+                self.pending_access.pop(key, None)
+            self.conn.execute("DELETE FROM analyses WHERE player_name = ?",
+                              (player_name,))
+            self.conn.commit()
+        return len(keys)
+
+    def clear(self):
+        """Drop every cached analysis"""
+        with self.lock:
+            self.memory = {}
+            self.pending_access = {}
+            self.conn.execute("DELETE FROM analyses")
+            self.conn.commit()
+
+    def close(self):
+        """Flush access times and close the database"""
+        with self.lock:
+            self._flush_access()
+            self.conn.commit()
+            self.conn.close()
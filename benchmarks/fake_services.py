@@ -0,0 +1,205 @@
+import abc
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from rate_limiter import TokenBucket
+
+
+class FakeService(abc.ABC):
+    """Local HTTP stand-in for a remote API, run on a background thread
+
+    latency is the mean added response time in seconds (jittered by
+    +-50%), rate_limit the allowed requests per second before replying
+    429 with Retry-After (None = unlimited) and error_rate the share of
+    requests answered with a 500. Use it as a context manager; url is
+    the base address to point a client at.
+    """
+
+    def __init__(self, latency: float = 0.0,
+                 rate_limit: Optional[float] = None,
+                 error_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.limiter = (TokenBucket(rate_limit, max(1, int(rate_limit)))
+                        if rate_limit else None)
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {'requests': 0, 'connections': 0, 'throttled': 0,
+                       'errors': 0, 'not_modified': 0}
+
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'  # keep-alive connections
+            # Headers and body go out as separate writes; without
+            # TCP_NODELAY keep-alive replies stall on delayed ACKs
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                service._count('connections')
+
+            def do_GET(self):
+                service._serve(self, 'GET')
+
+            def do_POST(self):
+                service._serve(self, 'POST')
+
+            def log_message(self, format, *args):
+                pass  # keep benchmark output clean
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FakeService':
+        self.thread = threading.Thread(target=self.server.serve_forever,
+                                       daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> 'FakeService':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _count(self, name: str):
+        with self.lock:
+            self.counts[name] += 1
+
+    def _serve(self, handler: BaseHTTPRequestHandler, method: str):
+        """Apply throttling, latency and errors, then answer"""
+        self._count('requests')
+        # Always drain the request body so keep-alive connections stay
+        # usable after an error reply
+        length = int(handler.headers.get('Content-Length') or 0)
+        body = handler.rfile.read(length) if length else b''
+
+        if self.limiter is not None and not self.limiter.try_acquire():
+            self._count('throttled')
+            self._send(handler, 429, b'{"error": "rate limited"}',
+                       {'Retry-After': '1'})
+            return
+
+        with self.lock:
+            delay = self.latency * self.random.uniform(0.5, 1.5)
+            failed = self.random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+        if failed:
+            self._count('errors')
+            self._send(handler, 500, b'{"error": "injected failure"}')
+            return
+
+        status, payload, headers = self.respond(handler, method, body)
+        self._send(handler, status, payload, headers)
+
+    @abc.abstractmethod
+    def respond(self, handler: BaseHTTPRequestHandler, method: str,
+                body: bytes) -> Tuple[int, bytes, Dict[str, str]]:
+        """Build (status, body, headers) for a request"""
+
+    @staticmethod
+    def _send(handler: BaseHTTPRequestHandler, status: int, payload: bytes,
+              headers: Dict[str, str] = None):
+        handler.send_response(status)
+        handler.send_header('Content-Type', 'application/json')
+        handler.send_header('Content-Length', str(len(payload)))
+        for key, value in (headers or {}).items():
+            handler.send_header(key, value)
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+
+class FakeCFBDServer(FakeService):
+    """Fake CollegeFootballData API serving /stats/player/season
+
+    payload_for(year, category) supplies the raw rows; serialized bodies
+    are cached and carry an ETag so conditional requests get a 304.
+    """
+
+    def __init__(self, payload_for: Callable[[int, str], list], **kwargs):
+        super().__init__(**kwargs)
+        self.payload_for = payload_for
+        self.bodies = {}
+
+    def respond(self, handler, method, body):
+        request = urlparse(handler.path)
+        if method != 'GET' or request.path != '/stats/player/season':
+            return 404, b'{"error": "not found"}', {}
+
+        query = parse_qs(request.query)
+        key = (int(query['year'][0]), query.get('category', ['passing'])[0])
+        with self.lock:
+            cached = self.bodies.get(key)
+        if cached is None:
+            payload = json.dumps(self.payload_for(*key)).encode()
+            cached = (payload, f'"{hashlib.sha1(payload).hexdigest()}"')
+            with self.lock:
+                self.bodies[key] = cached
+        payload, etag = cached
+
+        if handler.headers.get('If-None-Match') == etag:
+            self._count('not_modified')
+            return 304, b'', {'ETag': etag}
+        return 200, payload, {'ETag': etag}
+
+
+class FakeDeepSeekServer(FakeService):
+    """Fake DeepSeek chat-completions endpoint
+
+    Replies with a well-formed analysis JSON derived from a hash of the
+    prompt, so repeated prompts get identical answers.
+    """
+
+    def respond(self, handler, method, body):
+        if (method != 'POST' or
+                not handler.path.endswith('/chat/completions')):
+            return 404, b'{"error": "not found"}', {}
+
+        request = json.loads(body or b'{}')
+        prompt = ''.join(message.get('content', '')
+                         for message in request.get('messages', []))
+        digest = int(hashlib.sha1(prompt.encode()).hexdigest(), 16)
+        analysis = {
+            'success_probability': digest % 101,
+            'key_strengths': ['Accuracy', 'Efficiency'],
+            'key_weaknesses': ['Turnovers'],
+            'college_to_nfl_transition': 'Synthetic transition summary',
+            'statistical_indicators': ['Completion percentage',
+                                       'Yards per attempt'],
+            'overall_assessment': 'Synthetic assessment.',
+            'comparisons': 'Synthetic comparison',
+            'development_areas': ['Decision-making', 'Pocket presence']
+        }
+        response = {
+            'id': f"chatcmpl-{digest % 10 ** 12}",
+            'object': 'chat.completion',
+            'model': request.get('model', 'deepseek-chat'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant',
+                            'content': json.dumps(analysis)},
+                'finish_reason': 'stop'
+            }],
+            'usage': {'prompt_tokens': len(prompt) // 4,
+                      'completion_tokens': 120,
+                      'total_tokens': len(prompt) // 4 + 120}
+        }
+        return 200, json.dumps(response).encode(), {}
@@ -0,0 +1,278 @@
+"""Benchmarks for the ETL and enrichment hot paths
+
+Everything runs against local fakes (benchmarks.fake_services) fed by
+synthetic data (benchmarks.synthetic), so no API keys or network are
+needed. Run from the repository root:
+
+    python -m benchmarks.run_benchmarks --qbs 150 1000 10000
+    python -m benchmarks.run_benchmarks --qbs 1000 --latency 0.05 \\
+        --error-rate 0.02 --output data/bench/results.json
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from benchmarks.fake_services import FakeCFBDServer, FakeDeepSeekServer
+from benchmarks.synthetic import SyntheticLeague
+from deepseek_enrichment import DeepSeekEnricher
+from main import QBStatsETL
+from rate_limiter import AdaptiveRateLimiter, TokenBucket
+
+
+class LatencyRecorder:
+    """Wraps a callable and records how long each call takes"""
+
+    def __init__(self):
+        self.samples: List[float] = []
+        self.lock = threading.Lock()
+
+    def wrap(self, func: Callable) -> Callable:
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                with self.lock:
+                    self.samples.append(time.perf_counter() - start)
+        return timed
+
+
+def latency_summary(samples: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/max latency in milliseconds"""
+    if not samples:
+        return {}
+    ms = np.array(samples) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {'p50_ms': round(p50, 3), 'p95_ms': round(p95, 3),
+            'p99_ms': round(p99, 3), 'max_ms': round(ms.max(), 3)}
+
+
+@contextlib.contextmanager
+def quiet(enabled: bool = True):
+    """Swallow the pipeline's progress prints"""
+    if not enabled:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def timed_stage(results: Dict, name: str, rows: Callable[[], int],
+                func: Callable, samples: List[float] = None):
+    """Run func and record wall time, rows and throughput for a stage"""
+    start = time.perf_counter()
+    func()
+    seconds = time.perf_counter() - start
+    row_count = rows()
+    results[name] = {
+        'seconds': round(seconds, 4),
+        'rows': row_count,
+        'rows_per_s': round(row_count / seconds, 1) if seconds else None,
+        **latency_summary(samples or [])
+    }
+
+
+def search_queries(names: List[str], count: int, seed: int) -> List[str]:
+    """Exact, prefix and one-typo queries drawn from real names"""
+    rnd = random.Random(seed)
+    queries = []
+    for i in range(count):
+        name = rnd.choice(names)
+        kind = i % 3
+        if kind == 0:
+            queries.append(name)
+        elif kind == 1:
+            first, last = name.split(' ', 1)
+            queries.append(f"{first[:3]} {last[:4]}")
+        else:
+            pos = rnd.randrange(1, len(name) - 1)
+            queries.append(name[:pos] + name[pos + 1] + name[pos] +
+                           name[pos + 2:])
+    return queries
+
+
+def bench_scale(qb_count: int, args) -> Dict:
+    """Benchmark every stage for one synthetic population size"""
+    years = list(range(args.start_year, args.end_year + 1))
+    league = SyntheticLeague(qb_count, years, seed=args.seed)
+    results = {'qbs': qb_count}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = league.write_nfl_csv(os.path.join(tmp_dir, 'nfl.csv'))
+        service_options = {'latency': args.latency,
+                           'rate_limit': args.server_rate,
+                           'error_rate': args.error_rate, 'seed': args.seed}
+
+        with FakeCFBDServer(league.college_payload,
+                            **service_options) as cfbd, quiet(args.quiet):
+            etl = QBStatsETL('bench-key', csv_path,
+                             max_workers=args.workers, cache_dir=None)
+            etl.base_url = cfbd.url
+            etl.rate_limiter = etl.http.rate_limiter = TokenBucket(
+                rate=args.client_rate, capacity=args.workers)
+            request_timer = LatencyRecorder()
+            etl.rate_limited_request = request_timer.wrap(
+                etl.rate_limited_request)
+
+            timed_stage(results, 'extract_college',
+                        lambda: len(etl.college_stats),
+                        lambda: etl.extract_college_data(years),
+                        request_timer.samples)
+            timed_stage(results, 'extract_nfl', lambda: len(etl.nfl_stats),
+                        etl.extract_nfl_data)
+            timed_stage(results, 'clean',
+                        lambda: len(etl.college_stats) + len(etl.nfl_stats),
+                        lambda: (etl.clean_college_data(),
+                                 etl.clean_nfl_data()))
+            timed_stage(results, 'merge', lambda: len(etl.combined_data),
+                        lambda: (etl.merge_data(), etl.merge_seasons()))
+            timed_stage(results, 'features', lambda: len(etl.feature_table),
+                        etl.build_feature_table)
+            timed_stage(results, 'comparables',
+                        lambda: len(etl.comparable_index),
+                        etl.build_comparable_index)
+            timed_stage(results, 'success_model',
+                        lambda: etl.success_model.training_rows,
+                        etl.build_success_model)
+            etl.close()
+        results['cfbd_server'] = dict(cfbd.counts)
+
+        if etl.combined_data.empty:
+            return results
+
+        names = list(etl.combined_data['player_name'])
+        queries = search_queries(names, args.searches, args.seed)
+        search_timer = LatencyRecorder()
+        search = search_timer.wrap(etl.search_player)
+        with quiet():
+            timed_stage(results, 'search', lambda: len(queries),
+                        lambda: [search(query) for query in queries],
+                        search_timer.samples)
+
+        players = [row for _, row in etl.combined_data.head(
+            args.searches).iterrows()]
+        knn_timer = LatencyRecorder()
+        neighbors = knn_timer.wrap(etl.comparable_index.comparables)
+        timed_stage(results, 'knn', lambda: len(players),
+                    lambda: [neighbors(player) for player in players],
+                    knn_timer.samples)
+
+        if args.enrich:
+            with FakeDeepSeekServer(**service_options) as deepseek, \
+                    quiet(args.quiet):
+                enricher = DeepSeekEnricher('bench-key',
+                                            max_in_flight=args.workers,
+                                            cache_path=None,
+                                            comparable_index=(
+                                                etl.comparable_index),
+                                            success_model=(
+                                                etl.success_model),
+                                            compact_prompt=(
+                                                args.compact_prompt),
+                                            token_budget=args.token_budget)
+                enricher.base_url = f"{deepseek.url}/v1/chat/completions"
+                enricher.rate_limiter = AdaptiveRateLimiter(
+                    rate=args.client_rate, capacity=args.workers,
+                    max_rate=max(args.client_rate, 20.0))
+                enricher.http.rate_limiter = enricher.rate_limiter
+                call_timer = LatencyRecorder()
+                enricher._make_api_call = call_timer.wrap(
+                    enricher._make_api_call)
+                players = etl.combined_data.head(args.enrich)
+                timed_stage(results, 'enrich', lambda: len(players),
+                            lambda: enricher.enrich_dataset(players),
+                            call_timer.samples)
+                tokens = enricher.tokens
+                results['tokens'] = {
+                    'calls': len(tokens.calls),
+                    'prompt': tokens.prompt_tokens,
+                    'completion': tokens.completion_tokens,
+                    'per_call': (round(tokens.used / len(tokens.calls), 1)
+                                 if tokens.calls else None),
+                    'refused': tokens.refused}
+                enricher.close()
+            results['deepseek_server'] = dict(deepseek.counts)
+    return results
+
+
+def print_results(results: Dict):
+    """Human-readable table for one population size"""
+    print(f"\n{results['qbs']:,} QBs")
+    print(f"  {'stage':<16}{'seconds':>9}{'rows':>10}{'rows/s':>12}"
+          f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for stage in ['extract_college', 'extract_nfl', 'clean', 'merge',
+                  'features', 'comparables', 'success_model', 'search',
+                  'knn', 'enrich']:
+        if stage not in results:
+            continue
+        row = results[stage]
+        cells = [f"{row.get(key, ''):>9}" for key in
+                 ['p50_ms', 'p95_ms', 'p99_ms']]
+        print(f"  {stage:<16}{row['seconds']:>9.3f}{row['rows']:>10}"
+              f"{row['rows_per_s'] or 0:>12.1f}{''.join(cells)}")
+    for server in ['cfbd_server', 'deepseek_server', 'tokens']:
+        if server in results:
+            counts = ', '.join(f"{key}={value}" for key, value
+                               in results[server].items())
+            print(f"  {server}: {counts}")
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark the QB ETL and enrichment against local "
+                    "fake services")
+    parser.add_argument('--qbs', type=int, nargs='+', default=[150, 1000],
+                        help="Synthetic QB counts to benchmark "
+                             "(e.g. 150 1000 10000 100000)")
+    parser.add_argument('--start-year', type=int, default=2001)
+    parser.add_argument('--end-year', type=int, default=2023)
+    parser.add_argument('--workers', type=int, default=8,
+                        help="Concurrent requests for both clients")
+    parser.add_argument('--latency', type=float, default=0.01,
+                        help="Mean fake server latency in seconds")
+    parser.add_argument('--server-rate', type=float, default=None,
+                        help="Fake server rate limit in requests/s "
+                             "(429 beyond it)")
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help="Share of requests answered with a 500")
+    parser.add_argument('--client-rate', type=float, default=200.0,
+                        help="Client-side rate limit in requests/s")
+    parser.add_argument('--searches', type=int, default=1000,
+                        help="Search queries per population size")
+    parser.add_argument('--enrich', type=int, default=50,
+                        help="Players to enrich (0 skips enrichment)")
+    parser.add_argument('--compact-prompt', action='store_true',
+                        help="Enrich with the compact prompt")
+    parser.add_argument('--token-budget', type=int, default=None,
+                        help="Total DeepSeek token budget for enrichment")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Also write results as JSON here")
+    parser.add_argument('--verbose', dest='quiet', action='store_false',
+                        help="Show the pipeline's progress output")
+    args = parser.parse_args(argv)
+
+    all_results = []
+    for qb_count in args.qbs:
+        results = bench_scale(qb_count, args)
+        print_results(results)
+        all_results.append(results)
+
+    if args.output:
+        os.makedirs(os.path.dirname(args.output) or '.', exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'args': vars(args), 'results': all_results}, f,
+                      indent=2)
+        print(f"\nResults written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,148 @@
+import random
+from typing import Dict, List
+
+import pandas as pd
+
+FIRST_NAMES = ['Aaron', 'Bailey', 'Caleb', 'Drew', 'Eli', 'Fernando',
+               'Garrett', 'Hunter', 'Isaiah', 'Jalen', 'Kyler', 'Logan',
+               'Marcus', 'Nathan', 'Owen', 'Patrick', 'Quinn', 'Russell',
+               'Spencer', 'Trevor', 'Tyler', 'Vince', 'Wesley', 'Zach']
+LAST_SYLLABLES = ['al', 'ber', 'cor', 'dan', 'ell', 'fitz', 'gar', 'har',
+                  'ing', 'jack', 'kel', 'lan', 'mor', 'ney', 'son', 'ton',
+                  'ver', 'wick', 'ley', 'ford', 'man', 'ridge', 'stone']
+CONFERENCES = ['SEC', 'Big Ten', 'ACC', 'Big 12', 'Pac-12', 'Mountain West',
+               'American Athletic', 'Sun Belt', 'Mid-American',
+               'Conference USA']
+NFL_TEAMS = ['ARI', 'ATL', 'BAL', 'BUF', 'CAR', 'CHI', 'CIN', 'CLE', 'DAL',
+             'DEN', 'DET', 'GNB', 'HOU', 'IND', 'JAX', 'KAN', 'LVR', 'LAC',
+             'LAR', 'MIA', 'MIN', 'NWE', 'NOR', 'NYG', 'NYJ', 'PHI', 'PIT',
+             'SFO', 'SEA', 'TAM', 'TEN', 'WAS']
+
+
+def make_names(count: int, seed: int = 0) -> List[str]:
+    """Distinct, name-like player names"""
+    rnd = random.Random(seed)
+    names = set()
+    while len(names) < count:
+        last = ''.join(rnd.choice(LAST_SYLLABLES)
+                       for _ in range(rnd.randint(2, 3))).title()
+        names.add(f"{rnd.choice(FIRST_NAMES)} {last}")
+    return sorted(names)
+
+
+class SyntheticLeague:
+    """Deterministic synthetic QB population for benchmarks
+
+    Every QB gets a one to four season college career inside years; a
+    fraction of them go on to an NFL career starting the season after.
+    college_payload() mimics the CollegeFootballData /stats/player/season
+    response and write_nfl_csv() the Pro Football Reference passing CSV.
+    """
+
+    def __init__(self, qb_count: int, years: List[int], seed: int = 0,
+                 nfl_share: float = 0.2, non_qb_share: float = 0.1):
+        self.years = sorted(years)
+        self.seed = seed
+        rnd = random.Random(seed)
+        self.players = []
+        for index, name in enumerate(make_names(qb_count, seed)):
+            start = rnd.choice(self.years)
+            seasons = rnd.randint(1, 4)
+            self.players.append({
+                'player_id': str(100000 + index),
+                'name': name,
+                'team': f"{name.split()[1][:4]} State",
+                'conference': rnd.choice(CONFERENCES),
+                'college_years': [year for year in range(start,
+                                                         start + seasons)
+                                  if year in self.years],
+                'nfl': rnd.random() < nfl_share,
+                'skill': rnd.gauss(0, 1)
+            })
+        # Non-QB rows the extractor has to filter out
+        self.non_qbs = int(qb_count * non_qb_share)
+
+    def qb_count_for(self, year: int) -> int:
+        """QBs with a college season in year"""
+        return sum(1 for player in self.players
+                   if year in player['college_years'])
+
+    def college_payload(self, year: int, category: str) -> List[Dict]:
+        """Raw per-stat rows for one season and stat category"""
+        rnd = random.Random(f"{self.seed}-{year}-{category}")
+        rows = []
+
+        def add(player, position, stats):
+            for stat_type, value in stats.items():
+                rows.append({
+                    'season': year, 'playerId': player['player_id'],
+                    'player': player['name'], 'position': position,
+                    'team': player['team'],
+                    'conference': player['conference'],
+                    'category': category, 'statType': stat_type,
+                    'stat': str(value)
+                })
+
+        for player in self.players:
+            if year not in player['college_years']:
+                continue
+            attempts = max(10, int(rnd.gauss(300, 100)))
+            if category == 'passing':
+                completions = int(attempts * min(0.75, max(
+                    0.4, rnd.gauss(0.6 + 0.03 * player['skill'], 0.05))))
+                yards = int(attempts * max(4.0, rnd.gauss(
+                    7.5 + 0.5 * player['skill'], 1.0)))
+                add(player, 'QB', {
+                    'ATT': attempts, 'COMPLETIONS': completions,
+                    'YDS': yards, 'TD': max(0, int(yards / 130 +
+                                                   rnd.gauss(0, 3))),
+                    'INT': max(0, int(rnd.gauss(8, 3))),
+                    'YPA': round(yards / attempts, 1),
+                    'PCT': round(completions / attempts, 3)
+                })
+            elif category == 'rushing':
+                carries = max(0, int(rnd.gauss(60, 30)))
+                add(player, 'QB', {'CAR': carries,
+                                   'YDS': int(carries * rnd.gauss(4, 1.5)),
+                                   'TD': max(0, int(rnd.gauss(3, 2)))})
+            elif category == 'fumbles':
+                fumbles = max(0, int(rnd.gauss(3, 2)))
+                add(player, 'QB', {'FUM': fumbles,
+                                   'LOST': rnd.randint(0, fumbles)})
+
+        for index in range(self.non_qbs):
+            filler = {'player_id': str(900000 + index),
+                      'name': f"Receiver {index}", 'team': 'Filler Tech',
+                      'conference': 'SEC'}
+            add(filler, 'WR', {'YDS': rnd.randint(0, 1500)})
+        return rows
+
+    def nfl_frame(self) -> pd.DataFrame:
+        """NFL passing seasons in the Pro Football Reference layout"""
+        rnd = random.Random(f"{self.seed}-nfl")
+        rows = []
+        for player in self.players:
+            if not player['nfl'] or not player['college_years']:
+                continue
+            rookie_year = player['college_years'][-1] + 1
+            for year in range(rookie_year,
+                              rookie_year + rnd.randint(1, 8)):
+                attempts = max(20, int(rnd.gauss(400, 150)))
+                completions = int(attempts * rnd.uniform(0.55, 0.7))
+                yards = int(attempts * rnd.gauss(
+                    6.8 + 0.4 * player['skill'], 0.8))
+                rows.append({
+                    'Player': player['name'], 'Tm': rnd.choice(NFL_TEAMS),
+                    'G': rnd.randint(1, 17), 'Cmp': completions,
+                    'Att': attempts, 'Yds': yards,
+                    'TD': max(0, int(yards / 170 + rnd.gauss(0, 3))),
+                    'Int': max(0, int(rnd.gauss(11, 4))),
+                    'Rate': round(rnd.gauss(85 + 8 * player['skill'], 8), 1),
+                    'Year': year
+                })
+        return pd.DataFrame(rows)
+
+    def write_nfl_csv(self, path: str) -> str:
+        """Write the NFL passing CSV the ETL reads"""
+        self.nfl_frame().to_csv(path)
+        return path
@@ -0,0 +1,319 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# College career stats that make up a QB's comparison vector
+COMPARABLE_FEATURES = ['college_pass_attempts', 'college_pass_yards',
+                       'college_pass_tds', 'college_interceptions',
+                       'college_completion_pct', 'college_td_int_ratio',
+                       'college_yards_per_attempt']
+
+# Career columns returned with each neighbor
+NEIGHBOR_COLUMNS = ['player_name', 'college_team', 'college_conference',
+                    'college_start_year', 'college_end_year', 'nfl_games',
+                    'nfl_pass_yards', 'nfl_pass_tds', 'nfl_qb_rating',
+                    'nfl_yards_per_attempt']
+
+
+class ComparableIndex:
+    """k-nearest-neighbor index of merged QBs by college profile
+
+    Each career row becomes a vector of COMPARABLE_FEATURES standardized
+    to z-scores, so yards and percentages weigh the same. Vectors are
+    split into leaves of at most leaf_size by recursive median splits
+    on the widest dimension (a flattened KD-tree). A query computes the
+    distance from the query vector to every leaf's bounding box in one
+    vectorized step, then scans leaves nearest-first and stops once no
+    remaining leaf can beat the current k-th neighbor, so results are
+    exact. With fewer than leaf_size players this is a brute-force scan.
+    """
+
+    def __init__(self, careers: pd.DataFrame,
+                 features: List[str] = None, leaf_size: int = 64):
+        features = COMPARABLE_FEATURES if features is None else features
+        self.features = [col for col in features if col in careers.columns]
+        self.careers = careers.reset_index(drop=True)
+
+        values = self.careers[self.features].to_numpy(dtype='float64',
+                                                      na_value=np.nan)
+        self.mean = np.nanmean(values, axis=0) if len(values) else None
+        self.std = np.nanstd(values, axis=0) if len(values) else None
+        if self.std is not None:
+            self.std[~(self.std > 0)] = 1.0
+        points = self._standardize(values)
+
+        order, leaves = self._partition(points, leaf_size)
+        self.points = points[order]
+        self.rows = order  # position in self.points -> career row
+        self.leaf_bounds = np.array(leaves, dtype=np.int64).reshape(-1, 2)
+        self.leaf_lo = np.array([self.points[start:end].min(axis=0)
+                                 for start, end in leaves],
+                                dtype=np.float32).reshape(-1, points.shape[1])
+        self.leaf_hi = np.array([self.points[start:end].max(axis=0)
+                                 for start, end in leaves],
+                                dtype=np.float32).reshape(-1, points.shape[1])
+        # Plain arrays, so building a neighbor frame skips pandas indexing
+        self.columns = {col: self.careers[col].to_numpy()
+                        for col in NEIGHBOR_COLUMNS
+                        if col in self.careers.columns}
+        self.positions = {name: position for position, name in
+                          enumerate(self.careers['player_name']
+                                    .astype(str).to_numpy()[order])}
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def _standardize(self, values: np.ndarray) -> np.ndarray:
+        """z-scores with missing stats at the population mean"""
+        if self.mean is None:
+            return np.zeros((0, len(self.features)), dtype=np.float32)
+        z = (values - self.mean) / self.std
+        return np.nan_to_num(z, nan=0.0).astype(np.float32)
+
+    @staticmethod
+    def _partition(points: np.ndarray, leaf_size: int
+                   ) -> Tuple[np.ndarray, List[Tuple[int, int]]]:
+        """Row order that makes each leaf a contiguous slice, and the
+        (start, end) of every leaf"""
+        order = np.arange(len(points))
+        leaves = []
+        stack = [(0, len(points))] if len(points) else []
+        while stack:
+            start, end = stack.pop()
+            if end - start <= leaf_size:
+                leaves.append((start, end))
+                continue
+            block = points[order[start:end]]
+            dim = int(np.argmax(block.max(axis=0) - block.min(axis=0)))
+            middle = (end - start) // 2
+            split = np.argpartition(block[:, dim], middle)
+            order[start:end] = order[start:end][split]
+            stack.append((start + middle, end))
+            stack.append((start, start + middle))
+        return order, leaves
+
+    def vector(self, player_data: pd.Series) -> np.ndarray:
+        """Standardized comparison vector for a player row"""
+        values = np.array([[player_data.get(col, np.nan)
+                            for col in self.features]], dtype='float64')
+        return self._standardize(values).reshape(-1)
+
+    def _leaf_positions(self, leaves: np.ndarray) -> np.ndarray:
+        """Point positions of all the given leaves"""
+        starts, ends = self.leaf_bounds[leaves].T
+        lengths = ends - starts
+        offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return offsets + np.arange(lengths.sum())
+
+    def search(self, query: np.ndarray, k: int = 5,
+               exclude: Optional[int] = None,
+               probe: int = 8) -> Tuple[np.ndarray, np.ndarray]:
+        """Career rows and distances of the k nearest vectors to query,
+        skipping point position exclude
+
+        The probe leaves nearest to the query give an upper bound on the
+        k-th distance; a second pass scans every other leaf whose box
+        lies within that bound.
+        """
+        if not len(self.points):
+            return np.array([], dtype=np.int64), np.array([])
+        box_gap = (np.maximum(self.leaf_lo - query, 0) +
+                   np.maximum(query - self.leaf_hi, 0))
+        lower_bounds = (box_gap * box_gap).sum(axis=1)
+
+        probe = min(probe, len(lower_bounds))
+        first = np.argpartition(lower_bounds, probe - 1)[:probe]
+        positions = self._leaf_positions(first)
+        distances = self._distances(query, positions, exclude)
+        if len(distances) >= k:
+            bound = np.partition(distances, k - 1)[k - 1]
+            lower_bounds[first] = np.inf
+            rest = np.flatnonzero(lower_bounds <= bound)
+        else:
+            rest = np.setdiff1d(np.arange(len(lower_bounds)), first)
+        if len(rest):
+            more = self._leaf_positions(rest)
+            positions = np.concatenate([positions, more])
+            distances = np.concatenate(
+                [distances, self._distances(query, more, exclude)])
+
+        count = min(k, len(distances))
+        nearest = np.argpartition(distances, count - 1)[:count]
+        nearest = nearest[np.argsort(distances[nearest], kind='stable')]
+        nearest = nearest[np.isfinite(distances[nearest])]
+        return self.rows[positions[nearest]], np.sqrt(distances[nearest])
+
+    def _distances(self, query: np.ndarray, positions: np.ndarray,
+                   exclude: Optional[int]) -> np.ndarray:
+        """Squared distances from query to the points at positions"""
+        diff = self.points[positions] - query
+        distances = (diff * diff).sum(axis=1)
+        if exclude is not None:
+            distances[positions == exclude] = np.inf
+        return distances
+
+    def search_batch(self, queries: np.ndarray, k: int = 5,
+                     exclude: Optional[np.ndarray] = None,
+                     block_size: int = 32, probe: int = 8,
+                     slack: int = 4) -> Tuple[np.ndarray, np.ndarray]:
+        """search() for every row of queries at once
+
+        Returns (len(queries), k) arrays of career rows and distances,
+        nearest first; rows past the available neighbors are -1 with an
+        infinite distance. exclude holds the point position to skip for
+        each query (-1 for none).
+
+        Queries are split into blocks with the same median partitioning
+        as the index; each block scans its probe nearest leaves by
+        box-to-box lower bound, then every leaf that could still hold a
+        neighbor of one of its queries. Scans use one matrix product per
+        block; the k + slack best candidates of each query are then
+        re-ranked on the exact distances search() uses.
+        """
+        count = len(queries)
+        rows = np.full((count, k), -1, dtype=np.int64)
+        distances = np.full((count, k), np.inf)
+        if not len(self.points) or not count:
+            return rows, distances
+        if exclude is None:
+            exclude = np.full(count, -1, dtype=np.int64)
+
+        points = self.points.astype('float64')
+        norms = (points * points).sum(axis=1)
+        order, blocks = self._partition(queries, block_size)
+        probe = min(probe, len(self.leaf_bounds))
+        for start, end in blocks:
+            members = order[start:end]
+            block = queries[members]
+            box_gap = (np.maximum(self.leaf_lo - block.max(axis=0), 0) +
+                       np.maximum(block.min(axis=0) - self.leaf_hi, 0))
+            lower_bounds = (box_gap * box_gap).sum(axis=1)
+
+            first = np.argpartition(lower_bounds, probe - 1)[:probe]
+            positions = self._leaf_positions(first)
+            scan = self._scan_distances(block, positions, exclude[members],
+                                        points, norms)
+            if len(positions) >= k:
+                # Padded so rounding in the scan can not prune a leaf
+                # holding a true neighbor
+                bound = np.partition(scan, k - 1, axis=1)[:, k - 1]
+                bound = bound * (1 + 1e-6) + 1e-6
+            else:
+                bound = np.full(len(block), np.inf)
+            candidates = lower_bounds <= bound.max()
+            candidates[first] = False
+            rest = np.flatnonzero(candidates)
+            if len(rest):
+                # Keep only leaves some query in the block can still use
+                query_gap = (
+                    np.maximum(self.leaf_lo[rest] - block[:, None, :], 0) +
+                    np.maximum(block[:, None, :] - self.leaf_hi[rest], 0))
+                needed = ((query_gap * query_gap).sum(axis=2) <=
+                          bound[:, None]).any(axis=0)
+                rest = rest[needed]
+            if len(rest):
+                more = self._leaf_positions(rest)
+                positions = np.concatenate([positions, more])
+                scan = np.concatenate(
+                    [scan, self._scan_distances(block, more, exclude[members],
+                                                points, norms)], axis=1)
+
+            shortlist = min(k + slack, len(positions))
+            nearest = positions[np.argpartition(scan, shortlist - 1,
+                                                axis=1)[:, :shortlist]]
+            diff = self.points[nearest] - block[:, None, :]
+            exact = (diff * diff).sum(axis=2)
+            exact[nearest == exclude[members][:, None]] = np.inf
+            ranked = np.argsort(exact, axis=1, kind='stable')
+            found = min(k, shortlist)
+            nearest = np.take_along_axis(nearest, ranked, axis=1)[:, :found]
+            exact = np.take_along_axis(exact, ranked, axis=1)[:, :found]
+            block_rows = self.rows[nearest]
+            block_rows[~np.isfinite(exact)] = -1
+            rows[members, :found] = block_rows
+            distances[members, :found] = np.sqrt(exact)
+        return rows, distances
+
+    @staticmethod
+    def _scan_distances(block: np.ndarray, positions: np.ndarray,
+                        exclude: np.ndarray, points: np.ndarray,
+                        norms: np.ndarray) -> np.ndarray:
+        """Squared distances from each query in block (rows) to the
+        points at positions (columns), as one matrix product"""
+        block = block.astype('float64')
+        distances = ((block * block).sum(axis=1)[:, None] + norms[positions] -
+                     2 * block @ points[positions].T)
+        distances[positions[None, :] == exclude[:, None]] = np.inf
+        return distances
+
+    def _nearest(self, player_data: pd.Series,
+                 k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Rows and distances of a player's k nearest other QBs"""
+        return self.search(
+            self.vector(player_data), k,
+            exclude=self.positions.get(str(player_data.get('player_name'))))
+
+    def neighbors(self, player_data: pd.Series, k: int = 5) -> pd.DataFrame:
+        """The k QBs with the most similar college profile (excluding the
+        player themself) with their NFL outcomes, nearest first"""
+        rows, distances = self._nearest(player_data, k)
+        result = {col: values[rows] for col, values in self.columns.items()}
+        result['distance'] = distances.astype('float64')
+        return pd.DataFrame(result)
+
+    def comparables(self, player_data: pd.Series, k: int = 5) -> List[Dict]:
+        """neighbors() as JSON-friendly dicts for prompts and cache keys,
+        without the cost of building a DataFrame"""
+        rows, distances = self._nearest(player_data, k)
+        zeros = np.zeros(len(self.points))
+        games = self.columns.get('nfl_games', zeros)[rows]
+        ratings = self.columns.get('nfl_qb_rating', zeros)[rows]
+        return [{'name': str(name), 'nfl_games': int(game_count),
+                 'nfl_qb_rating': round(float(rating), 1),
+                 'distance': round(float(distance), 2)}
+                for name, game_count, rating, distance in zip(
+                    self.columns['player_name'][rows], games, ratings,
+                    distances)]
+
+    def comparables_batch(self, frame: pd.DataFrame,
+                          k: int = 5) -> List[List[Dict]]:
+        """comparables() for every row of frame, with one batched
+        search instead of a search per player"""
+        columns = [frame[col].to_numpy(dtype='float64', na_value=np.nan)
+                   if col in frame.columns else np.full(len(frame), np.nan)
+                   for col in self.features]
+        values = np.array(columns).reshape(len(columns), len(frame)).T
+        names = (frame['player_name'].astype(str).to_numpy()
+                 if 'player_name' in frame.columns
+                 else np.full(len(frame), ''))
+        exclude = np.array([self.positions.get(name, -1) for name in names],
+                           dtype=np.int64)
+        rows, distances = self.search_batch(self._standardize(values), k,
+                                            exclude)
+        if not len(self.points):
+            return [[] for _ in range(len(frame))]
+
+        found = rows >= 0
+        rows = np.where(found, rows, 0)
+        zeros = np.zeros(len(self.careers))
+        games = self.columns.get('nfl_games', zeros)[rows].tolist()
+        ratings = (self.columns.get('nfl_qb_rating', zeros)[rows]
+                   .astype('float64').tolist())
+        neighbor_names = self.columns['player_name'][rows].tolist()
+        distances = distances.tolist()
+        return [[{'name': str(neighbor_names[i][j]),
+                  'nfl_games': int(games[i][j]),
+                  'nfl_qb_rating': round(ratings[i][j], 1),
+                  'distance': round(distances[i][j], 2)}
+                 for j in range(int(found[i].sum()))]
+                for i in range(len(frame))]
+
+
+def describe_comparables(comparables: List[Dict]) -> str:
+    """One-line summary of a ComparableIndex.comparables list"""
+    if not comparables:
+        return 'Statistical comparison unavailable'
+    return 'Closest college profiles: ' + '; '.join(
+        f"{player['name']} ({player['nfl_games']} NFL games, "
+        f"{player['nfl_qb_rating']:.1f} rating)" for player in comparables)
@@ -1,29 +1,207 @@
+import numpy as np
 import pandas as pd
 import requests
-import time
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from analysis_cache import AnalysisCache
+from comparables import ComparableIndex, describe_comparables
+from rate_limiter import AdaptiveRateLimiter
+from resilient_http import (CircuitBreaker, ResilientHTTPClient, 
+                            make_session, never_sent)
+from success_model import SuccessModel
+from token_budget import TokenBudget, estimate_tokens
+
+# analysis_source of every analysis -> what produced it
+ANALYSIS_SOURCES = {
+    'llm': 'DeepSeek AI',
+    'local_model': 'local success model',
+    'fallback': 'rule-based fallback'
+}
 
 
 class DeepSeekEnricher:
     """Uses DeepSeek AI to analyze QB performance and predict NFL success 
     factors"""
     
-    def __init__(self, api_key: str):
+    # Bump whenever _create_analysis_prompt changes so cached analyses 
+    # from the old prompt are not reused
+    PROMPT_VERSION = '1'
+    
+    SYSTEM_PROMPT = ("You are an expert NFL quarterback analyst "
+                     "specializing in statistical analysis of "
+                     "college-to-NFL transitions. Provide detailed, "
+                     "data-driven insights based solely on the "
+                     "provided statistics.")
+    
+    # Task and response schema of the compact prompt. They go in the 
+    # system message, so every call shares the same prefix and the 
+    # provider's prompt cache can serve it; {comparisons} is empty when 
+    # comparisons are computed locally
+    COMPACT_INSTRUCTIONS = (
+        "\nAnalyze the quarterback's college-to-NFL transition from the "
+        "statistics in the user message and the factors behind their NFL "
+        "success or failure. Avoid speculation about non-statistical "
+        "factors. Percentiles are 0-100 vs all QBs / same conference; "
+        "comparable QBs have the closest college stats.\n"
+        "Reply with JSON only, keeping every string brief:\n"
+        "success_probability: integer 0-100, likelihood of NFL success "
+        "based on college stats\n"
+        "key_strengths: 2-4 strengths\n"
+        "key_weaknesses: 1-3 weaknesses\n"
+        "college_to_nfl_transition: how well the stats translated\n"
+        "statistical_indicators: 2-3 stats that predicted the outcome\n"
+        "overall_assessment: 2-3 sentences on the career trajectory\n"
+        "{comparisons}"
+        "development_areas: 2-3 areas that needed improvement")
+    COMPACT_COMPARISONS = ("comparisons: comparison to typical successful/"
+                           "unsuccessful NFL QBs with similar stats\n")
+    
+    # Completion cap per call; the compact schema asks for brief strings
+    MAX_TOKENS = 1000
+    COMPACT_MAX_TOKENS = 500
+    
+    # Career metrics whose peer percentiles are passed to the model when 
+    # the player row carries FeatureTable columns
+    PERCENTILE_METRICS = {
+        'college_completion_pct': 'College Completion %',
+        'college_td_int_ratio': 'College TD/INT Ratio',
+        'college_yards_per_attempt': 'College Yards/Attempt',
+        'college_pass_yards': 'College Pass Yards',
+        'nfl_completion_percentage': 'NFL Completion %',
+        'nfl_yards_per_attempt': 'NFL Yards/Attempt',
+        'nfl_qb_rating': 'NFL QB Rating'
+    }
+    
+    # College metrics flagged as strengths / weaknesses when they rank in 
+    # the top / bottom PEER_TAIL percent of the player's conference
+    PEER_RANKED_METRICS = {
+        'college_completion_pct': 'completion percentage',
+        'college_td_int_ratio': 'TD/INT ratio',
+        'college_yards_per_attempt': 'yards per attempt'
+    }
+    PEER_TAIL = 10
+    
+    # Placeholder returned by _parse_response when the reply is unusable
+    PARSE_FAILURE_ANALYSIS = {
+        'success_probability': 50,
+        'key_strengths': ['Statistical analysis unavailable'],
+        'key_weaknesses': ['Analysis parsing failed'],
+        'college_to_nfl_transition': 'Unable to analyze transition',
+        'statistical_indicators': ['Data processing error'],
+        'overall_assessment': 'Analysis could not be completed',
+        'comparisons': 'Comparison data unavailable',
+        'development_areas': ['Analysis incomplete']
+    }
+    
+    def __init__(self, api_key: str, max_in_flight: int = 8, 
+                 cache_path: Optional[str] = 
+                 'data/cache/analysis_cache.sqlite', 
+                 pool_size: Optional[int] = None, 
+                 comparable_index: Optional[ComparableIndex] = None, 
+                 success_model: Optional[SuccessModel] = None, 
+                 screen_band: Tuple[float, float] = (0.2, 0.8), 
+                 compact_prompt: bool = False, 
+                 token_budget: Optional[int] = None, 
+                 max_tokens: Optional[int] = None):
         self.api_key = api_key
         self.base_url = "https://api.deepseek.com/v1/chat/completions"
+        self.model = "deepseek-chat"
+        self.temperature = 0.3
         self.headers = {
             "Authorization": f"Bearer {api_key}",
             "Content-Type": "application/json"
         }
-        self.rate_limit_delay = 1.0  # Adjust based on API limits
+        self.rate_limit_delay = 1.0  # Starting delay, adapts to 429s
+        self.max_in_flight = max_in_flight  # concurrent API calls
+        self.max_retries = 3  # per call, for 429s and transient errors
+        
+        # Start at one call per rate_limit_delay and let the limiter 
+        # climb until the provider pushes back with 429s
+        self.rate_limiter = AdaptiveRateLimiter(
+            rate=1.0 / self.rate_limit_delay, capacity=max_in_flight)
+        
+        # Keep-alive, gzip-enabled connection pool, by default sized to 
+        # the in-flight limit so concurrent calls never queue for a 
+        # connection or pay a fresh TLS handshake
+        self.session = make_session(pool_size or max_in_flight, 
+                                    headers=self.headers)
+        
+        # Rate limiting, retries with backoff and a circuit breaker that 
+        # sends players straight to the rule-based fallback while the 
+        # API is down
+        self.http = ResilientHTTPClient(
+            self.rate_limiter, session=self.session, 
+            max_retries=self.max_retries, breaker=CircuitBreaker())
+        
+        # Persistent memo of previous analyses (cache_path=None disables)
+        self.cache = AnalysisCache(cache_path) if cache_path else None
+        
+        # Locally computed comparable QBs fill the "comparisons" field 
+        # instead of the model (None asks the model for them)
+        self.comparable_index = comparable_index
+        self.comparable_count = 5
+        
+        # Local success model that pre-screens enrich_dataset: players it 
+        # scores outside screen_band are analyzed locally and only the 
+        # ambiguous ones go to the API (None sends everyone)
+        self.success_model = success_model
+        self.screen_band = screen_band
+        
+        # Compact prompts put the instructions and schema in a fixed 
+        # system prompt and send each player as a few short lines
+        self.compact_prompt = compact_prompt
+        self.max_tokens = max_tokens or (
+            self.COMPACT_MAX_TOKENS if compact_prompt else self.MAX_TOKENS)
+        
+        # Per-call token usage; calls that would overrun token_budget 
+        # (None = unlimited) are not sent and fall back to local analysis
+        self.tokens = TokenBudget(token_budget)
 
-    def analyze_player(self, player_data: pd.Series) -> Dict[str, any]:
-        """Analyze a single player using DeepSeek AI"""
+    @property
+    def prompt_version(self) -> str:
+        """Cache key component for the prompt template in use"""
+        return (f"{self.PROMPT_VERSION}-compact" if self.compact_prompt 
+                else self.PROMPT_VERSION)
+
+    def close(self):
+        """Close the connection pool and the analysis cache"""
+        self.http.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def analyze_player(self, player_data: pd.Series, 
+                       screen: bool = True) -> Dict[str, any]:
+        """Analyze a single player using DeepSeek AI
         
+        A cached DeepSeek analysis always wins. Otherwise, with a success 
+        model set (and screen=True), a player the model scores outside 
+        screen_band gets the local analysis and no API call is made. 
+        analysis_source in the result tells which produced it (see 
+        ANALYSIS_SOURCES).
+        """
         # Prepare player stats for analysis
         player_stats = self._format_player_stats(player_data)
         
+        # Same stats, prompt and model were already paid for - reuse them
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache.make_key(
+                player_stats, self.prompt_version, self.model, 
+                self.temperature)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return {'player_name': player_data.get('player_name', ''), 
+                        'analysis_source': 'llm', **cached}
+        
+        if screen and self.success_model is not None:
+            probability = self.success_model.predict_proba(
+                player_data.to_frame().T)[0]
+            if not SuccessModel.ambiguous(probability, self.screen_band):
+                print(f"Local model is confident ({probability * 100:.0f}% "
+                      f"success probability), skipping DeepSeek call")
+                return self._local_analysis(player_data)
+        
         # Create the analysis prompt
         prompt = self._create_analysis_prompt(player_stats)
         
@@ -33,8 +211,7 @@ class DeepSeekEnricher:
             
             if response:
                 analysis = self._parse_response(response)
-                return {
-                    'player_name': player_data.get('player_name', ''),
+                result = {
                     'success_probability': analysis.get('success_probability', 
                                                        0),
                     'key_strengths': analysis.get('key_strengths', []),
@@ -45,9 +222,20 @@ class DeepSeekEnricher:
                         'statistical_indicators', []),
                     'overall_assessment': analysis.get('overall_assessment', 
                                                       ''),
-                    'comparisons': analysis.get('comparisons', ''),
-                    'development_areas': analysis.get('development_areas', [])
+                    'comparisons': (
+                        describe_comparables(player_stats['comparables']) 
+                        if 'comparables' in player_stats 
+                        else analysis.get('comparisons', '')),
+                    'development_areas': analysis.get('development_areas', 
+                                                      []), 
+                    'analysis_source': 'llm'
                 }
+                if (cache_key is not None and 
+                        analysis != self.PARSE_FAILURE_ANALYSIS):
+                    self.cache.put(cache_key, player_data.get('player_name', 
+                                                              ''), result)
+                return {'player_name': player_data.get('player_name', ''), 
+                        **result}
             else:
                 return self._create_fallback_analysis(player_data)
                 
@@ -58,7 +246,7 @@ class DeepSeekEnricher:
 
     def _format_player_stats(self, player_data: pd.Series) -> Dict:
         """Format player statistics for AI analysis"""
-        return {
+        player_stats = {
             'college_stats': {
                 'team': player_data.get('college_team', 'N/A'),
                 'conference': player_data.get('college_conference', 'N/A'),
@@ -68,37 +256,68 @@ class DeepSeekEnricher:
                                                    0)),
                 'completions': int(player_data.get('college_pass_completions', 
                                                  0)),
-                'completion_percentage': round(
-                    player_data.get('college_completion_pct', 0), 1),
+                'completion_percentage': round(float(
+                    player_data.get('college_completion_pct', 0)), 1),
                 'pass_yards': int(player_data.get('college_pass_yards', 0)),
                 'touchdowns': int(player_data.get('college_pass_tds', 0)),
                 'interceptions': int(player_data.get('college_interceptions', 
                                                    0)),
-                'td_int_ratio': round(
-                    player_data.get('college_td_int_ratio', 0), 2),
-                'yards_per_attempt': round(
-                    player_data.get('college_yards_per_attempt', 0), 1)
+                'td_int_ratio': round(float(
+                    player_data.get('college_td_int_ratio', 0)), 2),
+                'yards_per_attempt': round(float(
+                    player_data.get('college_yards_per_attempt', 0)), 1)
             },
             'nfl_stats': {
                 'games_played': int(player_data.get('nfl_games', 0)),
                 'pass_attempts': int(player_data.get('nfl_pass_attempts', 0)),
                 'completions': int(player_data.get('nfl_pass_completions', 
                                                  0)),
-                'completion_percentage': round(
-                    player_data.get('nfl_completion_percentage', 0), 1),
+                'completion_percentage': round(float(
+                    player_data.get('nfl_completion_percentage', 0)), 1),
                 'pass_yards': int(player_data.get('nfl_pass_yards', 0)),
                 'touchdowns': int(player_data.get('nfl_pass_tds', 0)),
                 'interceptions': int(player_data.get('nfl_interceptions', 0)),
-                'td_int_ratio': round(
-                    player_data.get('nfl_td_int_ratio', 0), 2),
-                'yards_per_attempt': round(
-                    player_data.get('nfl_yards_per_attempt', 0), 1),
-                'qb_rating': round(player_data.get('nfl_qb_rating', 0), 1)
+                'td_int_ratio': round(float(
+                    player_data.get('nfl_td_int_ratio', 0)), 2),
+                'yards_per_attempt': round(float(
+                    player_data.get('nfl_yards_per_attempt', 0)), 1),
+                'qb_rating': round(float(
+                    player_data.get('nfl_qb_rating', 0)), 1)
             }
         }
+        
+        # Peer context: percentile among all merged QBs / within the 
+        # player's college conference
+        percentiles = {}
+        for col, label in self.PERCENTILE_METRICS.items():
+            pctile = player_data.get(f"{col}_pctile")
+            if pctile is None or pd.isna(pctile):
+                continue
+            conf_pctile = player_data.get(f"{col}_conf_pctile", pctile)
+            percentiles[label] = [round(float(pctile)), 
+                                  round(float(conf_pctile))]
+        if percentiles:
+            player_stats['percentiles'] = percentiles
+        
+        comparables = self._find_comparables(player_data)
+        if comparables is not None:
+            player_stats['comparables'] = comparables
+        return player_stats
+
+    def _find_comparables(self, player_data: pd.Series) -> Optional[List]:
+        """Most similar QBs by college profile, if an index is set"""
+        if self.comparable_index is None:
+            return None
+        return self.comparable_index.comparables(player_data, 
+                                                 self.comparable_count)
 
     def _create_analysis_prompt(self, player_stats: Dict) -> str:
         """Create a comprehensive analysis prompt for DeepSeek AI"""
+        if self.compact_prompt:
+            return self._create_compact_prompt(player_stats)
+        context = (self._percentile_section(player_stats) + 
+                   self._comparables_section(player_stats))
+        assessment = self._assessment_fields(player_stats)
         return f"""
         Analyze this quarterback's transition from college to NFL and determine the key factors that led to their NFL success or failure.
         
@@ -128,7 +347,7 @@ class DeepSeekEnricher:
         - TD/INT Ratio: {player_stats['nfl_stats']['td_int_ratio']}
         - Yards/Attempt: {player_stats['nfl_stats']['yards_per_attempt']}
         - QB Rating: {player_stats['nfl_stats']['qb_rating']}
-        
+        {context}
         Please provide a detailed analysis in JSON format with the following structure:
         {{
             "success_probability": <integer 0-100 representing likelihood of NFL success based on college stats>,
@@ -136,51 +355,157 @@ class DeepSeekEnricher:
             "key_weaknesses": [<list of 1-3 key weaknesses based on statistics>],
             "college_to_nfl_transition": "<brief analysis of how well stats translated to NFL>",
             "statistical_indicators": [<list of 2-3 specific statistical factors that predicted success/failure>],
-            "overall_assessment": "<2-3 sentence summary of the player's career trajectory>",
-            "comparisons": "<comparison to typical successful/unsuccessful NFL QBs based on similar stats>",
+            {assessment}
             "development_areas": [<list of 2-3 areas where improvement was needed for NFL success>]
         }}
         
         Focus on statistical analysis and avoid speculation about non-statistical factors. Be objective and data-driven.
         """
 
+    @staticmethod
+    def _create_compact_prompt(player_stats: Dict) -> str:
+        """Per-player part of the compact prompt: just the numbers"""
+        college = player_stats['college_stats']
+        nfl = player_stats['nfl_stats']
+        lines = [
+            f"College: {college['team']} ({college['conference']}) "
+            f"{college['years_played']}: {college['pass_attempts']} att, "
+            f"{college['completions']} cmp, "
+            f"{college['completion_percentage']}%, "
+            f"{college['pass_yards']} yds, {college['touchdowns']} TD, "
+            f"{college['interceptions']} INT, "
+            f"TD/INT {college['td_int_ratio']}, "
+            f"{college['yards_per_attempt']} Y/A",
+            f"NFL: {nfl['games_played']} G, {nfl['pass_attempts']} att, "
+            f"{nfl['completions']} cmp, {nfl['completion_percentage']}%, "
+            f"{nfl['pass_yards']} yds, {nfl['touchdowns']} TD, "
+            f"{nfl['interceptions']} INT, TD/INT {nfl['td_int_ratio']}, "
+            f"{nfl['yards_per_attempt']} Y/A, rating {nfl['qb_rating']}"
+        ]
+        percentiles = player_stats.get('percentiles')
+        if percentiles:
+            lines.append('Percentiles: ' + '; '.join(
+                f"{label} {overall}/{conference}" 
+                for label, (overall, conference) in percentiles.items()))
+        comparables = player_stats.get('comparables')
+        if comparables:
+            lines.append('Comparable QBs: ' + '; '.join(
+                f"{player['name']} {player['nfl_games']} G "
+                f"{player['nfl_qb_rating']} rating" 
+                for player in comparables))
+        return '\n'.join(lines)
+
+    def _system_prompt(self) -> str:
+        """System message; in compact mode it carries the instructions 
+        and schema and is identical for every call"""
+        if not self.compact_prompt:
+            return self.SYSTEM_PROMPT
+        comparisons = ('' if self.comparable_index is not None 
+                       else self.COMPACT_COMPARISONS)
+        return self.SYSTEM_PROMPT + self.COMPACT_INSTRUCTIONS.format(
+            comparisons=comparisons)
+
+    @staticmethod
+    def _percentile_section(player_stats: Dict) -> str:
+        """Prompt lines with the player's peer percentiles, if known"""
+        percentiles = player_stats.get('percentiles')
+        if not percentiles:
+            return ''
+        lines = [f"- {label}: {overall} / {conference}" 
+                 for label, (overall, conference) in percentiles.items()]
+        return ('\n        PEER PERCENTILES (0-100, vs all QBs / same '
+                'conference):\n        ' + '\n        '.join(lines) + 
+                '\n        ')
+
+    @staticmethod
+    def _comparables_section(player_stats: Dict) -> str:
+        """Prompt lines with the comparable QBs and their NFL outcomes"""
+        comparables = player_stats.get('comparables')
+        if not comparables:
+            return ''
+        lines = [f"- {player['name']}: {player['nfl_games']} games, "
+                 f"{player['nfl_qb_rating']} rating" 
+                 for player in comparables]
+        return ('\n        COMPARABLE QBs (closest college stats, NFL '
+                'outcomes):\n        ' + '\n        '.join(lines) + 
+                '\n        ')
+
+    @staticmethod
+    def _assessment_fields(player_stats: Dict) -> str:
+        """Schema lines for overall_assessment and, unless computed 
+        locally, comparisons"""
+        fields = ('"overall_assessment": "<2-3 sentence summary of the '
+                  'player\'s career trajectory>",')
+        if 'comparables' in player_stats:
+            return fields
+        return (fields + '\n            "comparisons": "<comparison to '
+                'typical successful/unsuccessful NFL QBs based on similar '
+                'stats>",')
+
     def _make_api_call(self, prompt: str) -> Optional[Dict]:
         """Make API call to DeepSeek"""
+        system_prompt = self._system_prompt()
+        
+        # Hold the worst case against the token budget until the API 
+        # reports what the call actually used
+        estimated = estimate_tokens(system_prompt) + estimate_tokens(prompt)
+        reservation = estimated + self.max_tokens
+        if not self.tokens.reserve(reservation):
+            print(f"Token budget of {self.tokens.limit:,} exhausted, "
+                  f"skipping API call")
+            return None
         
         payload = {
-            "model": "deepseek-chat",
+            "model": self.model,
             "messages": [
                 {
                     "role": "system",
-                    "content": ("You are an expert NFL quarterback analyst "
-                               "specializing in statistical analysis of "
-                               "college-to-NFL transitions. Provide detailed, "
-                               "data-driven insights based solely on the "
-                               "provided statistics.")
+                    "content": system_prompt
                 },
                 {
                     "role": "user", 
                     "content": prompt
                 }
             ],
-            "temperature": 0.3,
-            "max_tokens": 1000
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens
         }
         
+        result = None
+        settled = False
         try:
-            time.sleep(self.rate_limit_delay)
-            response = requests.post(
-                self.base_url,
-                headers=self.headers,
-                json=payload,
-                timeout=30
-            )
+            # Throttling is retried with backoff by the shared HTTP 
+            # client, but a completion the server may already have run 
+            # (read timeout, 5xx) is never resent, so each billed attempt 
+            # goes through the budget once
+            response = self.http.post(self.base_url, json=payload, 
+                                      idempotent=False)
             response.raise_for_status()
-            return response.json()
+            result = response.json()
             
         except requests.exceptions.RequestException as e:
             print(f"API request failed: {e}")
+            if (isinstance(e, (requests.exceptions.ConnectionError, 
+                               requests.exceptions.Timeout)) and 
+                    not never_sent(e)):
+                # The call may still have run (and been billed): count 
+                # its worst case
+                self.tokens.settle(reservation, {
+                    'prompt_tokens': estimated, 
+                    'completion_tokens': self.max_tokens})
+                settled = True
             return None
+        
+        finally:
+            if result is None and not settled:
+                self.tokens.release(reservation)
+        
+        call = self.tokens.settle(reservation, result.get('usage'), 
+                                  estimated)
+        print(f"Tokens: {call['prompt_tokens']} prompt "
+              f"({call['cached_tokens']} cached) + "
+              f"{call['completion_tokens']} completion")
+        return result
 
     def _parse_response(self, response: Dict) -> Dict:
         """Parse DeepSeek API response and extract analysis"""
@@ -205,16 +530,7 @@ class DeepSeekEnricher:
         except (json.JSONDecodeError, KeyError, IndexError) as e:
             print(f"Error parsing API response: {e}")
             # Return a basic structure if parsing fails
-            return {
-                'success_probability': 50,
-                'key_strengths': ['Statistical analysis unavailable'],
-                'key_weaknesses': ['Analysis parsing failed'],
-                'college_to_nfl_transition': 'Unable to analyze transition',
-                'statistical_indicators': ['Data processing error'],
-                'overall_assessment': 'Analysis could not be completed',
-                'comparisons': 'Comparison data unavailable',
-                'development_areas': ['Analysis incomplete']
-            }
+            return dict(self.PARSE_FAILURE_ANALYSIS)
 
     def _create_fallback_analysis(self, player_data: pd.Series) -> Dict:
         """Create basic rule-based analysis if API fails"""
@@ -250,8 +566,11 @@ class DeepSeekEnricher:
                                      'Yards per attempt'],
             'overall_assessment': ('Analysis generated using fallback '
                                  'rule-based system'),
-            'comparisons': 'Statistical comparison unavailable',
-            'development_areas': ['Accuracy', 'Decision-making', 'Arm strength']
+            'comparisons': describe_comparables(
+                self._find_comparables(player_data)),
+            'development_areas': ['Accuracy', 'Decision-making', 
+                                  'Arm strength'], 
+            'analysis_source': 'fallback'
         }
 
     def _identify_strengths(self, player_data: pd.Series) -> List[str]:
@@ -266,6 +585,11 @@ class DeepSeekEnricher:
             strengths.append('Strong yards per attempt')
         if player_data.get('nfl_qb_rating', 0) >= 90:
             strengths.append('High NFL passer rating')
+        for col, label in self.PEER_RANKED_METRICS.items():
+            if (player_data.get(f"{col}_conf_pctile", 0) >= 
+                    100 - self.PEER_TAIL):
+                strengths.append(f"Top {self.PEER_TAIL}% {label} in "
+                                 f"conference")
         
         return strengths if strengths else ['Statistical analysis incomplete']
 
@@ -282,6 +606,10 @@ class DeepSeekEnricher:
         if (player_data.get('nfl_qb_rating', 0) < 80 and 
             player_data.get('nfl_qb_rating', 0) > 0):
             weaknesses.append('Struggled in NFL transition')
+        for col, label in self.PEER_RANKED_METRICS.items():
+            if 0 < player_data.get(f"{col}_conf_pctile", 0) <= self.PEER_TAIL:
+                weaknesses.append(f"Bottom {self.PEER_TAIL}% {label} in "
+                                  f"conference")
         
         return (weaknesses if weaknesses 
                 else ['No major statistical weaknesses identified'])
@@ -302,30 +630,211 @@ class DeepSeekEnricher:
         else:
             return "Struggled in NFL transition"
 
-    def enrich_dataset(self, df: pd.DataFrame) -> pd.DataFrame:
-        """Enrich entire dataset with AI analysis"""
-        print(f"Starting DeepSeek analysis for {len(df)} players...")
+    @staticmethod
+    def _labels_from_masks(masks: List[np.ndarray], labels: List[str], 
+                           empty: List[str]) -> List[List[str]]:
+        """Per-row label lists from one boolean mask per label (empty 
+        when no mask is set)"""
+        codes = np.zeros(len(masks[0]), dtype=np.int64)
+        for bit, mask in enumerate(masks):
+            codes |= mask.astype(np.int64) << bit
+        combos = {code: [label for bit, label in enumerate(labels) 
+                         if code >> bit & 1] or empty 
+                  for code in np.unique(codes).tolist()}
+        return [list(combos[code]) for code in codes.tolist()]
+
+    def score_fallback_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Rule-based analysis for a whole DataFrame at once
+        
+        Vectorized equivalent of _create_fallback_analysis: thresholds 
+        are evaluated as NumPy masks over entire columns, and missing 
+        columns count as 0 like the per-player .get defaults.
+        """
+        def column(name: str) -> np.ndarray:
+            if name not in df.columns:
+                return np.zeros(len(df))
+            return pd.to_numeric(df[name], errors='coerce').to_numpy(
+                dtype=float, na_value=np.nan)
         
-        enriched_data = []
+        completion_pct = column('college_completion_pct')
+        td_int_ratio = column('college_td_int_ratio')
+        ypa = column('college_yards_per_attempt')
+        nfl_games = column('nfl_games')
+        nfl_qb_rating = column('nfl_qb_rating')
+        peer_pctiles = [column(f"{col}_conf_pctile") 
+                        for col in self.PEER_RANKED_METRICS]
+        peer_labels = list(self.PEER_RANKED_METRICS.values())
         
-        for idx, player in df.iterrows():
-            print(f"Analyzing player {idx + 1}/{len(df)}: "
-                  f"{player.get('player_name', 'Unknown')}")
-            
-            # Get AI analysis
-            analysis = self.analyze_player(player)
-            
-            # Combine original data with analysis
-            enriched_player = player.to_dict()
-            enriched_player.update(analysis)
-            
-            enriched_data.append(enriched_player)
+        success_score = (20 * (completion_pct >= 60) + 
+                         25 * (td_int_ratio >= 2.0) + 
+                         20 * (ypa >= 7.5) + 
+                         20 * (nfl_games >= 16) + 
+                         15 * (nfl_qb_rating >= 85))
+        
+        strengths = self._labels_from_masks(
+            [completion_pct >= 65, td_int_ratio >= 2.5, ypa >= 8.0, 
+             nfl_qb_rating >= 90] + 
+            [pctile >= 100 - self.PEER_TAIL for pctile in peer_pctiles],
+            ['High completion percentage', 'Excellent TD/INT ratio', 
+             'Strong yards per attempt', 'High NFL passer rating'] + 
+            [f"Top {self.PEER_TAIL}% {label} in conference" 
+             for label in peer_labels],
+            ['Statistical analysis incomplete'])
+        weaknesses = self._labels_from_masks(
+            [completion_pct < 55, td_int_ratio < 1.5, ypa < 7.0, 
+             (nfl_qb_rating < 80) & (nfl_qb_rating > 0)] + 
+            [(pctile > 0) & (pctile <= self.PEER_TAIL) 
+             for pctile in peer_pctiles],
+            ['Low completion percentage', 'Poor TD/INT ratio', 
+             'Low yards per attempt', 'Struggled in NFL transition'] + 
+            [f"Bottom {self.PEER_TAIL}% {label} in conference" 
+             for label in peer_labels],
+            ['No major statistical weaknesses identified'])
+        transition = np.select(
+            [nfl_games == 0, nfl_games < 16, nfl_qb_rating >= 85, 
+             nfl_qb_rating >= 75],
+            ['Did not establish NFL career', 'Limited NFL playing time', 
+             'Successful transition to NFL', 'Moderate NFL success'],
+            default='Struggled in NFL transition')
+        
+        rows = len(df)
+        # One batched neighbor search covers every row
+        comparisons = ([describe_comparables(comparables) 
+                        for comparables in 
+                        self.comparable_index.comparables_batch(
+                            df, self.comparable_count)] 
+                       if self.comparable_index is not None 
+                       else describe_comparables(None))
+        return pd.DataFrame({
+            'player_name': (df['player_name'].to_numpy() 
+                            if 'player_name' in df.columns 
+                            else [''] * rows),
+            'success_probability': np.minimum(success_score, 100),
+            'key_strengths': strengths,
+            'key_weaknesses': weaknesses,
+            'college_to_nfl_transition': transition,
+            'statistical_indicators': [
+                ['Completion percentage', 'TD/INT ratio', 
+                 'Yards per attempt'] for _ in range(rows)],
+            'overall_assessment': ('Analysis generated using fallback '
+                                   'rule-based system'),
+            'comparisons': comparisons,
+            'development_areas': [
+                ['Accuracy', 'Decision-making', 'Arm strength'] 
+                for _ in range(rows)], 
+            'analysis_source': 'fallback'
+        })
+
+    def score_local_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """score_fallback_frame with success_probability taken from the 
+        local success model, when one is set"""
+        analysis = self.score_fallback_frame(df)
+        if self.success_model is None:
+            return analysis
+        probabilities = self.success_model.predict_proba(df)
+        analysis['success_probability'] = np.rint(
+            probabilities * 100).astype(np.int64)
+        analysis['overall_assessment'] = ('Analysis generated using local '
+                                          'statistical success model')
+        analysis['analysis_source'] = 'local_model'
+        return analysis
+
+    def _local_analysis(self, player_data: pd.Series) -> Dict[str, any]:
+        """score_local_frame for a single player"""
+        analysis = self.score_local_frame(
+            player_data.to_frame().T).iloc[0].to_dict()
+        analysis['success_probability'] = int(
+            analysis['success_probability'])
+        return analysis
+
+    @staticmethod
+    def _with_analysis(df: pd.DataFrame, 
+                       analysis: pd.DataFrame) -> pd.DataFrame:
+        """df with the analysis columns (except player_name) appended"""
+        enriched_df = df.reset_index(drop=True)
+        return enriched_df.assign(**{
+            col: analysis[col].to_numpy() for col in analysis.columns 
+            if col != 'player_name'})
+
+    def enrich_dataset(self, df: pd.DataFrame, 
+                       max_in_flight: int = None, 
+                       offline: bool = False) -> pd.DataFrame:
+        """Enrich entire dataset with AI analysis, running up to 
+        max_in_flight API calls concurrently. offline=True skips the 
+        API and scores every player locally instead
+        
+        With a success model set, every player is scored in one batch 
+        first and only those it places inside screen_band are sent to 
+        the API; the rest get a local analysis.
+        """
+        if offline:
+            print(f"Scoring {len(df)} players locally (offline mode)...")
+            enriched_df = self._with_analysis(df, self.score_local_frame(df))
+            print(f"Offline analysis complete for {len(enriched_df)} "
+                  f"players!")
+            return enriched_df
+        
+        if self.success_model is None:
+            return self._enrich_remote(df, max_in_flight)
+        
+        probabilities = self.success_model.predict_proba(df)
+        ambiguous = SuccessModel.ambiguous(probabilities, self.screen_band)
+        confident = df[~ambiguous]
+        print(f"Local model pre-screen: {len(confident)} of {len(df)} "
+              f"players scored locally, {int(ambiguous.sum())} sent to "
+              f"DeepSeek")
+        
+        # Keep input order: each part is indexed by its input positions
+        parts = []
+        if len(confident):
+            local = self._with_analysis(confident, 
+                                        self.score_local_frame(confident))
+            local.index = np.flatnonzero(~ambiguous)
+            parts.append(local)
+        if ambiguous.any():
+            remote = self._enrich_remote(df[ambiguous], max_in_flight)
+            remote.index = np.flatnonzero(ambiguous)
+            parts.append(remote)
+        if not parts:
+            return self._with_analysis(df, self.score_local_frame(df))
+        return pd.concat(parts).sort_index().reset_index(drop=True)
+
+    def _enrich_remote(self, df: pd.DataFrame, 
+                       max_in_flight: int = None) -> pd.DataFrame:
+        """Analyze every player of df with the API"""
+        if max_in_flight is None:
+            max_in_flight = self.max_in_flight
+        
+        print(f"Starting DeepSeek analysis for {len(df)} players "
+              f"({max_in_flight} concurrent requests)...")
+        
+        players = [player for _, player in df.iterrows()]
+        enriched_data = [None] * len(players)
+        
+        with ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+            # Players reaching this point were already screened
+            futures = {executor.submit(self.analyze_player, player, 
+                                       screen=False): position
+                       for position, player in enumerate(players)}
             
-            # Progress indicator
-            if (idx + 1) % 10 == 0:
-                print(f"Progress: {idx + 1}/{len(df)} players analyzed")
+            for completed, future in enumerate(as_completed(futures), 1):
+                position = futures[future]
+                player = players[position]
+                print(f"Analyzed player {completed}/{len(players)}: "
+                      f"{player.get('player_name', 'Unknown')}")
+                
+                # Combine original data with analysis, keeping input order
+                enriched_player = player.to_dict()
+                enriched_player.update(future.result())
+                enriched_data[position] = enriched_player
+                
+                # Progress indicator
+                if completed % 10 == 0:
+                    print(f"Progress: {completed}/{len(players)} players "
+                          f"analyzed")
         
         enriched_df = pd.DataFrame(enriched_data)
         print(f"DeepSeek analysis complete for all {len(enriched_df)} players!")
+        print(f"Token usage: {self.tokens.summary()}")
         
-        return enriched_df
\ No newline at end of file
+        return enriched_df
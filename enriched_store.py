@@ -0,0 +1,157 @@
+import ast
+import glob
+import json
+import math
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+import pandas as pd
+
+# Analysis fields that hold lists and are stored as JSON arrays
+LIST_COLUMNS = ['key_strengths', 'key_weaknesses', 'statistical_indicators',
+                'development_areas']
+TEXT_COLUMNS = ['college_to_nfl_transition', 'overall_assessment',
+                'comparisons', 'analysis_source']
+
+
+def _to_json(value) -> str:
+    """Serialize a value to JSON, unwrapping NumPy scalars"""
+    def default(obj):
+        if hasattr(obj, 'item'):
+            return obj.item()
+        return str(obj)
+    return json.dumps(value, default=default)
+
+
+class EnrichedStore:
+    """Append-only SQLite store for enriched player analyses
+
+    Every analysis becomes one row: the AI fields get real columns
+    (list fields as JSON arrays) and the player's stats are kept as a
+    JSON object. The latest_analyses view returns the newest row per
+    player.
+    """
+
+    def __init__(self, db_path: str = 'data/enriched/enriched.sqlite'):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        list_cols = ', '.join(f"{col} TEXT" for col in LIST_COLUMNS)
+        text_cols = ', '.join(f"{col} TEXT" for col in TEXT_COLUMNS)
+        self.conn.executescript(f"""
+            CREATE TABLE IF NOT EXISTS analyses (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                player_name TEXT NOT NULL,
+                analyzed_at TEXT NOT NULL,
+                success_probability REAL,
+                {text_cols},
+                {list_cols},
+                stats TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_analyses_player
+                ON analyses (player_name, id);
+            CREATE VIEW IF NOT EXISTS latest_analyses AS
+                SELECT a.* FROM analyses a
+                JOIN (SELECT player_name, MAX(id) AS id FROM analyses
+                      GROUP BY player_name) latest
+                ON a.id = latest.id;
+        """)
+        # Stores created before a text column existed get it added
+        existing = {row[1] for row in
+                    self.conn.execute("PRAGMA table_info(analyses)")}
+        for col in TEXT_COLUMNS:
+            if col not in existing:
+                self.conn.execute(
+                    f"ALTER TABLE analyses ADD COLUMN {col} TEXT")
+        self.conn.commit()
+
+    @staticmethod
+    def _to_row(record: Dict, analyzed_at: str) -> tuple:
+        """Split an enriched record into analysis columns and stats"""
+        analysis_fields = (['id', 'analyzed_at', 'player_name',
+                            'success_probability'] +
+                           TEXT_COLUMNS + LIST_COLUMNS)
+        stats = {key: value for key, value in record.items()
+                 if key not in analysis_fields}
+        lists = []
+        for col in LIST_COLUMNS:
+            value = record.get(col, [])
+            lists.append(_to_json(list(value) if isinstance(
+                value, (list, tuple)) else value))
+        probability = record.get('success_probability')
+        return (record.get('player_name', ''), analyzed_at,
+                None if probability is None else float(probability),
+                *[record.get(col, '') for col in TEXT_COLUMNS],
+                *lists, _to_json(stats))
+
+    def append(self, records: Iterable[Dict]) -> int:
+        """Append enriched records in a single transaction"""
+        analyzed_at = datetime.now().isoformat(timespec='seconds')
+        rows = [self._to_row(record, analyzed_at) for record in records]
+        columns = (['player_name', 'analyzed_at', 'success_probability'] +
+                   TEXT_COLUMNS + LIST_COLUMNS + ['stats'])
+        placeholders = ', '.join('?' for _ in columns)
+        with self.lock, self.conn:
+            self.conn.executemany(
+                f"INSERT INTO analyses ({', '.join(columns)}) "
+                f"VALUES ({placeholders})", rows)
+        return len(rows)
+
+    def append_frame(self, df: pd.DataFrame) -> int:
+        """Append every row of an enriched DataFrame"""
+        return self.append(df.to_dict('records'))
+
+    def _query(self, sql: str, params: tuple = ()) -> pd.DataFrame:
+        """Run a query and decode the JSON columns"""
+        with self.lock:
+            df = pd.read_sql_query(sql, self.conn, params=params)
+        for col in LIST_COLUMNS:
+            df[col] = df[col].map(lambda text: json.loads(text)
+                                  if text else [])
+        if df.empty:
+            return df.drop(columns=['stats'])
+
+        # Expand the stats JSON back into columns
+        stats = pd.DataFrame([json.loads(text) if text else {}
+                              for text in df['stats']], index=df.index)
+        return pd.concat([df.drop(columns=['stats']), stats], axis=1)
+
+    def latest(self, player_name: Optional[str] = None) -> pd.DataFrame:
+        """Newest analysis per player, optionally for one player"""
+        if player_name is None:
+            return self._query("SELECT * FROM latest_analyses "
+                               "ORDER BY player_name")
+        return self._query("SELECT * FROM latest_analyses "
+                           "WHERE player_name = ?", (player_name,))
+
+    def history(self, player_name: str) -> pd.DataFrame:
+        """Every stored analysis for a player, oldest first"""
+        return self._query("SELECT * FROM analyses WHERE player_name = ? "
+                           "ORDER BY id", (player_name,))
+
+    def import_legacy_csvs(self, directory: str = 'data/enriched') -> int:
+        """Load the old one-CSV-per-player files into the store"""
+        records = []
+        for path in sorted(glob.glob(os.path.join(directory, '*.csv'))):
+            for record in pd.read_csv(path).to_dict('records'):
+                for col in LIST_COLUMNS:
+                    value = record.get(col)
+                    if isinstance(value, str):
+                        try:
+                            record[col] = ast.literal_eval(value)
+                        except (ValueError, SyntaxError):
+                            record[col] = [value]
+                    elif isinstance(value, float) and math.isnan(value):
+                        record[col] = []
+                records.append(record)
+        return self.append(records)
+
+    def close(self):
+        """Close the database"""
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class ETLManifest:
+    """Tracks processed seasons and source fingerprints between ETL runs"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.data = self._load()
+
+    def _load(self) -> Dict:
+        """Load the manifest from disk, starting empty if missing"""
+        empty = {'years': [], 'seasons': {}, 'sources': {}, 'raw_file': None}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return {**empty, **json.load(f)}
+        except FileNotFoundError:
+            return empty
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"ETL manifest unreadable, rebuilding from scratch: {e}")
+            return empty
+
+    def save(self):
+        """Atomically write the manifest to disk"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with self.lock:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def hash_payload(payload) -> str:
+        """Stable SHA-256 of a JSON-serializable API payload"""
+        canonical = json.dumps(payload, sort_keys=True, default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def file_fingerprint(path: str, with_hash: bool = True) -> Dict:
+        """Fingerprint a source file by mtime, size and content hash"""
+        stat = os.stat(path)
+        fingerprint = {'mtime': stat.st_mtime, 'size': stat.st_size}
+        if with_hash:
+            digest = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+            fingerprint['sha256'] = digest.hexdigest()
+        return fingerprint
+
+    def season_hash(self, year: int) -> Optional[str]:
+        """Payload hash recorded for a season, if it was processed"""
+        return self.data['seasons'].get(str(year), {}).get('payload_hash')
+
+    def update_season(self, year: int, payload_hash: str, records: int):
+        """Record that a season was (re)processed"""
+        with self.lock:
+            self.data['seasons'][str(year)] = {
+                'payload_hash': payload_hash,
+                'records': records,
+                'updated_at': datetime.now().isoformat(timespec='seconds')
+            }
+
+    def source_changed(self, name: str, path: str) -> bool:
+        """Check a source file against its recorded fingerprint, only
+        hashing the content when mtime or size moved"""
+        previous = self.data['sources'].get(name)
+        if previous is None or not os.path.exists(path):
+            return True
+
+        quick = self.file_fingerprint(path, with_hash=False)
+        if (quick['mtime'] == previous.get('mtime') and
+                quick['size'] == previous.get('size')):
+            return False
+        return (self.file_fingerprint(path).get('sha256') !=
+                previous.get('sha256'))
+
+    def update_source(self, name: str, path: str):
+        """Record the current fingerprint of a source file"""
+        fingerprint = self.file_fingerprint(path)
+        with self.lock:
+            self.data['sources'][name] = fingerprint
+
+    def same_years(self, years: List[int]) -> bool:
+        """True if the last run covered exactly these seasons"""
+        return sorted(self.data.get('years', [])) == sorted(years)
@@ -1,11 +1,31 @@
+import argparse
 import pandas as pd
 import requests
+import sqlite3
 import time
 import os
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 import json
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
-from deepseek_enrichment import DeepSeekEnricher
+from comparables import ComparableIndex
+from deepseek_enrichment import ANALYSIS_SOURCES, DeepSeekEnricher
+from enriched_store import EnrichedStore
+from etl_manifest import ETLManifest
+from player_features import FeatureTable, ordinal
+from player_index import PlayerIndex, normalize_name
+from profiling import PipelineProfiler
+from query_engine import QBQueryEngine
+from rate_limiter import TokenBucket
+from resilient_http import (CircuitBreaker, ResilientHTTPClient, 
+                            make_session)
+from response_cache import ResponseCache
+from snapshot import load_snapshot, save_snapshot
+from storage import (columnar_available, compact_frame, compact_report, 
+                     frame_bytes, load_table, save_table, widen_numeric)
+from success_model import SuccessModel
 
 # Add this for using .env file
 try:
@@ -15,183 +35,556 @@ except ImportError:
     print("python-dotenv not installed. Using environment variables "
           "directly.")
 
+# College API stat categories fetched for every season
+COLLEGE_CATEGORIES = ['passing']
+
+# Opt-in categories (extra_categories); each costs another request per 
+# season under the 1 request/s limit, and their columns stay 0 when not 
+# fetched
+OPTIONAL_COLLEGE_CATEGORIES = ['rushing', 'fumbles']
+
+# College API (category, statType) -> (our column name, dtype)
+COLLEGE_STAT_COLUMNS = {
+    ('passing', 'ATT'): ('pass_attempts', 'int64'),
+    ('passing', 'COMPLETIONS'): ('pass_completions', 'int64'),
+    ('passing', 'YDS'): ('pass_yards', 'int64'),
+    ('passing', 'TD'): ('pass_tds', 'int64'),
+    ('passing', 'INT'): ('interceptions', 'int64'),
+    ('passing', 'QBR'): ('qb_rating', 'float64'),
+    ('passing', 'YPA'): ('yards_per_attempt', 'float64'),
+    ('passing', 'GAMES'): ('games', 'int64'),
+    ('rushing', 'CAR'): ('rush_attempts', 'int64'),
+    ('rushing', 'YDS'): ('rush_yards', 'int64'),
+    ('rushing', 'TD'): ('rush_tds', 'int64'),
+    ('fumbles', 'FUM'): ('fumbles', 'int64'),
+    ('fumbles', 'LOST'): ('fumbles_lost', 'int64')
+}
+
+# NFL CSV column variants -> standardized names (comprehensive mapping)
+NFL_COLUMN_MAPPING = {
+    # Name variations
+    'Name': 'player_name',
+    'Player': 'player_name',
+    'Player_Name': 'player_name',
+    'PLAYER': 'player_name',
+    # Team variations
+    'Tm': 'nfl_team',
+    'Team': 'nfl_team',
+    'NFL_Team': 'nfl_team',
+    # Year variations
+    'Year': 'nfl_year',
+    'Season': 'nfl_year',
+    'YEAR': 'nfl_year',
+    # Games variations
+    'G': 'nfl_games',
+    'Games': 'nfl_games',
+    'GP': 'nfl_games',
+    # Passing stats
+    'Att': 'nfl_pass_attempts',
+    'ATT': 'nfl_pass_attempts',
+    'Pass_Att': 'nfl_pass_attempts',
+    'Cmp': 'nfl_pass_completions',
+    'CMP': 'nfl_pass_completions',
+    'Completions': 'nfl_pass_completions',
+    'Yds': 'nfl_pass_yards',
+    'YDS': 'nfl_pass_yards',
+    'Pass_Yds': 'nfl_pass_yards',
+    'Passing_Yards': 'nfl_pass_yards',
+    'TD': 'nfl_pass_tds',
+    'Pass_TD': 'nfl_pass_tds',
+    'Int': 'nfl_interceptions',
+    'INT': 'nfl_interceptions',
+    'Interceptions': 'nfl_interceptions',
+    'Rate': 'nfl_qb_rating',
+    'QBR': 'nfl_qb_rating',
+    'Passer_Rating': 'nfl_qb_rating'
+}
+
+# Parse-time dtypes for standardized NFL columns (others are float64)
+NFL_COLUMN_DTYPES = {
+    'player_name': 'str',
+    'nfl_team': 'str'
+}
+
+# College career columns that are summed / averaged over seasons
+COLLEGE_SUM_COLUMNS = ['pass_attempts', 'pass_completions', 'pass_yards', 
+                       'pass_tds', 'interceptions']
+COLLEGE_MEAN_COLUMNS = ['completion_percentage', 'td_int_ratio', 
+                        'yards_per_attempt']
+
+# Repeated text columns held as categoricals in each compacted table
+CATEGORY_COLUMNS = {
+    'college_stats': ['player_name', 'team', 'conference', 'position'],
+    'nfl_stats': ['player_name', 'nfl_team'],
+    'college_career': ['college_team', 'college_conference'],
+    'nfl_career': [],
+    'combined_data': ['college_team', 'college_conference'],
+    'season_data': ['player_id', 'player_name', 'nfl_team', 
+                    'college_team', 'college_conference']
+}
+
+
+# Career metrics shown with their peer percentiles in player profiles
+PEER_METRICS = [
+    ('college_completion_pct', 'Completion %'),
+    ('college_td_int_ratio', 'TD/INT Ratio'),
+    ('college_yards_per_attempt', 'Yards/Attempt'),
+    ('college_pass_yards', 'Pass Yards'),
+    ('nfl_completion_percentage', 'NFL Completion %'),
+    ('nfl_yards_per_attempt', 'NFL Yards/Attempt'),
+    ('nfl_qb_rating', 'NFL QB Rating')
+]
+
 
 class QBStatsETL:
     """ETL Pipeline for College Football QB to NFL performance comparison"""
     
-    def __init__(self, api_key: str, csv_file_path: str):
+    def __init__(self, api_key: str, csv_file_path: str, 
+                 max_workers: int = 4, 
+                 cache_dir: Optional[str] = 'data/cache/http', 
+                 output_format: str = 'csv', 
+                 stage_log: Optional[str] = None, 
+                 profile_path: Optional[str] = None, 
+                 pool_size: Optional[int] = None, 
+                 compact_prompt: bool = False, 
+                 token_budget: Optional[int] = None, 
+                 extra_categories: Optional[List[str]] = None):
         self.api_key = api_key
         self.csv_file_path = csv_file_path
+        self.output_format = output_format  # csv, parquet or feather
         self.base_url = "https://api.collegefootballdata.com"
         self.headers = {"Authorization": f"Bearer {api_key}"}
         self.rate_limit_delay = 1.0  # seconds between API calls
+        self.max_workers = max_workers  # concurrent API requests
+        self.extra_categories = list(extra_categories or [])
+        unknown = set(self.extra_categories) - set(OPTIONAL_COLLEGE_CATEGORIES)
+        if unknown:
+            raise ValueError(f"Unknown college stat categories: "
+                             f"{', '.join(sorted(unknown))}")
+        self.college_categories = COLLEGE_CATEGORIES + self.extra_categories
+        
+        # Shared limiter: one request per rate_limit_delay on average, 
+        # with bursts of up to max_workers requests
+        self.rate_limiter = TokenBucket(rate=1.0 / self.rate_limit_delay, 
+                                        capacity=max_workers)
+        
+        # On-disk response cache (cache_dir=None disables it). Closed 
+        # seasons never change, the current one is revalidated after 
+        # current_season_ttl seconds
+        self.response_cache = (ResponseCache(cache_dir) if cache_dir 
+                               else None)
+        self.current_season_ttl = 6 * 60 * 60
+        
+        # Per-stage timings/counters, written as JSON lines to stage_log 
+        # (None keeps them in memory); profile_path adds a cProfile dump
+        self.profiler = PipelineProfiler(stage_log, profile_path)
+        
+        # Keep-alive, gzip-enabled connection pool shared by all worker 
+        # threads; by default one connection per concurrent request
+        self.session = make_session(pool_size or max_workers, 
+                                    headers=self.headers)
+        
+        # Retries 429/5xx/connection errors with jittered backoff and 
+        # stops calling the API for a while after repeated failures
+        self.http = ResilientHTTPClient(
+            self.rate_limiter, session=self.session, max_retries=4, 
+            breaker=CircuitBreaker(), on_event=self.profiler.count)
         
         # Initialize dataframes
         self.college_stats = pd.DataFrame()
         self.nfl_stats = pd.DataFrame()
         self.combined_data = pd.DataFrame()
+        
+        # Career aggregates kept between runs for incremental merges
+        self.college_career = pd.DataFrame()
+        self.nfl_career = pd.DataFrame()
+        
+        # Season-level merge: one row per linked player NFL season
+        self.season_data = pd.DataFrame()
+        self.rookie_years = pd.DataFrame()
+        self.player_links = pd.DataFrame()
+        self.college_finals = pd.DataFrame()  # last season per player
+        
+        # Where run_etl_streaming spilled the cleaned college seasons
+        self.spill_dir = None
+        
+        # Reused across analyze_specific_player calls so its connection 
+        # pool and analysis cache stay warm
+        self.enricher = None
+        self.enriched_store = None  # opened on first save
+        # Prompt style and total token cap (None = unlimited) for it
+        self.compact_prompt = compact_prompt
+        self.token_budget = token_budget
+        
+        # Name index over combined_data, rebuilt after every merge
+        self.player_index = None
+        # Peer percentiles / z-scores, rebuilt after every merge
+        self.feature_table = None
+        # Nearest-neighbor index of college profiles, ditto
+        self.comparable_index = None
+        # Local NFL success model fit on the merged careers, ditto
+        self.success_model = None
+        
+        # Guards combined_data/player_index while a background rebuild 
+        # swaps in fresh results
+        self.data_lock = threading.Lock()
+        self.rebuild_thread = None
+
+    def close(self):
+        """Release HTTP connections, caches and database handles"""
+        self.http.close()
+        if self.response_cache:
+            self.response_cache.flush()
+        if self.enricher is not None:
+            self.enricher.close()
+            self.enricher = None
+        if self.enriched_store is not None:
+            self.enriched_store.close()
+            self.enriched_store = None
 
-    def rate_limited_request(self, url: str, 
-                           params: Dict = None) -> Optional[requests.Response]:
-        """Make rate-limited API request with basic error handling"""
+    def __enter__(self) -> 'QBStatsETL':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def rate_limited_request(self, url: str, params: Dict = None, 
+                           headers: Dict = None
+                           ) -> Optional[requests.Response]:
+        """Make a rate-limited API request, retrying transient failures 
+        with backoff. None if it still failed or the circuit is open"""
         try:
-            time.sleep(self.rate_limit_delay)  # Rate limiting
-            response = requests.get(url, headers=self.headers, 
-                                  params=params, timeout=30)
+            response = self.http.get(url, headers=headers, params=params)
+            self.profiler.count('bytes_downloaded', len(response.content))
             response.raise_for_status()
             return response
         except requests.exceptions.RequestException as e:
             print(f"API request failed: {e}")
             return None
 
-    def extract_college_data(self, 
-                           years: List[int] = None) -> pd.DataFrame:
-        """Extract college QB stats from the API"""
-        if years is None:
-            years = list(range(2001, 2024))  # Full range 2001-2023
+    def season_ttl(self, year: int) -> Optional[float]:
+        """Cache lifetime for a season's data (None = never expires)"""
+        if year < datetime.now().year:
+            return None
+        return self.current_season_ttl
+
+    def fetch_json(self, url: str, params: Dict = None, 
+                   ttl: Optional[float] = None) -> Optional[any]:
+        """Fetch a JSON payload through the response cache, revalidating 
+        stale entries with ETag/If-Modified-Since"""
+        cache = self.response_cache
+        entry = cache.get(url, params) if cache else None
         
-        all_stats = []
+        if entry and entry['fresh']:
+            self.profiler.count('cache_hits')
+            body = entry['body']
+        else:
+            if cache:
+                self.profiler.count('cache_misses')
+            conditional = cache.conditional_headers(entry) if cache else None
+            response = self.rate_limited_request(url, params, 
+                                                 headers=conditional)
+            
+            if response is None:
+                if entry is None:
+                    return None
+                print("   Using stale cached response")
+                body = entry['body']
+            elif response.status_code == 304 and entry:
+                self.profiler.count('cache_revalidated')
+                cache.revalidate(entry, response.headers, ttl)
+                body = entry['body']
+            else:
+                body = response.content
+                if cache:
+                    cache.store(url, params, body, response.headers, ttl)
         
-        print("Extracting college quarterback data...")
-        for year in years:
-            print(f"Processing year {year}...")
+        try:
+            return json.loads(body)
+        except json.JSONDecodeError as e:
+            print(f"   JSON decode error for {url}: {e}")
+            return None
+
+    def _fetch_college_category(self, year: int, 
+                                category: str) -> Optional[List[Dict]]:
+        """Fetch one season's raw player stats for one stat category"""
+        stats_url = f"{self.base_url}/stats/player/season"
+        params = {
+            'year': year,
+            'category': category,
+            'seasonType': 'regular'
+        }
+        rows = self.fetch_json(stats_url, params, ttl=self.season_ttl(year))
+        if rows is None:
+            return None
+        # Tag rows so the pivot can tell e.g. passing and rushing YDS apart
+        return [{**row, 'category': row.get('category') or category} 
+                for row in rows]
+
+    def _submit_college_year(self, executor: ThreadPoolExecutor, 
+                             year: int) -> List[Future]:
+        """Queue one request per stat category of a season on executor"""
+        return [executor.submit(self._fetch_college_category, year, 
+                                category) 
+                for category in self.college_categories]
+
+    def _collect_college_year(self, fetches: List[Future]
+                              ) -> Tuple[Optional[List[Dict]], List[str]]:
+        """One season's raw player stat payload from its category 
+        requests, and the optional categories that failed. The payload 
+        is None if a required category failed, so a season without 
+        passing stats is never parsed"""
+        results = dict(zip(self.college_categories, 
+                           [fetch.result() for fetch in fetches]))
+        if any(results[category] is None for category in COLLEGE_CATEGORIES):
+            return None, []
+        failed = [category for category, rows in results.items() 
+                  if rows is None]
+        return ([row for rows in results.values() if rows is not None 
+                 for row in rows], failed)
+
+    def _parse_college_year(self, year: int, 
+                            year_stats: List[Dict]) -> pd.DataFrame:
+        """Convert one season's raw payload into a typed QB stat frame"""
+        try:
+            # Convert list of individual stats to DataFrame for 
+            # easier manipulation
+            stats_df = pd.DataFrame(year_stats)
+            
+            # Filter to only QBs
+            qb_stats = stats_df[stats_df['position'] == 'QB'].copy()
+            
+            if len(qb_stats) == 0:
+                print(f"   No QB stats found for {year}")
+                return pd.DataFrame()
             
-            # Get player stats for QBs
-            stats_url = f"{self.base_url}/stats/player/season"
-            params = {
+            # Stats arrive as strings; make them numeric before the 
+            # pivot so the aggregation runs on a numeric column
+            qb_stats['stat'] = pd.to_numeric(qb_stats['stat'], 
+                                             errors='coerce')
+            if 'category' not in qb_stats.columns:
+                qb_stats['category'] = 'passing'
+            
+            # Pivot the data so each player has one row with all 
+            # their stats
+            # Group by player and pivot (category, statType) to columns
+            player_stats = qb_stats.pivot_table(
+                index=['playerId', 'player', 'team', 'conference'], 
+                columns=['category', 'statType'], 
+                values='stat', 
+                aggfunc='first'  # In case of duplicates, take first
+            )
+            keys = player_stats.index
+            
+            # Convert to our format column by column
+            season_df = pd.DataFrame({
+                'player_name': keys.get_level_values('player'),
+                'player_id': keys.get_level_values('playerId').astype(str),
+                'team': keys.get_level_values('team'),
+                'conference': keys.get_level_values('conference'),
                 'year': year,
-                'category': 'passing',
-                'seasonType': 'regular'
-            }
+                'position': 'QB'
+            })
+            for stat_key, (column, dtype) in COLLEGE_STAT_COLUMNS.items():
+                if stat_key in player_stats.columns:
+                    season_df[column] = (player_stats[stat_key]
+                                         .fillna(0).astype(dtype).values)
+                else:
+                    season_df[column] = pd.Series(0, index=season_df.index, 
+                                                  dtype=dtype)
             
-            response = self.rate_limited_request(stats_url, params)
-            if response:
-                try:
-                    year_stats = response.json()
-                    
-                    # Convert list of individual stats to DataFrame for 
-                    # easier manipulation
-                    stats_df = pd.DataFrame(year_stats)
-                    
-                    # Filter to only QBs
-                    qb_stats = stats_df[stats_df['position'] == 'QB'].copy()
-                    
-                    if len(qb_stats) == 0:
-                        print(f"   No QB stats found for {year}")
-                        continue
-                    
-                    # Pivot the data so each player has one row with all 
-                    # their stats
-                    # Group by player and pivot statType to columns
-                    player_stats = qb_stats.pivot_table(
-                        index=['playerId', 'player', 'team', 'conference'], 
-                        columns='statType', 
-                        values='stat', 
-                        aggfunc='first'  # In case of duplicates, take first
-                    ).reset_index()
-                    
-                    # Convert to our format
-                    for _, player in player_stats.iterrows():
-                        all_stats.append({
-                            'player_name': player['player'],
-                            'team': player['team'],
-                            'conference': player['conference'],
-                            'year': year,
-                            'position': 'QB',
-                            'pass_attempts': int(player.get('ATT', 0) or 0),
-                            'pass_completions': int(player.get('COMPLETIONS', 
-                                                              0) or 0),
-                            'pass_yards': int(player.get('YDS', 0) or 0),
-                            'pass_tds': int(player.get('TD', 0) or 0),
-                            'interceptions': int(player.get('INT', 0) or 0),
-                            'qb_rating': float(player.get('QBR', 0) or 0),
-                            'yards_per_attempt': float(player.get('YPA', 
-                                                                 0) or 0),
-                            'games': int(player.get('GAMES', 0) or 0)
-                        })
-                    
-                    print(f"   Successfully processed {len(player_stats)} "
-                          f"QBs")
-                    
-                except json.JSONDecodeError as e:
-                    print(f"   JSON decode error for {year}: {e}")
-                except Exception as e:
-                    print(f"   Error processing year {year}: {e}")
-            else:
-                print(f"   Failed to get data for year {year}")
+            print(f"   Successfully processed {len(season_df)} "
+                  f"QBs for {year}")
+            return season_df
+            
+        except Exception as e:
+            print(f"   Error processing year {year}: {e}")
+            return pd.DataFrame()
+
+    def _extract_college_year(self, year: int, 
+                              fetches: List[Future]) -> pd.DataFrame:
+        """Parse one season of college QB stats once its category 
+        requests are done"""
+        year_stats, failed = self._collect_college_year(fetches)
+        print(f"Processing year {year}...")
+        if year_stats is None:
+            print(f"   Failed to get data for year {year}")
+            return pd.DataFrame()
+        if failed:
+            print(f"   Failed to get {', '.join(failed)} stats for {year}, "
+                  f"leaving them at 0")
+        
+        with self.profiler.timed('parse_s'):
+            return self._parse_college_year(year, year_stats)
+
+    def _refresh_college_year(self, year: int, fetches: List[Future], 
+                              manifest: ETLManifest, season_dir: str
+                              ) -> Tuple[pd.DataFrame, Set[str]]:
+        """Re-parse a season only if its API payload changed. Returns 
+        the season's records and the names of players it touched"""
+        season_path = os.path.join(season_dir, f"college_{year}.pkl")
+        has_previous = os.path.exists(season_path)
+        previous = (pd.read_pickle(season_path) if has_previous 
+                    else pd.DataFrame())
+        
+        year_stats, failed = self._collect_college_year(fetches)
+        if year_stats is None or (failed and has_previous):
+            print(f"   Failed to get data for year {year}, keeping "
+                  f"previous extract")
+            return previous, set()
+        
+        payload_hash = ETLManifest.hash_payload(year_stats)
+        if has_previous and manifest.season_hash(year) == payload_hash:
+            return previous, set()
+        
+        print(f"Processing changed year {year}...")
+        with self.profiler.timed('parse_s'):
+            season_df = self._parse_college_year(year, year_stats)
+        season_df.to_pickle(season_path)
+        if failed:
+            # Passing stats are usable now; leaving the season unrecorded 
+            # makes the next run fetch the missing categories again
+            print(f"   Failed to get {', '.join(failed)} stats for {year}, "
+                  f"leaving them at 0")
+        else:
+            manifest.update_season(year, payload_hash, len(season_df))
+        
+        # Both the old and new versions of the season feed career totals
+        touched = set()
+        for frame in (previous, season_df):
+            if 'player_name' in frame.columns:
+                touched.update(frame['player_name'].str.strip().str.title())
+        return season_df, touched
+
+    def iter_college_seasons(self, years: List[int] = None, 
+                             max_workers: int = None
+                             ) -> Iterator[Tuple[int, pd.DataFrame]]:
+        """Yield (year, season frame) in year order
+        
+        Every (season, stat category) request goes to one pool of 
+        max_workers threads. At most max_workers seasons are queued at 
+        a time, so only a window of raw payloads is ever held in 
+        memory; each season is parsed once all its categories are in.
+        """
+        if years is None:
+            years = list(range(2001, 2024))  # Full range 2001-2023
+        if max_workers is None:
+            max_workers = self.max_workers
+        
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for year in sorted(years):
+                pending.append((year, self._submit_college_year(executor, 
+                                                                year)))
+                if len(pending) >= max_workers:
+                    done_year, fetches = pending.popleft()
+                    yield done_year, self._extract_college_year(done_year, 
+                                                                fetches)
+            while pending:
+                done_year, fetches = pending.popleft()
+                yield done_year, self._extract_college_year(done_year, 
+                                                            fetches)
+        
+        if self.response_cache:
+            self.response_cache.flush()
+            stats = self.response_cache.stats()
+            print(f"Response cache: {stats['hits']} hits, "
+                  f"{stats['misses']} misses, "
+                  f"{stats['revalidated']} revalidated")
+
+    def extract_college_data(self, years: List[int] = None, 
+                           max_workers: int = None) -> pd.DataFrame:
+        """Extract college QB stats from the API, fetching seasons and 
+        stat categories concurrently under the shared rate limiter"""
+        if max_workers is None:
+            max_workers = self.max_workers
         
-        self.college_stats = pd.DataFrame(all_stats)
+        print(f"Extracting college quarterback data "
+              f"({max_workers} concurrent requests)...")
+        
+        # Seasons arrive in year order regardless of which request 
+        # finished first; concatenate the frames once
+        frames = [season_df for _, season_df 
+                  in self.iter_college_seasons(years, max_workers) 
+                  if not season_df.empty]
+        self.college_stats = (pd.concat(frames, ignore_index=True) 
+                              if frames else pd.DataFrame())
         print(f"College data extraction complete: "
               f"{len(self.college_stats)} records")
         return self.college_stats
 
-    def extract_nfl_data(self) -> pd.DataFrame:
-        """Extract NFL stats from CSV file"""
+    @staticmethod
+    def _sniff_encoding(path: str, sample_size: int = 64 * 1024) -> str:
+        """Guess a CSV's encoding from a byte sample"""
+        with open(path, 'rb') as f:
+            sample = f.read(sample_size)
+        
+        if sample.startswith(b'\xef\xbb\xbf'):
+            return 'utf-8-sig'
+        try:
+            sample.decode('utf-8')
+            return 'utf-8'
+        except UnicodeDecodeError as e:
+            # A multi-byte character cut off by the sample boundary is 
+            # still valid UTF-8
+            if e.start >= len(sample) - 3 and len(sample) == sample_size:
+                return 'utf-8'
+            return 'latin-1'
+
+    def extract_nfl_data(self, use_pyarrow: bool = None, 
+                         memory_map: bool = False) -> pd.DataFrame:
+        """Extract NFL stats from CSV file, parsing only the columns in 
+        NFL_COLUMN_MAPPING with explicit dtypes"""
         try:
             print("Loading NFL data from CSV...")
             
-            # Try to read CSV with different encodings
-            encodings = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252']
+            encoding = self._sniff_encoding(self.csv_file_path)
+            header = pd.read_csv(self.csv_file_path, nrows=0, 
+                                 encoding=encoding).columns
             
-            for encoding in encodings:
-                try:
-                    self.nfl_stats = pd.read_csv(self.csv_file_path, 
-                                               encoding=encoding)
-                    break
-                except UnicodeDecodeError:
-                    continue
-                except Exception as e:
-                    print(f"Error with {encoding}: {e}")
-                    continue
-            else:
-                print("Failed to load CSV with any encoding")
+            # Project the mapped columns, first source column wins when 
+            # a file has several variants of the same field
+            existing_cols = {}
+            for source, target in NFL_COLUMN_MAPPING.items():
+                if source in header and target not in existing_cols.values():
+                    existing_cols[source] = target
+            if not existing_cols:
+                print("No recognized NFL stat columns in CSV")
                 return pd.DataFrame()
             
-            # Standardize column names (comprehensive mapping)
-            column_mapping = {
-                # Name variations
-                'Name': 'player_name',
-                'Player': 'player_name',
-                'Player_Name': 'player_name',
-                'PLAYER': 'player_name',
-                # Team variations
-                'Tm': 'nfl_team',
-                'Team': 'nfl_team',
-                'NFL_Team': 'nfl_team',
-                # Year variations
-                'Year': 'nfl_year',
-                'Season': 'nfl_year',
-                'YEAR': 'nfl_year',
-                # Games variations
-                'G': 'nfl_games',
-                'Games': 'nfl_games',
-                'GP': 'nfl_games',
-                # Passing stats
-                'Att': 'nfl_pass_attempts',
-                'ATT': 'nfl_pass_attempts',
-                'Pass_Att': 'nfl_pass_attempts',
-                'Cmp': 'nfl_pass_completions',
-                'CMP': 'nfl_pass_completions',
-                'Completions': 'nfl_pass_completions',
-                'Yds': 'nfl_pass_yards',
-                'YDS': 'nfl_pass_yards',
-                'Pass_Yds': 'nfl_pass_yards',
-                'Passing_Yards': 'nfl_pass_yards',
-                'TD': 'nfl_pass_tds',
-                'Pass_TD': 'nfl_pass_tds',
-                'Int': 'nfl_interceptions',
-                'INT': 'nfl_interceptions',
-                'Interceptions': 'nfl_interceptions',
-                'Rate': 'nfl_qb_rating',
-                'QBR': 'nfl_qb_rating',
-                'Passer_Rating': 'nfl_qb_rating'
-            }
+            dtypes = {source: NFL_COLUMN_DTYPES.get(target, 'float64') 
+                      for source, target in existing_cols.items()}
+            
+            if use_pyarrow is None:
+                use_pyarrow = columnar_available() and not memory_map
+            read_options = ({'engine': 'pyarrow'} if use_pyarrow 
+                            else {'memory_map': memory_map})
             
-            # Rename columns that exist
-            existing_cols = {k: v for k, v in column_mapping.items() 
-                           if k in self.nfl_stats.columns}
-            if existing_cols:
-                self.nfl_stats.rename(columns=existing_cols, inplace=True)
+            try:
+                self.nfl_stats = pd.read_csv(
+                    self.csv_file_path, encoding=encoding, 
+                    usecols=list(existing_cols), dtype=dtypes, 
+                    **read_options)
+            except UnicodeDecodeError:
+                # The sample looked like UTF-8 but the rest of the file 
+                # is not
+                self.nfl_stats = pd.read_csv(
+                    self.csv_file_path, encoding='latin-1', 
+                    usecols=list(existing_cols), dtype=dtypes, 
+                    **read_options)
+            except (ValueError, TypeError) as e:
+                # Non-numeric junk in a stat column - let clean_nfl_data 
+                # coerce it instead
+                print(f"Typed parse failed ({e}), inferring dtypes")
+                self.nfl_stats = pd.read_csv(
+                    self.csv_file_path, encoding=encoding, 
+                    usecols=list(existing_cols))
+            
+            # Keep file column order whichever engine parsed it, then 
+            # standardize column names
+            self.nfl_stats = self.nfl_stats[
+                [col for col in header if col in existing_cols]]
+            self.nfl_stats = self.nfl_stats.rename(columns=existing_cols)
             
             print(f"Loaded {len(self.nfl_stats)} NFL records")
             return self.nfl_stats
@@ -203,22 +596,29 @@ class QBStatsETL:
             print(f"Error loading NFL data: {e}")
             return pd.DataFrame()
 
-    def clean_college_data(self) -> pd.DataFrame:
-        """Clean and standardize college data"""
-        if self.college_stats.empty:
-            return self.college_stats
-        
-        print("Cleaning college data...")
-        
+    def compact(self, name: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Shrink a table's dtypes and report the memory saved"""
+        if df.empty:
+            return df
+        before = frame_bytes(df)
+        df = compact_frame(df, CATEGORY_COLUMNS[name])
+        after = frame_bytes(df)
+        self.profiler.count('bytes_saved', before - after)
+        print(f"   Memory {compact_report(name, before, after)}")
+        return df
+
+    @staticmethod
+    def _clean_college_frame(college_stats: pd.DataFrame) -> pd.DataFrame:
+        """Clean and standardize a frame of college season rows"""
         # Remove duplicates
-        self.college_stats.drop_duplicates(
-            subset=['player_name', 'team', 'year'], inplace=True)
+        college_stats = college_stats.drop_duplicates(
+            subset=['player_name', 'team', 'year'])
         
         # Clean player names
-        self.college_stats['player_name'] = (
-            self.college_stats['player_name'].str.strip())
-        self.college_stats['player_name'] = (
-            self.college_stats['player_name'].str.title())
+        college_stats['player_name'] = (
+            college_stats['player_name'].str.strip())
+        college_stats['player_name'] = (
+            college_stats['player_name'].str.title())
         
         # Convert numeric columns
         numeric_cols = ['games', 'pass_attempts', 'pass_completions', 
@@ -226,23 +626,31 @@ class QBStatsETL:
                        'qb_rating', 'yards_per_attempt']
         
         for col in numeric_cols:
-            self.college_stats[col] = pd.to_numeric(
-                self.college_stats[col], errors='coerce').fillna(0)
+            college_stats[col] = pd.to_numeric(
+                college_stats[col], errors='coerce').fillna(0)
         
         # Calculate additional metrics
-        self.college_stats['completion_percentage'] = (
-            self.college_stats['pass_completions'] / 
-            self.college_stats['pass_attempts'] * 100
+        college_stats['completion_percentage'] = (
+            college_stats['pass_completions'] / 
+            college_stats['pass_attempts'] * 100
         ).fillna(0)
         
-        self.college_stats['td_int_ratio'] = (
-            self.college_stats['pass_tds'] / 
-            self.college_stats['interceptions'].replace(0, 1)
+        college_stats['td_int_ratio'] = (
+            college_stats['pass_tds'] / 
+            college_stats['interceptions'].replace(0, 1)
         )
         
         # Filter out players with minimal activity
-        self.college_stats = self.college_stats[
-            self.college_stats['pass_attempts'] >= 50]
+        return college_stats[college_stats['pass_attempts'] >= 50]
+
+    def clean_college_data(self) -> pd.DataFrame:
+        """Clean and standardize college data"""
+        if self.college_stats.empty:
+            return self.college_stats
+        
+        print("Cleaning college data...")
+        self.college_stats = self.compact(
+            'college_stats', self._clean_college_frame(self.college_stats))
         
         print(f"College data cleaned: {len(self.college_stats)} records "
               f"remaining")
@@ -300,19 +708,16 @@ class QBStatsETL:
                 (self.nfl_stats['nfl_year'] <= 2023)
             ]
         
+        self.nfl_stats = self.compact('nfl_stats', self.nfl_stats)
         print(f"NFL data cleaned: {len(self.nfl_stats)} records")
         return self.nfl_stats
 
-    def merge_data(self) -> pd.DataFrame:
-        """Merge college and NFL data"""
-        if self.college_stats.empty or self.nfl_stats.empty:
-            print("Warning: One or both datasets are empty")
-            return pd.DataFrame()
-        
-        print("Merging college and NFL data...")
-        
-        # Group college stats by player (career totals)
-        college_career = self.college_stats.groupby('player_name').agg({
+    def _aggregate_college_career(self, 
+                                  college_stats: pd.DataFrame
+                                  ) -> pd.DataFrame:
+        """Group college stats by player (career totals)"""
+        college_career = widen_numeric(college_stats).groupby(
+            'player_name', observed=True).agg({
             'team': 'last',  # Most recent team
             'conference': 'last',
             'year': ['min', 'max'],  # College career span
@@ -335,98 +740,491 @@ class QBStatsETL:
             'college_interceptions', 'college_completion_pct', 
             'college_td_int_ratio', 'college_yards_per_attempt'
         ]
+        return college_career
+
+    @staticmethod
+    def _partial_college_career(season_df: pd.DataFrame) -> pd.DataFrame:
+        """Per-player partial career aggregates for one season's rows
+        
+        Means are kept as sums and counts so partials from different 
+        seasons can be combined exactly.
+        """
+        aggs = {
+            'team': ('team', 'last'),
+            'conference': ('conference', 'last'),
+            'year_min': ('year', 'min'),
+            'year_max': ('year', 'max'),
+            **{col: (col, 'sum') for col in COLLEGE_SUM_COLUMNS}
+        }
+        for col in COLLEGE_MEAN_COLUMNS:
+            aggs[f"{col}_sum"] = (col, 'sum')
+            aggs[f"{col}_count"] = (col, 'count')
+        return season_df.groupby('player_name').agg(**aggs)
+
+    @staticmethod
+    def _combine_college_partials(totals: pd.DataFrame, 
+                                  partial: pd.DataFrame) -> pd.DataFrame:
+        """Fold a season's partial aggregates into the running totals"""
+        if totals.empty:
+            return partial
+        rules = {col: 'sum' for col in partial.columns}
+        rules.update({'team': 'last', 'conference': 'last', 
+                      'year_min': 'min', 'year_max': 'max'})
+        return pd.concat([totals, partial]).groupby(level=0).agg(rules)
+
+    @staticmethod
+    def _finish_college_career(totals: pd.DataFrame) -> pd.DataFrame:
+        """Turn running partial totals into the same career table 
+        _aggregate_college_career builds"""
+        college_career = pd.DataFrame({
+            'player_name': totals.index,
+            'college_team': totals['team'].values,
+            'college_conference': totals['conference'].values,
+            'college_start_year': totals['year_min'].values,
+            'college_end_year': totals['year_max'].values
+        })
+        for col in COLLEGE_SUM_COLUMNS:
+            college_career[f"college_{col}"] = totals[col].values
+        means = {col: (totals[f"{col}_sum"] / totals[f"{col}_count"]).values 
+                 for col in COLLEGE_MEAN_COLUMNS}
+        college_career['college_completion_pct'] = (
+            means['completion_percentage'])
+        college_career['college_td_int_ratio'] = means['td_int_ratio']
+        college_career['college_yards_per_attempt'] = (
+            means['yards_per_attempt'])
+        return college_career
+
+    def _aggregate_nfl_career(self, nfl_stats: pd.DataFrame) -> pd.DataFrame:
+        """Group NFL stats by player (career totals/averages)"""
+        # Define aggregation rules for NFL stats
+        agg_funcs = {}
+        for col in nfl_stats.columns:
+            if col in ['player_name', 'nfl_team']:
+                continue
+            elif any(word in col.lower() for word in 
+                    ['games', 'attempts', 'yards', 'tds', 
+                     'completions', 'interceptions']):
+                agg_funcs[col] = 'sum'
+            elif col in ['nfl_completion_percentage', 'nfl_td_int_ratio', 
+                       'nfl_qb_rating', 'nfl_yards_per_attempt']:
+                agg_funcs[col] = 'mean'
+            else:
+                agg_funcs[col] = 'mean'
+        
+        nfl_career = widen_numeric(nfl_stats).groupby(
+            'player_name', observed=True).agg(agg_funcs).reset_index()
+        
+        # Recalculate completion percentage and TD/INT ratio based on 
+        # career totals for accuracy
+        if ('nfl_pass_attempts' in nfl_career.columns and 
+            'nfl_pass_completions' in nfl_career.columns):
+            nfl_career['nfl_completion_percentage'] = (
+                nfl_career['nfl_pass_completions'] / 
+                nfl_career['nfl_pass_attempts'] * 100
+            ).fillna(0)
+        
+        if ('nfl_pass_tds' in nfl_career.columns and 
+            'nfl_interceptions' in nfl_career.columns):
+            nfl_career['nfl_td_int_ratio'] = (
+                nfl_career['nfl_pass_tds'] / 
+                nfl_career['nfl_interceptions'].replace(0, 1)
+            ).fillna(0)
+        
+        if ('nfl_pass_yards' in nfl_career.columns and 
+            'nfl_pass_attempts' in nfl_career.columns):
+            nfl_career['nfl_yards_per_attempt'] = (
+                nfl_career['nfl_pass_yards'] / 
+                nfl_career['nfl_pass_attempts']
+            ).fillna(0)
+        
+        return nfl_career
+
+    @staticmethod
+    def _splice_careers(previous: pd.DataFrame, updated: pd.DataFrame, 
+                        players: Set[str]) -> pd.DataFrame:
+        """Replace the career rows of the given players, keeping the 
+        name ordering a full groupby would produce"""
+        kept = previous[~previous['player_name'].isin(players)]
+        spliced = pd.concat([kept, updated], ignore_index=True)
+        return spliced.sort_values('player_name', ignore_index=True)
+
+    def merge_data(self, college_players: Optional[Set[str]] = None, 
+                   nfl_players: Optional[Set[str]] = None
+                   ) -> pd.DataFrame:
+        """Merge college and NFL data
+        
+        college_players / nfl_players limit re-aggregation to those 
+        players, reusing the career rows from the previous merge for 
+        everyone else. None rebuilds that side from scratch.
+        """
+        no_college = self.college_stats.empty and self.college_career.empty
+        if no_college or self.nfl_stats.empty:
+            print("Warning: One or both datasets are empty")
+            return pd.DataFrame()
+        
+        print("Merging college and NFL data...")
+        
+        if college_players is None or self.college_career.empty:
+            self.college_career = self._aggregate_college_career(
+                self.college_stats)
+        elif college_players:
+            updated = self._aggregate_college_career(
+                self.college_stats[
+                    self.college_stats['player_name'].isin(college_players)])
+            self.college_career = self._splice_careers(
+                self.college_career, updated, college_players)
         
-        # Group NFL stats by player (career totals/averages)
         if 'player_name' in self.nfl_stats.columns:
-            # Define aggregation rules for NFL stats
-            agg_funcs = {}
-            for col in self.nfl_stats.columns:
-                if col in ['player_name', 'nfl_team']:
-                    continue
-                elif any(word in col.lower() for word in 
-                        ['games', 'attempts', 'yards', 'tds', 
-                         'completions', 'interceptions']):
-                    agg_funcs[col] = 'sum'
-                elif col in ['nfl_completion_percentage', 'nfl_td_int_ratio', 
-                           'nfl_qb_rating', 'nfl_yards_per_attempt']:
-                    agg_funcs[col] = 'mean'
-                else:
-                    agg_funcs[col] = 'mean'
-            
-            nfl_career = self.nfl_stats.groupby('player_name').agg(
-                agg_funcs).reset_index()
-            
-            # Recalculate completion percentage and TD/INT ratio based on 
-            # career totals for accuracy
-            if ('nfl_pass_attempts' in nfl_career.columns and 
-                'nfl_pass_completions' in nfl_career.columns):
-                nfl_career['nfl_completion_percentage'] = (
-                    nfl_career['nfl_pass_completions'] / 
-                    nfl_career['nfl_pass_attempts'] * 100
-                ).fillna(0)
-            
-            if ('nfl_pass_tds' in nfl_career.columns and 
-                'nfl_interceptions' in nfl_career.columns):
-                nfl_career['nfl_td_int_ratio'] = (
-                    nfl_career['nfl_pass_tds'] / 
-                    nfl_career['nfl_interceptions'].replace(0, 1)
-                ).fillna(0)
-            
-            if ('nfl_pass_yards' in nfl_career.columns and 
-                'nfl_pass_attempts' in nfl_career.columns):
-                nfl_career['nfl_yards_per_attempt'] = (
-                    nfl_career['nfl_pass_yards'] / 
-                    nfl_career['nfl_pass_attempts']
-                ).fillna(0)
+            if nfl_players is None or self.nfl_career.empty:
+                self.nfl_career = self._aggregate_nfl_career(self.nfl_stats)
+            elif nfl_players:
+                updated = self._aggregate_nfl_career(
+                    self.nfl_stats[
+                        self.nfl_stats['player_name'].isin(nfl_players)])
+                self.nfl_career = self._splice_careers(
+                    self.nfl_career, updated, nfl_players)
             
             # Merge the datasets
-            self.combined_data = pd.merge(college_career, nfl_career, 
+            self.combined_data = pd.merge(self.college_career, 
+                                        self.nfl_career, 
                                         on='player_name', how='inner')
             
             print(f"Successfully merged data for "
                   f"{len(self.combined_data)} players")
         else:
             print("Error: 'player_name' column not found in NFL data")
-            self.combined_data = college_career
+            self.combined_data = self.college_career
+        
+        self.college_career = self.compact('college_career', 
+                                           self.college_career)
+        self.nfl_career = self.compact('nfl_career', self.nfl_career)
+        self.combined_data = self.compact('combined_data', self.combined_data)
         
+        self.build_player_index()
+        self.feature_table = None
+        self.comparable_index = None
+        self.success_model = None
         return self.combined_data
 
-    def save_raw_data(self) -> str:
-        """Save raw data to data/raw/ directory"""
-        os.makedirs('data/raw', exist_ok=True)
+    def build_player_index(self) -> PlayerIndex:
+        """Build the name search index over combined_data"""
+        self.player_index = PlayerIndex(self.combined_data['player_name'])
+        return self.player_index
+
+    def build_feature_table(self) -> FeatureTable:
+        """Precompute peer percentiles and z-scores for every merged QB 
+        and their college and NFL seasons"""
+        if self.combined_data.empty:
+            self.feature_table = FeatureTable(self.combined_data)
+            return self.feature_table
+        
+        # A streaming run keeps its college seasons on disk
+        college = (self.college_stats if not self.college_stats.empty 
+                   else self.load_spilled_college_stats())
+        players = self.combined_data['player_name']
+        if not college.empty:
+            college = college[college['player_name'].isin(players)]
+        nfl = self.nfl_stats
+        if 'player_name' in nfl.columns:
+            nfl = nfl[nfl['player_name'].isin(players)]
+        self.feature_table = FeatureTable(self.combined_data, college, nfl)
+        return self.feature_table
+
+    def build_comparable_index(self) -> ComparableIndex:
+        """Index every merged QB's standardized college stats for 
+        nearest-neighbor comparisons"""
+        self.comparable_index = ComparableIndex(self.combined_data)
+        if self.enricher is not None:
+            self.enricher.comparable_index = self.comparable_index
+        return self.comparable_index
+
+    def _get_comparable_index(self) -> Optional[ComparableIndex]:
+        """The comparable index, built on first use"""
+        with self.data_lock:
+            if (self.comparable_index is None and 
+                    not self.combined_data.empty):
+                self.build_comparable_index()
+            return self.comparable_index
+
+    def build_success_model(self) -> SuccessModel:
+        """Fit the local success model on the merged careers"""
+        self.success_model = SuccessModel().fit(self.combined_data)
+        if self.enricher is not None:
+            self.enricher.success_model = self.success_model
+        return self.success_model
+
+    def _get_success_model(self) -> Optional[SuccessModel]:
+        """The success model, fit on first use"""
+        with self.data_lock:
+            if self.success_model is None and not self.combined_data.empty:
+                self.build_success_model()
+            return self.success_model
+
+    def find_comparables(self, player_data: pd.Series, 
+                         k: int = 5) -> pd.DataFrame:
+        """The k merged QBs with the most similar college stats, with 
+        their NFL outcomes"""
+        comparable_index = self._get_comparable_index()
+        if comparable_index is None:
+            return pd.DataFrame()
+        return comparable_index.neighbors(player_data, k)
+
+    def with_features(self, player_data: pd.Series) -> pd.Series:
+        """A player's row with their career percentile / z-score 
+        features appended"""
+        with self.data_lock:
+            if self.feature_table is None and not self.combined_data.empty:
+                self.build_feature_table()
+            feature_table = self.feature_table
+        features = (feature_table.career(player_data['player_name']) 
+                    if feature_table is not None else None)
+        if features is None:
+            return player_data
+        return pd.concat([player_data, features.drop(
+            player_data.index, errors='ignore')])
+
+    @staticmethod
+    def _college_final_seasons(college_stats: pd.DataFrame) -> pd.DataFrame:
+        """Last college season per player ID, sorted by year for the 
+        as-of join"""
+        college = college_stats.copy()
+        college['name_key'] = (college['player_name'].map(normalize_name)
+                               .astype('str'))
+        
+        # Season extracts from before player IDs were kept fall back to 
+        # a name-derived ID
+        name_ids = 'name-' + college['name_key'].str.replace(' ', '-')
+        if 'player_id' in college.columns:
+            college['player_id'] = ('cfb-' + college['player_id'].astype(str)
+                                    ).where(college['player_id'].notna(), 
+                                            name_ids)
+        else:
+            college['player_id'] = name_ids
+        
+        finals = (college.sort_values(['player_id', 'year'])
+                  .drop_duplicates('player_id', keep='last'))
+        finals = finals.rename(columns={
+            'year': 'college_final_year',
+            'team': 'college_team',
+            'conference': 'college_conference',
+            **{col: f"college_final_{col}" for col in 
+               ['pass_attempts', 'pass_completions', 'pass_yards', 
+                'pass_tds', 'interceptions', 'completion_percentage', 
+                'td_int_ratio', 'yards_per_attempt', 'rush_attempts', 
+                'rush_yards', 'rush_tds', 'fumbles', 'fumbles_lost']}
+        }).drop(columns=['player_name', 'position', 'games', 'qb_rating'], 
+                errors='ignore')
+        return finals.sort_values('college_final_year', ignore_index=True)
+
+    @staticmethod
+    def _combine_college_finals(finals: pd.DataFrame, 
+                                season_finals: pd.DataFrame) -> pd.DataFrame:
+        """Fold one season's final-season rows into the running finals"""
+        if finals.empty:
+            return season_finals
+        combined = (pd.concat([finals, season_finals], ignore_index=True)
+                    .sort_values(['player_id', 'college_final_year'], 
+                                 kind='stable')
+                    .drop_duplicates('player_id', keep='last'))
+        return combined.sort_values('college_final_year', kind='stable', 
+                                    ignore_index=True)
+
+    @staticmethod
+    def _new_nfl_seasons(previous: pd.DataFrame, 
+                         current: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """Rows of current from NFL seasons previous did not have, or 
+        None if any season previous covered has changed"""
+        def plain(df: pd.DataFrame) -> pd.DataFrame:
+            # Compacted categoricals differ in their category sets
+            return df.reset_index(drop=True).astype({
+                col: 'str' for col in df.columns 
+                if isinstance(df[col].dtype, pd.CategoricalDtype)})
+        
+        seen = current['nfl_year'].isin(previous['nfl_year'].unique())
+        if not plain(current[seen]).equals(plain(previous)):
+            return None
+        return current[~seen]
+
+    @staticmethod
+    def _rookie_years(nfl_seasons: pd.DataFrame) -> pd.DataFrame:
+        """First NFL season per normalized name"""
+        rookies = (nfl_seasons.groupby('name_key', as_index=False)
+                   ['nfl_year'].min()
+                   .rename(columns={'nfl_year': 'rookie_year'}))
+        rookies['rookie_year'] = rookies['rookie_year'].astype('int64')
+        return rookies
+
+    @staticmethod
+    def _link_rookies(rookies: pd.DataFrame, finals: pd.DataFrame, 
+                      max_gap: int = 3) -> pd.DataFrame:
+        """Link each NFL rookie year to the latest earlier college final 
+        season of the same name with a sort-merge as-of join"""
+        rookies = rookies.sort_values('rookie_year', ignore_index=True)
+        finals = finals.copy()
+        
+        # merge_asof needs matching key dtypes on both sides
+        finals['college_final_year'] = (finals['college_final_year']
+                                        .astype('int64'))
+        
+        links = pd.merge_asof(
+            rookies, finals, 
+            left_on='rookie_year', right_on='college_final_year', 
+            by='name_key', direction='backward', 
+            allow_exact_matches=False, tolerance=max_gap)
+        # Unmatched rookies made the college columns nullable; restore 
+        # their dtypes once those rows are gone
+        links = links.dropna(subset=['player_id']).reset_index(drop=True)
+        return links.astype(finals.dtypes.drop('name_key').to_dict())
+
+    def merge_seasons(self, new_nfl_seasons: pd.DataFrame = None 
+                      ) -> pd.DataFrame:
+        """Build the season-level merged table
+        
+        Each row is one NFL season of a player, carrying a stable 
+        player_id (the college API's playerId), the player's final 
+        college season and their NFL season number. Players are linked 
+        once, at their rookie year, by an as-of join against college 
+        final seasons; later seasons reuse the link. Passing 
+        new_nfl_seasons (cleaned NFL rows) appends just those rows, 
+        linking only players not seen before.
+        
+        Without college_stats (a streaming run) the college final 
+        seasons accumulated during extraction are used instead.
+        """
+        if not self.college_stats.empty:
+            self.college_finals = self._college_final_seasons(
+                self.college_stats)
+        if self.college_finals.empty or self.nfl_stats.empty:
+            return pd.DataFrame()
+        
+        incremental = (new_nfl_seasons is not None and 
+                       not self.season_data.empty)
+        nfl = (new_nfl_seasons if incremental else self.nfl_stats).copy()
+        nfl = nfl.dropna(subset=['player_name', 'nfl_year'])
+        nfl['name_key'] = nfl['player_name'].map(normalize_name).astype('str')
+        
+        # Only names never seen in the NFL before can be rookies; players 
+        # who were seen but not linked to a college career stay unlinked
+        if incremental:
+            rookies = self._rookie_years(
+                nfl[~nfl['name_key'].isin(self.rookie_years['name_key'])])
+            if not rookies.empty:
+                self.rookie_years = pd.concat([self.rookie_years, rookies], 
+                                              ignore_index=True)
+                self.player_links = pd.concat(
+                    [self.player_links, 
+                     self._link_rookies(rookies, self.college_finals)], 
+                    ignore_index=True)
+        else:
+            self.rookie_years = self._rookie_years(nfl)
+            self.player_links = self._link_rookies(self.rookie_years, 
+                                                   self.college_finals)
+        
+        seasons = nfl.merge(self.player_links, on='name_key', how='inner')
+        seasons['nfl_season_number'] = (seasons['nfl_year'] - 
+                                        seasons['rookie_year'] + 1
+                                        ).astype('int64')
+        seasons = seasons.drop(columns=['name_key'])
+        
+        if incremental:
+            seasons = pd.concat([self.season_data, seasons], 
+                                ignore_index=True)
+        lead = ['player_id', 'player_name', 'nfl_year', 'nfl_season_number']
+        self.season_data = self.compact(
+            'season_data', 
+            seasons[lead + [col for col in seasons.columns 
+                            if col not in lead]]
+            .sort_values(['player_id', 'nfl_year'], ignore_index=True))
+        
+        print(f"Season-level merge: {len(self.season_data)} NFL seasons "
+              f"for {self.season_data['player_id'].nunique()} players")
+        return self.season_data
+
+    def save_raw_data(self, output_format: str = None, 
+                      compression: Optional[str] = 'zstd') -> str:
+        """Save raw data to data/raw/ directory as CSV, or as typed 
+        Parquet/Feather when pyarrow is available"""
+        if output_format is None:
+            output_format = self.output_format
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        raw_filename = f"data/raw/qb_raw_data_{timestamp}.csv"
-        self.combined_data.to_csv(raw_filename, index=False)
+        raw_filename = save_table(self.combined_data, 
+                                  f"data/raw/qb_raw_data_{timestamp}", 
+                                  fmt=output_format, 
+                                  compression=compression)
         print(f"Raw data saved to {raw_filename}")
         return raw_filename
 
+    def load_raw_data(self, path: str, 
+                      columns: List[str] = None) -> pd.DataFrame:
+        """Load a saved raw data file, optionally only some columns"""
+        self.combined_data = load_table(path, columns)
+        self.player_index = None
+        self.feature_table = None
+        self.comparable_index = None
+        self.success_model = None
+        return self.combined_data
+
     def save_enriched_player(self, enriched_player: pd.Series) -> str:
-        """Save individual enriched player data to data/enriched/"""
-        os.makedirs('data/enriched', exist_ok=True)
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        player_name_clean = (enriched_player['player_name']
-                           .replace(' ', '_')
-                           .replace('.', '')
-                           .replace("'", ""))
-        filename = f"data/enriched/{player_name_clean}_{timestamp}.csv"
+        """Append an enriched player to the data/enriched/ store"""
+        return self.save_enriched_data(pd.DataFrame([enriched_player]))
+
+    def save_enriched_data(self, enriched_df: pd.DataFrame) -> str:
+        """Append enriched players to the data/enriched/ store in one 
+        transaction"""
+        if self.enriched_store is None:
+            self.enriched_store = EnrichedStore()
+        count = self.enriched_store.append_frame(enriched_df)
         
-        # Convert Series to DataFrame for saving
-        player_df = pd.DataFrame([enriched_player])
-        player_df.to_csv(filename, index=False)
+        print(f"💾 Enriched data for {count} player(s) saved to "
+              f"{self.enriched_store.db_path}")
+        return self.enriched_store.db_path
+
+    def run_etl_setup(self, years: List[int] = None, 
+                      incremental: bool = False, 
+                      streaming: bool = False) -> str:
+        """Run the ETL process and prepare for on-demand AI analysis
         
-        print(f"💾 Enriched data saved to {filename}")
-        return filename
+        Every stage is timed by self.profiler; the whole run is 
+        cProfiled when the profiler has a profile_path.
+        """
+        with self.profiler.profile():
+            if incremental:
+                return self.run_etl_incremental(years)
+            if streaming:
+                return self.run_etl_streaming(years)
+            return self._run_etl_full(years)
 
-    def run_etl_setup(self, years: List[int] = None) -> str:
-        """Run the ETL process and prepare for on-demand AI analysis"""
+    def _run_etl_full(self, years: List[int] = None) -> str:
+        """Extract, clean and merge everything from scratch"""
         print("🚀 Starting ETL process...\n")
+        profiler = self.profiler
         
         # Extract and process raw data
-        self.extract_college_data(years)
-        self.extract_nfl_data()
-        self.clean_college_data()
-        self.clean_nfl_data()
-        self.merge_data()
+        with profiler.stage('extract_college') as stage:
+            stage['rows_out'] = len(self.extract_college_data(years))
+        with profiler.stage('extract_nfl') as stage:
+            stage['rows_out'] = len(self.extract_nfl_data())
+        with profiler.stage('clean_college', 
+                            rows_in=len(self.college_stats)) as stage:
+            stage['rows_out'] = len(self.clean_college_data())
+        with profiler.stage('clean_nfl', 
+                            rows_in=len(self.nfl_stats)) as stage:
+            stage['rows_out'] = len(self.clean_nfl_data())
+        with profiler.stage('merge', rows_in=len(self.college_stats) + 
+                            len(self.nfl_stats)) as stage:
+            stage['rows_out'] = len(self.merge_data())
+        with profiler.stage('merge_seasons', 
+                            rows_in=len(self.nfl_stats)) as stage:
+            stage['rows_out'] = len(self.merge_seasons())
+        with profiler.stage('features', 
+                            rows_in=len(self.combined_data)) as stage:
+            stage['rows_out'] = len(self.build_feature_table())
+        with profiler.stage('comparables', 
+                            rows_in=len(self.combined_data)) as stage:
+            stage['rows_out'] = len(self.build_comparable_index())
+        with profiler.stage('success_model', 
+                            rows_in=len(self.combined_data)) as stage:
+            stage['rows_out'] = self.build_success_model().training_rows
         
         print(f"\n✅ ETL process complete! Dataset contains "
               f"{len(self.combined_data)} players")
@@ -436,20 +1234,370 @@ class QBStatsETL:
             return None
         
         # Save raw data
-        raw_filename = self.save_raw_data()
+        with profiler.stage('save', 
+                            rows_in=len(self.combined_data)) as stage:
+            raw_filename = self.save_raw_data()
         return raw_filename
 
-    def search_player(self, player_name: str) -> Optional[pd.Series]:
-        """Search for a specific player's stats"""
+    def run_etl_incremental(self, years: List[int] = None, 
+                            state_dir: str = 'data/cache/incremental'
+                            ) -> str:
+        """Run the ETL process, re-extracting only seasons whose API 
+        payload changed and re-merging only the players they touch"""
+        if years is None:
+            years = list(range(2001, 2024))  # Full range 2001-2023
+        
+        print("🚀 Starting incremental ETL process...\n")
+        
+        season_dir = os.path.join(state_dir, 'seasons')
+        os.makedirs(season_dir, exist_ok=True)
+        manifest = ETLManifest(os.path.join(state_dir, 'manifest.json'))
+        state_files = {name: os.path.join(state_dir, f"{name}.pkl") 
+                       for name in ['nfl_stats', 'college_career', 
+                                    'nfl_career']}
+        # Season-level merge state, appended to when only new NFL 
+        # seasons arrive
+        season_files = {name: os.path.join(state_dir, f"{name}.pkl") 
+                        for name in ['season_data', 'rookie_years', 
+                                     'player_links']}
+        
+        # A different season range or missing state means the previous 
+        # career totals cannot be reused
+        full_rebuild = (not manifest.same_years(years) or 
+                        not all(os.path.exists(path) 
+                                for path in state_files.values()))
+        
+        profiler = self.profiler
+        
+        # College: check every season, re-parse only dirty ones
+        with profiler.stage('extract_college') as stage:
+            with ThreadPoolExecutor(max_workers=self.max_workers
+                                    ) as executor:
+                fetches = {year: self._submit_college_year(executor, year) 
+                           for year in years}
+                results = [self._refresh_college_year(
+                               year, fetches.pop(year), manifest, 
+                               season_dir) 
+                           for year in years]
+            
+            frames = [frame for frame, _ in results if not frame.empty]
+            self.college_stats = (pd.concat(frames, ignore_index=True) 
+                                  if frames else pd.DataFrame())
+            college_players = set().union(*(touched for _, touched 
+                                            in results))
+            dirty_years = sum(1 for _, touched in results if touched)
+            print(f"College seasons re-extracted: "
+                  f"{dirty_years}/{len(years)}")
+            stage['rows_out'] = len(self.college_stats)
+        
+        # NFL: reload the CSV only if its fingerprint changed
+        with profiler.stage('extract_nfl') as stage:
+            nfl_changed = (full_rebuild or 
+                           manifest.source_changed('nfl_csv', 
+                                                   self.csv_file_path))
+            if nfl_changed:
+                previous_nfl = (None if full_rebuild else 
+                                pd.read_pickle(state_files['nfl_stats']))
+                self.extract_nfl_data()
+                self.clean_nfl_data()
+                self.nfl_stats.to_pickle(state_files['nfl_stats'])
+                if os.path.exists(self.csv_file_path):
+                    manifest.update_source('nfl_csv', self.csv_file_path)
+                new_nfl_seasons = (
+                    None if previous_nfl is None else 
+                    self._new_nfl_seasons(previous_nfl, self.nfl_stats))
+            else:
+                print("NFL source unchanged, reusing cleaned NFL data")
+                self.nfl_stats = pd.read_pickle(state_files['nfl_stats'])
+                new_nfl_seasons = self.nfl_stats.iloc[:0]
+            stage['rows_out'] = len(self.nfl_stats)
+        
+        with profiler.stage('clean_college', 
+                            rows_in=len(self.college_stats)) as stage:
+            stage['rows_out'] = len(self.clean_college_data())
+        
+        # Nothing changed since the last run: reuse the saved raw file
+        unchanged = (not full_rebuild and not college_players and 
+                     not nfl_changed and manifest.data.get('raw_file') and 
+                     os.path.exists(manifest.data['raw_file']))
+        
+        with profiler.stage('merge') as stage:
+            if full_rebuild:
+                self.merge_data()
+            else:
+                self.college_career = pd.read_pickle(
+                    state_files['college_career'])
+                self.nfl_career = pd.read_pickle(state_files['nfl_career'])
+                if unchanged:
+                    self.merge_data(college_players=set(), 
+                                    nfl_players=set())
+                else:
+                    self.merge_data(
+                        college_players=college_players, 
+                        nfl_players=None if nfl_changed else set())
+            stage['rows_out'] = len(self.combined_data)
+        
+        # Unchanged college seasons keep every existing link valid, so 
+        # new NFL seasons (if any) can be appended to the saved merge
+        append_seasons = (not full_rebuild and not college_players and 
+                          new_nfl_seasons is not None and 
+                          all(os.path.exists(path) 
+                              for path in season_files.values()))
+        with profiler.stage('merge_seasons') as stage:
+            if append_seasons:
+                self.season_data = pd.read_pickle(
+                    season_files['season_data'])
+                self.rookie_years = pd.read_pickle(
+                    season_files['rookie_years'])
+                self.player_links = pd.read_pickle(
+                    season_files['player_links'])
+                stage['rows_in'] = len(new_nfl_seasons)
+                self.merge_seasons(new_nfl_seasons)
+            else:
+                self.merge_seasons()
+            stage['rows_out'] = len(self.season_data)
+            for name, path in season_files.items():
+                getattr(self, name).to_pickle(path)
+        with profiler.stage('features', 
+                            rows_in=len(self.combined_data)) as stage:
+            stage['rows_out'] = len(self.build_feature_table())
+        with profiler.stage('comparables', 
+                            rows_in=len(self.combined_data)) as stage:
+            stage['rows_out'] = len(self.build_comparable_index())
+        with profiler.stage('success_model', 
+                            rows_in=len(self.combined_data)) as stage:
+            stage['rows_out'] = self.build_success_model().training_rows
+        
+        if unchanged:
+            print(f"\n✅ No source changes, dataset contains "
+                  f"{len(self.combined_data)} players")
+            return manifest.data['raw_file']
+        
+        self.college_career.to_pickle(state_files['college_career'])
+        self.nfl_career.to_pickle(state_files['nfl_career'])
+        
+        print(f"\n✅ Incremental ETL complete! Dataset contains "
+              f"{len(self.combined_data)} players")
+        
         if self.combined_data.empty:
-            print("No data available. Please run the ETL process first.")
+            print("⚠ No data available for analysis.")
             return None
         
-        # Case-insensitive search
-        matches = self.combined_data[
-            self.combined_data['player_name'].str.contains(
-                player_name, case=False, na=False)
-        ]
+        with profiler.stage('save', rows_in=len(self.combined_data)):
+            raw_filename = self.save_raw_data()
+        manifest.data['years'] = sorted(years)
+        manifest.data['raw_file'] = raw_filename
+        manifest.save()
+        return raw_filename
+
+    def run_etl_streaming(self, years: List[int] = None, 
+                          spill_dir: str = 'data/cache/streaming') -> str:
+        """Run the ETL process one college season at a time
+        
+        Each season is extracted, cleaned, folded into running career 
+        and final-season totals and spilled to spill_dir, then dropped, 
+        so memory holds one window of seasons plus per-player totals 
+        no matter how many years are pulled. college_stats stays empty; 
+        load_spilled_college_stats reads the spilled seasons back.
+        """
+        print("🚀 Starting streaming ETL process...\n")
+        
+        os.makedirs(spill_dir, exist_ok=True)
+        for name in os.listdir(spill_dir):
+            if name.startswith('college_') and name.endswith('.pkl'):
+                os.remove(os.path.join(spill_dir, name))
+        self.spill_dir = spill_dir
+        
+        profiler = self.profiler
+        with profiler.stage('stream_college') as stage:
+            self.college_stats = pd.DataFrame()
+            self.college_finals = pd.DataFrame()
+            totals = pd.DataFrame()
+            records = 0
+            for year, season_df in self.iter_college_seasons(years):
+                if season_df.empty:
+                    continue
+                season_df = self._clean_college_frame(season_df)
+                if season_df.empty:
+                    continue
+                compact_frame(season_df, CATEGORY_COLUMNS['college_stats']
+                              ).to_pickle(os.path.join(
+                                  spill_dir, f"college_{year}.pkl"))
+                totals = self._combine_college_partials(
+                    totals, self._partial_college_career(season_df))
+                self.college_finals = self._combine_college_finals(
+                    self.college_finals, 
+                    self._college_final_seasons(season_df))
+                records += len(season_df)
+                del season_df
+            print(f"College data streamed: {records} records for "
+                  f"{len(totals)} players")
+            stage['rows_out'] = records
+        
+        self.college_career = (self._finish_college_career(totals) 
+                               if not totals.empty else pd.DataFrame())
+        del totals
+        
+        with profiler.stage('extract_nfl') as stage:
+            self.extract_nfl_data()
+            stage['rows_out'] = len(self.clean_nfl_data())
+        with profiler.stage('merge') as stage:
+            stage['rows_out'] = len(self.merge_data(college_players=set()))
+        with profiler.stage('merge_seasons') as stage:
+            stage['rows_out'] = len(self.merge_seasons())
+        with profiler.stage('features', 
+                            rows_in=len(self.combined_data)) as stage:
+            stage['rows_out'] = len(self.build_feature_table())
+        with profiler.stage('comparables', 
+                            rows_in=len(self.combined_data)) as stage:
+            stage['rows_out'] = len(self.build_comparable_index())
+        with profiler.stage('success_model', 
+                            rows_in=len(self.combined_data)) as stage:
+            stage['rows_out'] = self.build_success_model().training_rows
+        
+        print(f"\n✅ Streaming ETL complete! Dataset contains "
+              f"{len(self.combined_data)} players")
+        
+        if self.combined_data.empty:
+            print("⚠ No data available for analysis.")
+            return None
+        
+        with profiler.stage('save', rows_in=len(self.combined_data)):
+            return self.save_raw_data()
+
+    def load_spilled_college_stats(self, columns: List[str] = None
+                                   ) -> pd.DataFrame:
+        """Read back the college seasons spilled by a streaming run, 
+        optionally only some columns"""
+        if not self.spill_dir or not os.path.isdir(self.spill_dir):
+            return pd.DataFrame()
+        frames = []
+        for name in sorted(os.listdir(self.spill_dir)):
+            if name.startswith('college_') and name.endswith('.pkl'):
+                frame = pd.read_pickle(os.path.join(self.spill_dir, name))
+                frames.append(frame[columns] if columns else frame)
+        if not frames:
+            return pd.DataFrame()
+        # Seasons were compacted separately; rebuild shared categories
+        return compact_frame(pd.concat(frames, ignore_index=True), 
+                             CATEGORY_COLUMNS['college_stats'])
+
+    def _snapshot_fingerprint(self, years: List[int]) -> Dict:
+        """Describe the sources a snapshot was built from"""
+        csv_fingerprint = (
+            ETLManifest.file_fingerprint(self.csv_file_path, with_hash=False)
+            if os.path.exists(self.csv_file_path) else None)
+        return {'years': sorted(years), 'nfl_csv': csv_fingerprint, 
+                'college_categories': self.college_categories}
+
+    def save_snapshot(self, years: List[int] = None, 
+                      path: str = 'data/cache/snapshot.pkl') -> str:
+        """Persist the merged dataset and search index for warm starts"""
+        if years is None:
+            years = list(range(2001, 2024))  # Full range 2001-2023
+        with self.data_lock:
+            payload = {
+                'fingerprint': self._snapshot_fingerprint(years),
+                'created_at': datetime.now().timestamp(),
+                'college_stats': self.college_stats,
+                'nfl_stats': self.nfl_stats,
+                'season_data': self.season_data,
+                'combined_data': self.combined_data,
+                'player_index': self.player_index,
+                'feature_table': self.feature_table,
+                'comparable_index': self.comparable_index,
+                'success_model': self.success_model
+            }
+            save_snapshot(path, payload)
+        print(f"Snapshot saved to {path}")
+        return path
+
+    def load_snapshot(self, years: List[int] = None, 
+                      path: str = 'data/cache/snapshot.pkl'
+                      ) -> Optional[str]:
+        """Boot from a saved snapshot. Returns 'fresh' if the sources are 
+        unchanged, 'stale' if they may have changed, None if there is no 
+        usable snapshot"""
+        if years is None:
+            years = list(range(2001, 2024))  # Full range 2001-2023
+        payload = load_snapshot(path)
+        if payload is None or payload['combined_data'].empty:
+            return None
+        
+        with self.data_lock:
+            self.college_stats = payload['college_stats']
+            self.nfl_stats = payload['nfl_stats']
+            self.season_data = payload['season_data']
+            self.combined_data = payload['combined_data']
+            self.player_index = payload['player_index']
+            self.feature_table = payload.get('feature_table')
+            self.comparable_index = payload.get('comparable_index')
+            self.success_model = payload.get('success_model')
+        
+        # Closed seasons never change; the current one may have moved on 
+        # since the snapshot if it is older than the season cache TTL
+        age = datetime.now().timestamp() - payload['created_at']
+        current_season_open = any(self.season_ttl(year) is not None 
+                                  for year in years)
+        if (payload['fingerprint'] != self._snapshot_fingerprint(years) or 
+                (current_season_open and age > self.current_season_ttl)):
+            return 'stale'
+        return 'fresh'
+
+    def start_background_rebuild(self, years: List[int] = None
+                                 ) -> threading.Thread:
+        """Rebuild the dataset on a separate pipeline and swap it in 
+        (and re-snapshot it) when done, while searches keep using the 
+        current data"""
+        def rebuild():
+            builder = QBStatsETL(self.api_key, self.csv_file_path, 
+                                 max_workers=self.max_workers, 
+                                 output_format=self.output_format, 
+                                 extra_categories=self.extra_categories)
+            try:
+                if not builder.run_etl_setup(years, incremental=True):
+                    print("\n⚠ Background refresh failed, keeping snapshot")
+                    return
+            except Exception as e:
+                print(f"\n⚠ Background refresh failed: {e}")
+                return
+            finally:
+                builder.close()
+            
+            with self.data_lock:
+                self.college_stats = builder.college_stats
+                self.nfl_stats = builder.nfl_stats
+                self.season_data = builder.season_data
+                self.combined_data = builder.combined_data
+                self.player_index = builder.player_index
+                self.feature_table = builder.feature_table
+                self.comparable_index = builder.comparable_index
+                self.success_model = builder.success_model
+                if self.enricher is not None:
+                    self.enricher.comparable_index = self.comparable_index
+                    self.enricher.success_model = self.success_model
+            self.save_snapshot(years)
+            print("\n🔄 Background refresh complete, using latest data")
+        
+        self.rebuild_thread = threading.Thread(target=rebuild, daemon=True)
+        self.rebuild_thread.start()
+        return self.rebuild_thread
+
+    def search_player(self, player_name: str) -> Optional[pd.Series]:
+        """Search for a specific player's stats"""
+        with self.data_lock:
+            combined_data = self.combined_data
+            if combined_data.empty:
+                print("No data available. Please run the ETL process "
+                      "first.")
+                return None
+            
+            if self.player_index is None:
+                self.build_player_index()
+            player_index = self.player_index
+        
+        # Normalized, typo-tolerant lookup through the prebuilt index
+        matches = combined_data.iloc[player_index.search(player_name)]
         
         if matches.empty:
             print(f"No player found matching '{player_name}'")
@@ -464,9 +1612,15 @@ class QBStatsETL:
             return matches.iloc[0]
 
     def analyze_specific_player(self, player_name: str, 
-                              deepseek_api_key: str = None
+                              deepseek_api_key: str = None, 
+                              screen: bool = False
                               ) -> Optional[pd.Series]:
-        """Analyze a specific player using AI on-demand"""
+        """Analyze a specific player using AI on-demand
+        
+        An explicit request goes to DeepSeek (or its cached analysis); 
+        screen=True lets the local success model answer instead when it 
+        is confident.
+        """
         
         if not deepseek_api_key:
             print("⚠ DeepSeek API key required for AI analysis")
@@ -486,8 +1640,18 @@ class QBStatsETL:
         print(f"\n🤖 Analyzing {result['player_name']} with DeepSeek AI...")
         
         try:
-            enricher = DeepSeekEnricher(deepseek_api_key)
-            analysis = enricher.analyze_player(result)
+            if (self.enricher is None or 
+                    self.enricher.api_key != deepseek_api_key):
+                if self.enricher is not None:
+                    self.enricher.close()
+                self.enricher = DeepSeekEnricher(
+                    deepseek_api_key, 
+                    comparable_index=self._get_comparable_index(), 
+                    success_model=self._get_success_model(), 
+                    compact_prompt=self.compact_prompt, 
+                    token_budget=self.token_budget)
+            analysis = self.enricher.analyze_player(
+                self.with_features(result), screen=screen)
             
             # Combine original data with AI analysis
             enriched_player = result.copy()
@@ -498,7 +1662,9 @@ class QBStatsETL:
             # Save enriched player data immediately
             self.save_enriched_player(enriched_player)
             
-            print("✅ AI analysis complete!")
+            source = analysis.get('analysis_source', 'llm')
+            print(f"✅ Analysis complete "
+                  f"({ANALYSIS_SOURCES.get(source, source)})!")
             return enriched_player
             
         except Exception as e:
@@ -537,6 +1703,39 @@ class QBStatsETL:
         print(f"  Yards/Attempt: "
               f"{player_data.get('college_yards_per_attempt', 0):.1f}")
         
+        # Peer context from the precomputed feature table
+        features = self.with_features(player_data)
+        peer_lines = []
+        for col, display_name in PEER_METRICS:
+            pctile = features.get(f"{col}_pctile")
+            if pctile is None or not features.get(col):
+                continue
+            line = f"  {display_name}: {ordinal(pctile)} overall"
+            conf_pctile = features.get(f"{col}_conf_pctile")
+            if conf_pctile is not None:
+                line += f", {ordinal(conf_pctile)} in conference"
+            peer_lines.append(f"{line} (z {features[f'{col}_z']:+.2f})")
+        if peer_lines:
+            print(f"\nPEER PERCENTILES (vs all QBs / same conference):")
+            print('\n'.join(peer_lines))
+        
+        comparables = self.find_comparables(player_data)
+        if not comparables.empty:
+            print(f"\nCOMPARABLE QBs (closest college stats):")
+            for _, player in comparables.iterrows():
+                print(f"  {player['player_name']} "
+                      f"({player.get('college_team', 'N/A')}): "
+                      f"{player.get('nfl_games', 0):.0f} NFL games, "
+                      f"{player.get('nfl_qb_rating', 0):.1f} rating "
+                      f"(distance {player['distance']:.2f})")
+        
+        success_model = self._get_success_model()
+        if success_model is not None:
+            probability = success_model.predict_proba(
+                player_data.to_frame().T)[0]
+            print(f"\nLOCAL SUCCESS MODEL: {probability * 100:.0f}% "
+                  f"NFL success probability from college stats")
+        
         # NFL stats if available
         nfl_cols = [col for col in player_data.index 
                    if col.startswith('nfl_')]
@@ -602,7 +1801,13 @@ class QBStatsETL:
         
         # AI Analysis section
         if show_ai_analysis and 'success_probability' in player_data.index:
-            print(f"\n🤖 AI ANALYSIS:")
+            source = player_data.get('analysis_source', 'llm')
+            if source == 'llm':
+                print(f"\n🤖 AI ANALYSIS:")
+            else:
+                print(f"\n📊 LOCAL ANALYSIS "
+                      f"({ANALYSIS_SOURCES.get(source, source)}, "
+                      f"no AI call):")
             print(f"  Success Probability: "
                   f"{player_data.get('success_probability', 0)}%")
             
@@ -630,9 +1835,122 @@ class QBStatsETL:
             print(f"\n⚠️ AI analysis not available for this player")
 
 
-def main():
+def print_api_key_help():
+    """Explain how to configure the CollegeFootballData API key"""
+    print("⚠ College Football API key not found!")
+    print("Please set your CFBD_API_KEY environment variable:")
+    print("  Method 1: Create .env file with: CFBD_API_KEY=your_key_here")
+    print("  Method 2: Set environment variable: "
+          "export CFBD_API_KEY=your_key_here")
+
+
+def prepare_data(etl: QBStatsETL, background_refresh: bool = True) -> bool:
+    """Boot from the last snapshot when possible, otherwise run the ETL 
+    (which needs the API key; a snapshot does not)"""
+    snapshot_state = etl.load_snapshot()
+    
+    if snapshot_state == 'fresh':
+        print(f"⚡ Loaded snapshot with {len(etl.combined_data)} "
+              f"players (sources unchanged)")
+    elif snapshot_state == 'stale':
+        if background_refresh and etl.api_key:
+            print(f"⚡ Loaded snapshot with {len(etl.combined_data)} "
+                  f"players, refreshing in the background...")
+            etl.start_background_rebuild()
+        else:
+            print(f"⚡ Loaded snapshot with {len(etl.combined_data)} "
+                  f"players (sources may have changed since)")
+    elif not etl.api_key:
+        print_api_key_help()
+        return False
+    else:
+        raw_file = etl.run_etl_setup(incremental=True)
+        
+        if not raw_file:
+            print("⚠ ETL process failed")
+            return False
+        
+        print(f"\n📄 Raw Data File Created: {raw_file}")
+        etl.save_snapshot()
+    
+    return True
+
+
+def run_query_command(etl: QBStatsETL, sql: Optional[str], 
+                      show_tables: bool = False):
+    """Run an ad-hoc SQL query over the merged QB tables"""
+    if etl.feature_table is None and not etl.combined_data.empty:
+        etl.build_feature_table()  # snapshot from before feature tables
+    engine = QBQueryEngine.from_etl(etl)
+    
+    if show_tables or not sql:
+        print("\nAvailable tables:")
+        for table, columns in engine.tables().items():
+            print(f"  {table}: {', '.join(columns)}")
+        if not sql:
+            return
+    
+    try:
+        start = time.perf_counter()
+        result = engine.query(sql)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+    except (pd.errors.DatabaseError, sqlite3.Error) as e:
+        print(f"⚠ Query failed: {e}")
+        return
+    finally:
+        engine.close()
+    
+    print()
+    print(result.to_string(index=False) if not result.empty 
+          else "(no rows)")
+    print(f"\n{len(result)} row(s) in {elapsed_ms:.1f} ms")
+
+
+def main(argv: List[str] = None):
     """Main function to run the ETL pipeline with on-demand AI analysis"""
     
+    parser = argparse.ArgumentParser(
+        description="College Football QB to NFL Performance ETL")
+    parser.add_argument('--stage-log', metavar='PATH', 
+                        help="Append per-stage ETL timings as JSON lines "
+                             "to PATH (e.g. data/logs/etl_stages.jsonl)")
+    parser.add_argument('--profile', metavar='PATH', 
+                        help="Write a cProfile dump of the ETL run to PATH")
+    parser.add_argument('--output-format', default='csv', 
+                        choices=['csv', 'parquet', 'feather'], 
+                        help="File format of the merged dataset in "
+                             "data/raw/ (parquet and feather keep dtypes "
+                             "and need pyarrow)")
+    parser.add_argument('--compact-prompt', action='store_true', 
+                        help="Send AI analysis requests with the compact, "
+                             "cache-friendly prompt")
+    parser.add_argument('--token-budget', type=int, metavar='TOKENS', 
+                        help="Stop calling DeepSeek once this many tokens "
+                             "have been used this session")
+    parser.add_argument('--local-screen', action='store_true', 
+                        help="Let the local success model answer AI "
+                             "analysis requests it is confident about "
+                             "instead of calling DeepSeek")
+    parser.add_argument('--extra-categories', nargs='+', default=[], 
+                        choices=OPTIONAL_COLLEGE_CATEGORIES, 
+                        metavar='CATEGORY', 
+                        help="Also fetch these college stat categories "
+                             "(rushing, fumbles); each adds one API "
+                             "request per season")
+    subparsers = parser.add_subparsers(dest='command')
+    subparsers.add_parser('search', 
+                          help="Interactive player search (default)")
+    query_parser = subparsers.add_parser(
+        'query', help="Run SQL over the careers, college_seasons and "
+                      "nfl_seasons tables")
+    query_parser.add_argument('sql', nargs='?', help="SQL query to run")
+    query_parser.add_argument('--tables', action='store_true', 
+                              help="List tables and columns")
+    args = parser.parse_args(argv)
+    if args.output_format != 'csv' and not columnar_available():
+        parser.error(f"--output-format {args.output_format} requires "
+                     f"pyarrow (pip install pyarrow)")
+    
     # Configuration
     API_KEY = os.getenv('CFBD_API_KEY')
     DEEPSEEK_API_KEY = os.getenv('DEEPSEEK_API_KEY')
@@ -642,26 +1960,26 @@ def main():
           "AI Analysis")
     print("=" * 75)
     
-    if not API_KEY:
-        print("⚠ College Football API key not found!")
-        print("Please set your CFBD_API_KEY environment variable:")
-        print("  Method 1: Create .env file with: CFBD_API_KEY=your_key_here")
-        print("  Method 2: Set environment variable: "
-              "export CFBD_API_KEY=your_key_here")
-        return
-    
-    # Initialize ETL pipeline
-    etl = QBStatsETL(API_KEY, CSV_FILE)
+    # Initialize ETL pipeline; without an API key it can still serve 
+    # a saved snapshot
+    etl = QBStatsETL(API_KEY, CSV_FILE, stage_log=args.stage_log, 
+                     profile_path=args.profile, 
+                     output_format=args.output_format, 
+                     compact_prompt=args.compact_prompt, 
+                     token_budget=args.token_budget, 
+                     extra_categories=args.extra_categories)
     
-    # Run basic ETL process
     try:
-        raw_file = etl.run_etl_setup()
-        
-        if not raw_file:
-            print("⚠ ETL process failed")
+        if not prepare_data(etl, background_refresh=args.command != 'query'):
             return
         
-        print(f"\n📄 Raw Data File Created: {raw_file}")
+        if args.stage_log and etl.profiler.records:
+            print(f"\n⏱ ETL stages (logged to {args.stage_log}):")
+            print(etl.profiler.summary())
+        
+        if args.command == 'query':
+            run_query_command(etl, args.sql, show_tables=args.tables)
+            return
         
         # Show AI availability status
         if DEEPSEEK_API_KEY:
@@ -708,8 +2026,9 @@ def main():
             
             if ai_analysis:
                 # Get AI-enhanced data
-                result = etl.analyze_specific_player(player_name, 
-                                                   DEEPSEEK_API_KEY)
+                result = etl.analyze_specific_player(
+                    player_name, DEEPSEEK_API_KEY, 
+                    screen=args.local_screen)
                 show_ai = True
             else:
                 # Use basic data
@@ -725,6 +2044,8 @@ def main():
         print(f"⚠ Error running ETL process: {e}")
         import traceback
         traceback.print_exc()
+    finally:
+        etl.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,135 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Columns that identify a row or a season rather than measure play
+NON_METRIC_COLUMNS = {'year', 'nfl_year', 'college_start_year',
+                      'college_end_year', 'nfl_season_number'}
+
+# Feature name suffix -> grouping columns each metric is ranked within
+# (None ranks against every row of the table)
+CAREER_SCOPES = {'': None, '_conf': ['college_conference']}
+COLLEGE_SEASON_SCOPES = {'': ['year'], '_conf': ['year', 'conference']}
+NFL_SEASON_SCOPES = {'': ['nfl_year']}
+
+
+def metric_columns(df: pd.DataFrame) -> List[str]:
+    """Numeric stat columns of a frame"""
+    return [col for col in df.columns
+            if col not in NON_METRIC_COLUMNS and
+            not pd.api.types.is_bool_dtype(df[col]) and
+            pd.api.types.is_numeric_dtype(df[col])]
+
+
+def rank_features(df: pd.DataFrame, metrics: List[str],
+                  scopes: Dict[str, Optional[List[str]]]) -> pd.DataFrame:
+    """Percentile rank (0-100) and z-score of every metric within each
+    scope's groups, as {metric}{suffix}_pctile / {metric}{suffix}_z
+
+    Groups with no spread get a z-score of 0.
+    """
+    values = df[metrics].astype('float64')
+    features = {}
+    for suffix, groups in scopes.items():
+        if groups is not None and not all(col in df.columns
+                                          for col in groups):
+            continue
+        if groups:
+            grouped = values.groupby([df[col] for col in groups],
+                                     observed=True, sort=False)
+            pct = grouped.rank(pct=True) * 100
+            mean = grouped.transform('mean')
+            std = grouped.transform('std', ddof=0)
+        else:
+            pct = values.rank(pct=True) * 100
+            mean = values.mean()
+            std = values.std(ddof=0)
+        z = ((values - mean) / std.replace(0, np.nan)).fillna(0)
+        for metric in metrics:
+            features[f"{metric}{suffix}_pctile"] = (
+                pct[metric].to_numpy(dtype='float32'))
+            features[f"{metric}{suffix}_z"] = (
+                z[metric].to_numpy(dtype='float32'))
+    return pd.DataFrame(features, index=df.index)
+
+
+def ordinal(value: float) -> str:
+    """87.4 -> '87th'"""
+    number = int(round(value))
+    if 10 <= number % 100 <= 20:
+        suffix = 'th'
+    else:
+        suffix = {1: 'st', 2: 'nd', 3: 'rd'}.get(number % 10, 'th')
+    return f"{number}{suffix}"
+
+
+class FeatureTable:
+    """Precomputed peer percentiles and z-scores for every merged QB
+
+    careers ranks each career metric of the merged table against all
+    merged QBs and within the player's college conference.
+    college_seasons ranks every college season within its year and
+    within its year and conference, nfl_seasons every NFL season within
+    its year. Rows are indexed by player name (plus season for the
+    season tables), and a name -> row positions map makes profile
+    lookups O(1) instead of recomputing distributions per query.
+    """
+
+    def __init__(self, careers: pd.DataFrame,
+                 college_seasons: Optional[pd.DataFrame] = None,
+                 nfl_seasons: Optional[pd.DataFrame] = None):
+        self.careers = self._build(careers, CAREER_SCOPES, None)
+        self.college_seasons = self._build(college_seasons,
+                                           COLLEGE_SEASON_SCOPES, 'year')
+        self.nfl_seasons = self._build(nfl_seasons, NFL_SEASON_SCOPES,
+                                       'nfl_year')
+        self.career_rows = self._positions(self.careers)
+        self.college_season_rows = self._positions(self.college_seasons)
+        self.nfl_season_rows = self._positions(self.nfl_seasons)
+
+    @staticmethod
+    def _build(df: Optional[pd.DataFrame],
+               scopes: Dict[str, Optional[List[str]]],
+               season_col: Optional[str]) -> pd.DataFrame:
+        """Feature frame indexed by player_name (and season_col)"""
+        if df is None or df.empty or 'player_name' not in df.columns:
+            return pd.DataFrame()
+        df = df.reset_index(drop=True)
+        features = rank_features(df, metric_columns(df), scopes)
+        keys = df[['player_name'] + ([season_col] if season_col else [])]
+        keys = keys.astype({'player_name': 'str'})
+        features.index = (pd.MultiIndex.from_frame(keys) if season_col
+                          else pd.Index(keys['player_name']))
+        return features
+
+    @staticmethod
+    def _positions(features: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Player name -> row positions in a feature frame"""
+        if features.empty:
+            return {}
+        names = features.index.get_level_values('player_name')
+        codes, uniques = pd.factorize(names)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        return {name: order[bounds[i]:bounds[i + 1]]
+                for i, name in enumerate(uniques)}
+
+    def __len__(self) -> int:
+        return len(self.careers)
+
+    def career(self, player_name: str) -> Optional[pd.Series]:
+        """A player's career features, or None if they were not ranked"""
+        rows = self.career_rows.get(player_name)
+        if rows is None:
+            return None
+        return self.careers.iloc[rows[0]]
+
+    def seasons(self, player_name: str, nfl: bool = False) -> pd.DataFrame:
+        """A player's per-season college (or NFL) features"""
+        table, rows = ((self.nfl_seasons, self.nfl_season_rows) if nfl
+                       else (self.college_seasons, self.college_season_rows))
+        positions = rows.get(player_name)
+        if positions is None:
+            return table.iloc[:0]
+        return table.iloc[positions]
@@ -0,0 +1,156 @@
+import math
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set
+
+# Generational suffixes ignored when matching names ("Jr.", "III", ...)
+NAME_SUFFIXES = {'jr', 'sr', 'ii', 'iii', 'iv', 'v'}
+
+
+def normalize_name(name: str) -> str:
+    """Lowercase a name and strip accents, punctuation and suffixes so
+    "Aidan O'Connell" and "aidan oconnell" compare equal"""
+    text = unicodedata.normalize('NFKD', str(name))
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    text = re.sub(r"['’.]", '', text.lower())
+    tokens = re.sub(r'[^a-z0-9]+', ' ', text).split()
+    kept = [token for token in tokens if token not in NAME_SUFFIXES]
+    return ' '.join(kept or tokens)
+
+
+def _trigrams(token: str) -> Set[str]:
+    """Character trigrams of a token, padded so short tokens still have
+    a few grams"""
+    padded = f"  {token} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class PlayerIndex:
+    """Prebuilt name index for fast player lookups
+
+    Names are normalized and split into tokens. Distinct tokens go into
+    a prefix trie (for "type the start of a name" searches) and a
+    trigram index (for typo-tolerant matching). Lookups return row
+    positions into the frame the index was built from, best match
+    first.
+    """
+
+    def __init__(self, names: Iterable[str], min_similarity: float = 0.5):
+        self.min_similarity = min_similarity
+        self.full_names = defaultdict(list)  # normalized name -> rows
+        self.token_rows = defaultdict(set)  # token -> rows
+        self.trie = {}  # nested dicts, '' key marks a complete token
+        self.trigram_tokens = defaultdict(set)  # trigram -> tokens
+        self.gram_counts = {}  # token -> number of distinct trigrams
+
+        for position, name in enumerate(names):
+            normalized = normalize_name(name)
+            self.full_names[normalized].append(position)
+            for token in normalized.split():
+                self.token_rows[token].add(position)
+
+        for token in self.token_rows:
+            node = self.trie
+            for char in token:
+                node = node.setdefault(char, {})
+            node[''] = token
+            grams = _trigrams(token)
+            self.gram_counts[token] = len(grams)
+            for gram in grams:
+                self.trigram_tokens[gram].add(token)
+
+    def __len__(self) -> int:
+        return sum(len(rows) for rows in self.full_names.values())
+
+    def _prefix_tokens(self, prefix: str) -> List[str]:
+        """All indexed tokens starting with prefix"""
+        node = self.trie
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+
+        tokens = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            for key, child in node.items():
+                if key == '':
+                    tokens.append(child)
+                else:
+                    stack.append(child)
+        return tokens
+
+    def _similar_tokens(self, token: str) -> Dict[str, float]:
+        """Indexed tokens whose trigram overlap (Dice coefficient) with
+        token reaches min_similarity"""
+        grams = _trigrams(token)
+        postings = sorted((self.trigram_tokens.get(gram, set())
+                           for gram in grams), key=len)
+
+        # Dice >= s needs at least s*|q|/(2-s) shared grams, so a match
+        # must contain one of the len(grams) - that + 1 rarest grams.
+        # Only those short posting lists are scanned for candidates.
+        needed = math.ceil(self.min_similarity * len(grams) /
+                           (2 - self.min_similarity))
+        candidates = set()
+        for posting in postings[:max(1, len(grams) - needed + 1)]:
+            candidates |= posting
+
+        similar = {}
+        for candidate in candidates:
+            overlap = sum(1 for posting in postings if candidate in posting)
+            score = 2 * overlap / (len(grams) + self.gram_counts[candidate])
+            if score >= self.min_similarity:
+                similar[candidate] = score
+        return similar
+
+    def search(self, query: str, fuzzy: bool = True,
+               limit: int = 10) -> List[int]:
+        """Row positions matching query, best first
+
+        An exact normalized full-name match wins outright. Otherwise
+        every query token must prefix-match a token of the name; if
+        nothing matches and fuzzy is set, tokens are matched by trigram
+        similarity instead. At most limit fuzzy matches are returned.
+        """
+        normalized = normalize_name(query)
+        if not normalized:
+            return []
+        if normalized in self.full_names:
+            return list(self.full_names[normalized])
+
+        query_tokens = normalized.split()
+
+        # Prefix match on every query token
+        matches = None
+        for token in query_tokens:
+            rows = set()
+            for candidate in self._prefix_tokens(token):
+                rows |= self.token_rows[candidate]
+            matches = rows if matches is None else matches & rows
+            if not matches:
+                break
+        if matches:
+            return sorted(matches)
+        if not fuzzy:
+            return []
+
+        # Typo-tolerant match, ranked by total token similarity
+        scores = None
+        for token in query_tokens:
+            token_scores = defaultdict(float)
+            for candidate, score in self._similar_tokens(token).items():
+                for row in self.token_rows[candidate]:
+                    token_scores[row] = max(token_scores[row], score)
+            if scores is None:
+                scores = dict(token_scores)
+            else:
+                scores = {row: scores[row] + score
+                          for row, score in token_scores.items()
+                          if row in scores}
+            if not scores:
+                return []
+        ranked = sorted(scores, key=lambda row: (-scores[row], row))
+        return ranked[:limit]
@@ -0,0 +1,133 @@
+import cProfile
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+# Counters every stage record reports, even when they stay at zero
+COUNTERS = ['api_calls', 'bytes_downloaded', 'retries', 'cache_hits',
+            'cache_misses', 'cache_revalidated', 'rate_limit_wait_s',
+            'network_s', 'parse_s', 'bytes_saved']
+
+
+class PipelineProfiler:
+    """Per-stage timing and resource instrumentation for the ETL
+
+    Code anywhere in the pipeline (including worker threads) bumps
+    shared counters with count(); stage() measures a block's wall and
+    CPU time, rows in/out, peak traced memory and the counter deltas,
+    and appends them as one JSON line to log_path (None keeps records
+    in memory only). profile() wraps a whole run in cProfile and dumps
+    the stats to profile_path, viewable with snakeviz or convertible to
+    a flamegraph with flameprof. cProfile only sees the calling thread;
+    time spent in worker threads shows up in the network_s, parse_s and
+    rate_limit_wait_s counters instead.
+    """
+
+    def __init__(self, log_path: Optional[str] = None,
+                 profile_path: Optional[str] = None,
+                 trace_memory: Optional[bool] = None):
+        self.log_path = log_path
+        self.profile_path = profile_path
+        # tracemalloc slows allocation-heavy code, so it is only on by
+        # default when stage records are written out
+        self.trace_memory = (log_path is not None if trace_memory is None
+                             else trace_memory)
+        self.run_id = uuid.uuid4().hex[:12]
+        self.counters = {name: 0 for name in COUNTERS}
+        self.records: List[Dict] = []
+        self.lock = threading.Lock()
+
+    def count(self, name: str, value: float = 1):
+        """Add value to a shared counter (thread-safe)"""
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    @contextmanager
+    def timed(self, name: str):
+        """Add the block's wall time in seconds to a counter"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.count(name, time.perf_counter() - start)
+
+    @contextmanager
+    def stage(self, name: str, rows_in: Optional[int] = None):
+        """Measure a pipeline stage. The yielded record can be updated,
+        e.g. record['rows_out'] = len(df), before the block ends"""
+        with self.lock:
+            before = dict(self.counters)
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            tracemalloc.reset_peak()
+
+        record = {'run_id': self.run_id, 'stage': name,
+                  'started_at': datetime.now().isoformat(timespec='seconds'),
+                  'rows_in': rows_in, 'rows_out': None}
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            yield record
+        finally:
+            record['wall_s'] = round(time.perf_counter() - wall_start, 6)
+            record['cpu_s'] = round(time.process_time() - cpu_start, 6)
+            if self.trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                record['peak_mem_bytes'] = peak
+                if started_tracing:
+                    tracemalloc.stop()
+            else:
+                record['peak_mem_bytes'] = None
+            with self.lock:
+                for key, value in self.counters.items():
+                    delta = value - before.get(key, 0)
+                    record[key] = (round(delta, 6) if isinstance(delta, float)
+                                   else delta)
+            self._emit(record)
+
+    def _emit(self, record: Dict):
+        """Keep a stage record and append it to the JSON lines log"""
+        self.records.append(record)
+        if not self.log_path:
+            return
+        os.makedirs(os.path.dirname(self.log_path) or '.', exist_ok=True)
+        with self.lock, open(self.log_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+
+    @contextmanager
+    def profile(self):
+        """Run the block under cProfile if a profile_path is set"""
+        if not self.profile_path:
+            yield
+            return
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            os.makedirs(os.path.dirname(self.profile_path) or '.',
+                        exist_ok=True)
+            profiler.dump_stats(self.profile_path)
+            print(f"cProfile stats written to {self.profile_path}")
+
+    def summary(self) -> str:
+        """One line per recorded stage, for printing after a run"""
+        lines = []
+        for record in self.records:
+            rows = ('' if record['rows_out'] is None
+                    else f", {record['rows_out']} rows")
+            lines.append(f"  {record['stage']}: "
+                         f"{record['wall_s']:.2f}s wall, "
+                         f"{record['cpu_s']:.2f}s CPU, "
+                         f"{record['api_calls']} API calls{rows}")
+        return '\n'.join(lines)
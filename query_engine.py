@@ -0,0 +1,73 @@
+import sqlite3
+from typing import Dict, List
+
+import pandas as pd
+
+# Table -> columns to index (only those present are indexed)
+TABLE_INDEXES = {
+    'careers': ['player_name', 'college_team', 'college_conference',
+                'college_start_year', 'college_end_year'],
+    'college_seasons': ['player_name', 'team', 'conference', 'year'],
+    'nfl_seasons': ['player_name', 'nfl_team', 'nfl_year'],
+    'player_seasons': ['player_id', 'player_name', 'nfl_year',
+                       'college_team', 'college_conference'],
+    'career_features': ['player_name']
+}
+
+
+class QBQueryEngine:
+    """In-memory SQLite database over the merged QB tables
+
+    careers holds the merged college + NFL career rows (combined_data),
+    college_seasons and nfl_seasons the per-season rows they were built
+    from, player_seasons the season-level merge (season_data) and
+    career_features the peer percentiles / z-scores of each career row.
+    Example:
+
+        SELECT player_name, college_yards_per_attempt, nfl_qb_rating
+        FROM careers
+        WHERE college_conference = 'Big Ten'
+          AND college_yards_per_attempt > 8 AND nfl_qb_rating > 90
+    """
+
+    def __init__(self, tables: Dict[str, pd.DataFrame]):
+        self.conn = sqlite3.connect(':memory:')
+        for name, df in tables.items():
+            if df is None or df.empty:
+                continue
+            df.to_sql(name, self.conn, index=False)
+            for col in TABLE_INDEXES.get(name, []):
+                if col in df.columns:
+                    self.conn.execute(
+                        f'CREATE INDEX "idx_{name}_{col}" '
+                        f'ON "{name}" ("{col}")')
+        self.conn.commit()
+
+    @classmethod
+    def from_etl(cls, etl) -> 'QBQueryEngine':
+        """Build the engine from a QBStatsETL's current data"""
+        return cls({
+            'careers': etl.combined_data,
+            'college_seasons': etl.college_stats,
+            'nfl_seasons': etl.nfl_stats,
+            'player_seasons': etl.season_data,
+            'career_features': (etl.feature_table.careers.reset_index()
+                                if etl.feature_table is not None else None)
+        })
+
+    def query(self, sql: str, params: tuple = ()) -> pd.DataFrame:
+        """Run a SQL query and return the result as a DataFrame"""
+        return pd.read_sql_query(sql, self.conn, params=params)
+
+    def tables(self) -> Dict[str, List[str]]:
+        """Loaded tables and their columns"""
+        names = [row[0] for row in self.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' "
+            "ORDER BY name")]
+        return {name: [row[1] for row in self.conn.execute(
+                    f'PRAGMA table_info("{name}")')]
+                for name in names}
+
+    def close(self):
+        """Release the in-memory database"""
+        self.conn.close()
@@ -0,0 +1,101 @@
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter shared by concurrent requests"""
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = rate  # tokens added per second
+        self.capacity = capacity  # maximum burst size
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        """Add tokens earned since the last refill (caller holds the lock)"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity,
+                          self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    def acquire(self, tokens: float = 1.0):
+        """Block until the requested number of tokens is available"""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait_time = (tokens - self.tokens) / self.rate
+            time.sleep(wait_time)
+
+    def try_acquire(self, tokens: float = 1.0) -> bool:
+        """Take tokens if available right now, without blocking"""
+        with self.lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                return True
+            return False
+
+
+class AdaptiveRateLimiter(TokenBucket):
+    """Token bucket that backs off when the provider throttles us and 
+    speeds back up while requests succeed (additive increase, 
+    multiplicative decrease)"""
+
+    def __init__(self, rate: float, capacity: int = 1, 
+                 min_rate: float = 0.1, max_rate: float = 20.0, 
+                 increase: float = 0.5):
+        super().__init__(rate, capacity)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase  # tokens/sec added per success
+        self.blocked_until = 0.0  # monotonic time set by Retry-After
+
+    def acquire(self, tokens: float = 1.0):
+        """Wait out any Retry-After pause, then take tokens"""
+        while True:
+            with self.lock:
+                pause = self.blocked_until - time.monotonic()
+            if pause <= 0:
+                break
+            time.sleep(pause)
+        super().acquire(tokens)
+
+    def record_success(self):
+        """Raise the allowed rate after a successful request"""
+        with self.lock:
+            self._refill()
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def record_throttle(self, retry_after: Optional[float] = None):
+        """Halve the allowed rate and honor the server's Retry-After"""
+        with self.lock:
+            self._refill()
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0.0
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, 
+                                         time.monotonic() + retry_after)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Convert a Retry-After header (seconds or HTTP date) to seconds"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
@@ -0,0 +1,245 @@
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from rate_limiter import AdaptiveRateLimiter, TokenBucket, parse_retry_after
+
+# Statuses worth retrying: throttling and transient server/gateway errors
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def make_session(pool_size: int = 10,
+                 headers: Optional[Dict[str, str]] = None
+                 ) -> requests.Session:
+    """Keep-alive session whose connection pool holds pool_size
+    connections per host, asking for gzip-compressed responses"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Accept-Encoding'] = 'gzip, deflate'
+    session.headers.update(headers or {})
+    return session
+
+
+def never_sent(error: requests.exceptions.RequestException) -> bool:
+    """True if a request failed before reaching the server (connection
+    refused, DNS failure or connect timeout), so resending it can not
+    repeat its effect"""
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], 'reason', None) if error.args else None
+    return isinstance(reason, NewConnectionError)
+
+
+class CircuitOpenError(requests.exceptions.RequestException):
+    """Raised instead of calling a service whose circuit is open"""
+
+
+class CircuitBreaker:
+    """Stops calling a failing service for a while
+
+    After failure_threshold consecutive failures the circuit opens and
+    calls fail fast for reset_timeout seconds. Then a single probe call
+    is let through (half-open): success closes the circuit, failure
+    opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = 5,
+                 reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None  # monotonic time the circuit opened
+        self.probing = False
+        self.lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """'closed', 'open' or 'half_open'"""
+        with self.lock:
+            if self.opened_at is None:
+                return 'closed'
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return 'open'
+            return 'half_open'
+
+    def allow(self) -> bool:
+        """True if a call may go out now"""
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return False
+            if self.probing:
+                return False
+            self.probing = True
+            return True
+
+    def record_success(self):
+        """Close the circuit"""
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        """Count a failure, opening the circuit at the threshold or when
+        the half-open probe fails"""
+        with self.lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+
+class ResilientHTTPClient:
+    """Rate-limited HTTP calls with retries and a circuit breaker
+
+    Every attempt first takes a token from rate_limiter. Connection
+    errors, timeouts and RETRY_STATUSES are retried up to max_retries
+    times, sleeping for the server's Retry-After when given and
+    otherwise for a fully jittered exponential backoff. A Retry-After
+    longer than backoff_max is not waited out; the response is returned
+    at once so the caller's error path runs. 429s also slow an
+    AdaptiveRateLimiter down; successes speed it back up. Server
+    errors and connection failures count towards the circuit breaker
+    (breaker=None disables it). on_event(name, value), e.g. a
+    PipelineProfiler's count, receives api_calls, retries,
+    rate_limit_wait_s, network_s and backoff_s.
+
+    A request sent with idempotent=False (one that is billed or changes
+    state, like an LLM completion) is only resent when the server can
+    not have acted on it: a connection that failed before the request
+    went out, a 429, or a 503 with Retry-After. Read timeouts and other
+    server errors end it after the first attempt.
+    """
+
+    def __init__(self, rate_limiter: TokenBucket,
+                 session: Optional[requests.Session] = None,
+                 max_retries: int = 3, backoff_base: float = 0.5,
+                 backoff_max: float = 30.0,
+                 breaker: Optional[CircuitBreaker] = None,
+                 timeout: float = 30,
+                 on_event: Optional[Callable[[str, float], None]] = None):
+        self.rate_limiter = rate_limiter
+        self.session = session
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breaker = breaker
+        self.timeout = timeout
+        self.on_event = on_event
+
+    def _event(self, name: str, value: float = 1):
+        """Report a counter to on_event"""
+        if self.on_event is not None:
+            self.on_event(name, value)
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for a 0-based attempt"""
+        return random.uniform(0, min(self.backoff_max,
+                                     self.backoff_base * 2 ** attempt))
+
+    def _wait_before_retry(self, attempt: int,
+                           retry_after: Optional[float] = None):
+        """Sleep for Retry-After or the backoff before the next attempt"""
+        delay = (retry_after if retry_after is not None
+                 else self.backoff(attempt))
+        self._event('retries')
+        self._event('backoff_s', delay)
+        time.sleep(delay)
+
+    def request(self, method: str, url: str, idempotent: bool = True,
+                **kwargs) -> requests.Response:
+        """Send a request, retrying transient failures
+
+        Returns the last response (callers still raise_for_status) or
+        raises the last connection error / CircuitOpenError.
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        sender = self.session if self.session is not None else requests
+        adaptive = isinstance(self.rate_limiter, AdaptiveRateLimiter)
+
+        for attempt in range(self.max_retries + 1):
+            if self.breaker is not None and not self.breaker.allow():
+                raise CircuitOpenError(f"Circuit open for {url}")
+
+            start = time.perf_counter()
+            self.rate_limiter.acquire()
+            sent = time.perf_counter()
+            self._event('rate_limit_wait_s', sent - start)
+            try:
+                response = sender.request(method, url, **kwargs)
+            except (requests.exceptions.ConnectionError,
+                    requests.exceptions.Timeout) as error:
+                self._event('network_s', time.perf_counter() - sent)
+                if self.breaker is not None:
+                    self.breaker.record_failure()
+                if (attempt == self.max_retries or
+                        not (idempotent or never_sent(error))):
+                    raise
+                self._wait_before_retry(attempt)
+                continue
+            except requests.exceptions.RequestException:
+                # Not retryable (bad encoding, redirect loop...), but it
+                # still has to settle a half-open probe
+                self._event('network_s', time.perf_counter() - sent)
+                if self.breaker is not None:
+                    self.breaker.record_failure()
+                raise
+            self._event('network_s', time.perf_counter() - sent)
+            self._event('api_calls')
+
+            if response.status_code in RETRY_STATUSES:
+                retry_after = parse_retry_after(
+                    response.headers.get('Retry-After'))
+                # Waiting out a Retry-After beyond backoff_max would park
+                # this thread (and every other one, via the limiter) for
+                # too long: hand the response back instead
+                too_long = (retry_after is not None and
+                            retry_after > self.backoff_max)
+                if too_long:
+                    retry_after = self.backoff_max
+                if response.status_code == 429:
+                    # The service is up, just busy: slow down instead of
+                    # tripping the breaker
+                    if adaptive:
+                        self.rate_limiter.record_throttle(retry_after)
+                    if self.breaker is not None:
+                        self.breaker.record_success()
+                elif self.breaker is not None:
+                    self.breaker.record_failure()
+                # A non-idempotent request may have been processed by a
+                # failing server; only throttling proves it was not
+                resend = idempotent or response.status_code == 429 or (
+                    response.status_code == 503 and retry_after is not None)
+                if attempt < self.max_retries and resend and not too_long:
+                    self._wait_before_retry(attempt, retry_after)
+                    continue
+                return response
+
+            if self.breaker is not None:
+                self.breaker.record_success()
+            if adaptive:
+                self.rate_limiter.record_success()
+            return response
+
+    def close(self):
+        """Close the session's pooled connections"""
+        if self.session is not None:
+            self.session.close()
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """GET with retries"""
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url: str, idempotent: bool = True,
+             **kwargs) -> requests.Response:
+        """POST with retries"""
+        return self.request('POST', url, idempotent=idempotent, **kwargs)
@@ -0,0 +1,195 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional
+
+
+class ResponseCache:
+    """Persistent, content-addressed cache for API responses
+
+    Entries are keyed by URL + params and point at a body file named by
+    the SHA-256 of its content, so identical payloads are stored once.
+    Each entry carries its own TTL (None = never expires) plus the ETag
+    and Last-Modified validators used for conditional revalidation.
+    When the cache grows past max_bytes the least recently used entries
+    are evicted.
+    """
+
+    def __init__(self, cache_dir: str = 'data/cache/http',
+                 max_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.body_dir = os.path.join(cache_dir, 'bodies')
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.dirty = False
+        self.counters = {'hits': 0, 'misses': 0, 'stale': 0,
+                         'revalidated': 0, 'evictions': 0}
+
+        os.makedirs(self.body_dir, exist_ok=True)
+        self.index = self._load_index()
+
+    @staticmethod
+    def make_key(url: str, params: Dict = None) -> str:
+        """Build a stable cache key from the URL and request params"""
+        canonical = json.dumps([url, sorted((params or {}).items())],
+                               default=str)
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def _load_index(self) -> Dict[str, Dict]:
+        """Load the entry index from disk, starting empty if unreadable"""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"Response cache index unreadable, starting fresh: {e}")
+            return {}
+
+    def _body_path(self, digest: str) -> str:
+        return os.path.join(self.body_dir, digest[:2], digest)
+
+    def get(self, url: str, params: Dict = None) -> Optional[Dict]:
+        """Return the cached entry (with 'body' and 'fresh') or None"""
+        key = self.make_key(url, params)
+        with self.lock:
+            entry = self.index.get(key)
+            if entry is None:
+                self.counters['misses'] += 1
+                return None
+
+            try:
+                with open(self._body_path(entry['digest']), 'rb') as f:
+                    body = f.read()
+            except OSError:
+                # Body vanished from disk - treat as a miss
+                del self.index[key]
+                self.dirty = True
+                self.counters['misses'] += 1
+                return None
+
+            entry['last_access'] = time.time()
+            self.dirty = True
+            fresh = (entry['expires_at'] is None or
+                     entry['expires_at'] > time.time())
+            self.counters['hits' if fresh else 'stale'] += 1
+            return dict(entry, key=key, body=body, fresh=fresh)
+
+    @staticmethod
+    def conditional_headers(entry: Optional[Dict]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for an entry"""
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def store(self, url: str, params: Dict, body: bytes,
+              headers: Dict = None, ttl: Optional[float] = None):
+        """Store a response body; ttl=None keeps the entry forever"""
+        headers = headers or {}
+        digest = hashlib.sha256(body).hexdigest()
+        body_path = self._body_path(digest)
+
+        with self.lock:
+            if not os.path.exists(body_path):
+                os.makedirs(os.path.dirname(body_path), exist_ok=True)
+                tmp_path = f"{body_path}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    f.write(body)
+                os.replace(tmp_path, body_path)
+
+            now = time.time()
+            self.index[self.make_key(url, params)] = {
+                'url': url,
+                'params': params or {},
+                'digest': digest,
+                'size': len(body),
+                'etag': headers.get('ETag'),
+                'last_modified': headers.get('Last-Modified'),
+                'stored_at': now,
+                'last_access': now,
+                'expires_at': None if ttl is None else now + ttl
+            }
+            self.dirty = True
+            self._evict()
+            self._save_index()
+
+    def revalidate(self, entry: Dict, headers: Dict = None,
+                   ttl: Optional[float] = None):
+        """Extend a stale entry after the server answered 304"""
+        headers = headers or {}
+        with self.lock:
+            current = self.index.get(entry['key'])
+            if current is None:
+                return
+            now = time.time()
+            current['expires_at'] = None if ttl is None else now + ttl
+            current['etag'] = headers.get('ETag') or current.get('etag')
+            current['last_modified'] = (headers.get('Last-Modified') or
+                                        current.get('last_modified'))
+            self.counters['revalidated'] += 1
+            self.dirty = True
+            self._save_index()
+
+    def _evict(self):
+        """Drop least recently used entries until under max_bytes
+        (caller holds the lock)"""
+        sizes = {e['digest']: e['size'] for e in self.index.values()}
+        total = sum(sizes.values())
+        if total <= self.max_bytes:
+            return
+
+        for key, entry in sorted(self.index.items(),
+                                 key=lambda item: item[1]['last_access']):
+            if total <= self.max_bytes:
+                break
+            del self.index[key]
+            self.counters['evictions'] += 1
+            digest = entry['digest']
+            # Bodies are shared between entries with identical content
+            if not any(e['digest'] == digest for e in self.index.values()):
+                total -= sizes[digest]
+                try:
+                    os.remove(self._body_path(digest))
+                except OSError:
+                    pass
+
+    def _save_index(self):
+        """Atomically write the entry index (caller holds the lock)"""
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.index, f)
+        os.replace(tmp_path, self.index_path)
+        self.dirty = False
+
+    def flush(self):
+        """Persist access times gathered since the last write"""
+        with self.lock:
+            if self.dirty:
+                self._save_index()
+
+    def clear(self):
+        """Remove every cached entry and body"""
+        with self.lock:
+            for entry in self.index.values():
+                try:
+                    os.remove(self._body_path(entry['digest']))
+                except OSError:
+                    pass
+            self.index = {}
+            self._save_index()
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and current cache size"""
+        with self.lock:
+            stats = dict(self.counters)
+            stats['entries'] = len(self.index)
+            stats['bytes'] = sum({e['digest']: e['size']
+                                  for e in self.index.values()}.values())
+        return stats
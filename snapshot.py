@@ -0,0 +1,34 @@
+import os
+import pickle
+from typing import Dict, Optional
+
+# Bump when the snapshot payload layout changes
+SNAPSHOT_VERSION = 3
+
+
+def save_snapshot(path: str, payload: Dict) -> str:
+    """Atomically pickle a snapshot payload to path"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({'version': SNAPSHOT_VERSION, **payload}, f,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+    return path
+
+
+def load_snapshot(path: str) -> Optional[Dict]:
+    """Load a snapshot payload, or None if missing or incompatible"""
+    try:
+        with open(path, 'rb') as f:
+            payload = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except (pickle.UnpicklingError, EOFError, AttributeError,
+            ImportError, OSError) as e:
+        print(f"Snapshot unreadable, ignoring it: {e}")
+        return None
+
+    if payload.get('version') != SNAPSHOT_VERSION:
+        return None
+    return payload
@@ -0,0 +1,181 @@
+import os
+import sys
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# pyarrow is optional - without it outputs fall back to CSV
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+FILE_EXTENSIONS = {'csv': 'csv', 'parquet': 'parquet', 'feather': 'feather'}
+
+# Explicit schema for the merged career table. NFL columns outside this
+# list are passed through as float64.
+COMBINED_DTYPES: Dict[str, str] = {
+    'player_name': 'string',
+    'college_team': 'string',
+    'college_conference': 'string',
+    'college_start_year': 'int64',
+    'college_end_year': 'int64',
+    'college_pass_attempts': 'int64',
+    'college_pass_completions': 'int64',
+    'college_pass_yards': 'int64',
+    'college_pass_tds': 'int64',
+    'college_interceptions': 'int64',
+    'college_completion_pct': 'float64',
+    'college_td_int_ratio': 'float64',
+    'college_yards_per_attempt': 'float64',
+    'nfl_games': 'float64',
+    'nfl_pass_attempts': 'float64',
+    'nfl_pass_completions': 'float64',
+    'nfl_pass_yards': 'float64',
+    'nfl_pass_tds': 'float64',
+    'nfl_interceptions': 'float64',
+    'nfl_qb_rating': 'float64',
+    'nfl_year': 'float64',
+    'nfl_completion_percentage': 'float64',
+    'nfl_td_int_ratio': 'float64',
+    'nfl_yards_per_attempt': 'float64'
+}
+
+
+# Float columns holding rates/averages; never turned into integers
+RATE_COLUMN_HINTS = ('percentage', 'pct', 'ratio', 'per_attempt', 'rating')
+
+
+def frame_bytes(df: pd.DataFrame) -> int:
+    """Deep memory footprint of a frame in bytes"""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def compact_frame(df: pd.DataFrame,
+                  categorical: List[str] = ()) -> pd.DataFrame:
+    """Shrink a frame's dtypes without changing its values
+
+    Columns in categorical become categories (rebuilt, so frames from
+    different seasons end up with the same sorted categories); other
+    text columns become plain strings, interned when object-backed.
+    Integer columns and integral count columns get the smallest
+    fitting integer type. Rates and other fractional floats stay
+    float64: float32 would turn 7.7 into 7.699999809265137 in every
+    saved file and query result.
+    """
+    casts = {}
+    for col in df.columns:
+        series = df[col]
+        if col in categorical:
+            casts[col] = pd.Categorical(series.astype('str'))
+        elif isinstance(series.dtype, pd.CategoricalDtype):
+            casts[col] = series.astype('str')
+        elif series.dtype == object:
+            casts[col] = series.map(
+                lambda value: sys.intern(value)
+                if isinstance(value, str) else value)
+        elif pd.api.types.is_bool_dtype(series):
+            continue
+        elif pd.api.types.is_integer_dtype(series):
+            casts[col] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series):
+            values = series.to_numpy()
+            integral = (not any(hint in col for hint in RATE_COLUMN_HINTS)
+                        and len(values) > 0 and np.isfinite(values).all()
+                        and (values == np.round(values)).all())
+            if integral:
+                casts[col] = pd.to_numeric(series.astype('int64'),
+                                           downcast='integer')
+    return df.assign(**casts) if casts else df
+
+
+def widen_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """int64/float64 copy of a compacted frame's numeric columns, so
+    group sums cannot overflow a narrow integer type"""
+    casts = {}
+    for col in df.columns:
+        if pd.api.types.is_bool_dtype(df[col]):
+            continue
+        if pd.api.types.is_integer_dtype(df[col]):
+            casts[col] = 'int64'
+        elif pd.api.types.is_float_dtype(df[col]):
+            casts[col] = 'float64'
+    return df.astype(casts) if casts else df
+
+
+def compact_report(name: str, before: int, after: int) -> str:
+    """One-line summary of the bytes compact_frame saved"""
+    saved = before - after
+    share = saved / before * 100 if before else 0.0
+    return (f"{name}: {before / 1e6:.2f} MB -> {after / 1e6:.2f} MB "
+            f"({saved / 1e6:.2f} MB, {share:.0f}% saved)")
+
+
+def columnar_available() -> bool:
+    """True if pyarrow is installed"""
+    return pa is not None
+
+
+def apply_schema(df: pd.DataFrame,
+                 dtypes: Dict[str, str] = None) -> pd.DataFrame:
+    """Cast known columns to their schema dtype and drop index leftovers
+    such as 'Unnamed: 0'"""
+    dtypes = COMBINED_DTYPES if dtypes is None else dtypes
+    df = df.loc[:, ~df.columns.astype(str).str.startswith('Unnamed')]
+    casts = {}
+    for col in df.columns:
+        if col in dtypes:
+            casts[col] = dtypes[col]
+        elif pd.api.types.is_numeric_dtype(df[col]):
+            casts[col] = 'float64'
+    return df.astype(casts)
+
+
+def save_table(df: pd.DataFrame, path_stem: str, fmt: str = 'parquet',
+               compression: Optional[str] = 'zstd') -> str:
+    """Write a frame as CSV, Parquet or Feather and return the path
+
+    Parquet supports snappy/gzip/zstd/brotli compression, Feather
+    supports lz4/zstd. Columnar formats need pyarrow; without it the
+    frame is written as CSV instead.
+    """
+    if fmt not in FILE_EXTENSIONS:
+        raise ValueError(f"Unsupported output format: {fmt}")
+    if fmt != 'csv' and not columnar_available():
+        print(f"pyarrow not installed, writing CSV instead of {fmt}")
+        fmt = 'csv'
+
+    path = f"{path_stem}.{FILE_EXTENSIONS[fmt]}"
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    df = apply_schema(df)
+
+    if fmt == 'csv':
+        df.to_csv(path, index=False)
+    else:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        if fmt == 'parquet':
+            pq.write_table(table, path, compression=compression or 'none')
+        else:
+            feather.write_feather(table, path,
+                                  compression=compression or 'uncompressed')
+    return path
+
+
+def load_table(path: str, columns: List[str] = None) -> pd.DataFrame:
+    """Load a saved table, reading only the requested columns"""
+    if path.endswith('.csv'):
+        return apply_schema(pd.read_csv(path, usecols=columns))
+    if not columnar_available():
+        raise ImportError(f"pyarrow is required to read {path}")
+
+    if path.endswith('.parquet'):
+        table = pq.read_table(path, columns=columns)
+    elif path.endswith('.feather'):
+        table = feather.read_table(path, columns=columns,
+                                   memory_map=True)
+    else:
+        raise ValueError(f"Unsupported file type: {path}")
+    return table.to_pandas()
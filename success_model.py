@@ -0,0 +1,113 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from comparables import COMPARABLE_FEATURES
+
+# A merged career counts as an NFL success when fitting the model: at
+# least a season's worth of games at a starter-level passer rating
+SUCCESS_MIN_GAMES = 16
+SUCCESS_MIN_RATING = 85.0
+
+
+def success_labels(careers: pd.DataFrame) -> np.ndarray:
+    """1 for careers meeting the success bar, else 0"""
+    if not {'nfl_games', 'nfl_qb_rating'} <= set(careers.columns):
+        return np.zeros(len(careers))
+    games = pd.to_numeric(careers['nfl_games'], errors='coerce')
+    rating = pd.to_numeric(careers['nfl_qb_rating'], errors='coerce')
+    return ((games >= SUCCESS_MIN_GAMES) &
+            (rating >= SUCCESS_MIN_RATING)).to_numpy(dtype='float64')
+
+
+class SuccessModel:
+    """Logistic regression of NFL success on college career stats
+
+    Features are the standardized college stats the comparable-QB index
+    uses, so only information available at draft time goes in. The
+    model is fit with L2-regularized Newton steps (IRLS) in NumPy and
+    scores a whole frame with one matrix product. ambiguous() marks the
+    predictions worth a second opinion from the LLM.
+    """
+
+    def __init__(self, features: List[str] = None, l2: float = 1.0,
+                 max_iter: int = 25, tol: float = 1e-6):
+        self.features = COMPARABLE_FEATURES if features is None else features
+        self.l2 = l2
+        self.max_iter = max_iter
+        self.tol = tol
+        self.weights = None  # intercept first
+        self.mean = None
+        self.std = None
+        self.training_rows = 0
+        self.base_rate = None
+        self.log_loss = None
+
+    def _design(self, frame: pd.DataFrame) -> np.ndarray:
+        """Standardized feature matrix with a leading intercept column;
+        missing stats sit at the training mean"""
+        columns = [
+            pd.to_numeric(frame[col], errors='coerce').to_numpy(
+                dtype='float64', na_value=np.nan)
+            if col in frame.columns else np.full(len(frame), np.nan)
+            for col in self.features]
+        values = np.array(columns).reshape(len(columns), len(frame)).T
+        z = np.nan_to_num((values - self.mean) / self.std, nan=0.0)
+        return np.column_stack([np.ones(len(frame)), z])
+
+    def fit(self, careers: pd.DataFrame,
+            labels: Optional[np.ndarray] = None) -> 'SuccessModel':
+        """Fit on merged careers (labels default to success_labels)"""
+        self.features = [col for col in self.features
+                         if col in careers.columns]
+        y = success_labels(careers) if labels is None else labels
+        values = careers[self.features].to_numpy(dtype='float64',
+                                                 na_value=np.nan)
+        if len(values):
+            self.mean = np.nanmean(values, axis=0)
+            self.std = np.nanstd(values, axis=0)
+            self.std[~(self.std > 0)] = 1.0
+        else:
+            self.mean = np.zeros(len(self.features))
+            self.std = np.ones(len(self.features))
+        X = self._design(careers)
+
+        # The intercept is not penalized
+        penalty = np.full(X.shape[1], self.l2)
+        penalty[0] = 0.0
+        weights = np.zeros(X.shape[1])
+        for _ in range(self.max_iter):
+            p = 1.0 / (1.0 + np.exp(-X @ weights))
+            gradient = X.T @ (p - y) + penalty * weights
+            hessian = (X.T * (p * (1 - p))) @ X + np.diag(penalty)
+            hessian[0, 0] += 1e-9  # keeps all-one-class fits solvable
+            step = np.linalg.solve(hessian, gradient)
+            weights -= step
+            if np.abs(step).max() < self.tol:
+                break
+        self.weights = weights
+
+        p = np.clip(self._probabilities(X), 1e-12, 1 - 1e-12)
+        self.training_rows = len(y)
+        self.base_rate = float(y.mean()) if len(y) else None
+        self.log_loss = (float(-np.mean(y * np.log(p) +
+                                        (1 - y) * np.log(1 - p)))
+                         if len(y) else None)
+        return self
+
+    def _probabilities(self, X: np.ndarray) -> np.ndarray:
+        return 1.0 / (1.0 + np.exp(-X @ self.weights))
+
+    def predict_proba(self, frame: pd.DataFrame) -> np.ndarray:
+        """Probability of NFL success for every row"""
+        if self.weights is None:
+            raise ValueError("SuccessModel has not been fit")
+        return self._probabilities(self._design(frame))
+
+    @staticmethod
+    def ambiguous(probabilities: np.ndarray,
+                  band: Tuple[float, float] = (0.2, 0.8)) -> np.ndarray:
+        """Mask of predictions strictly inside band"""
+        low, high = band
+        return (probabilities > low) & (probabilities < high)
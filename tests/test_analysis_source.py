@@ -0,0 +1,86 @@
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from deepseek_enrichment import DeepSeekEnricher
+from enriched_store import EnrichedStore
+
+PLAYER = pd.Series({'player_name': 'Joe Burrow',
+                    'college_completion_pct': 68.8,
+                    'college_td_int_ratio': 4.9,
+                    'college_yards_per_attempt': 9.4,
+                    'nfl_games': 16, 'nfl_qb_rating': 108.3})
+
+
+class ConfidentModel:
+    """Success model stand-in that is always sure"""
+
+    def predict_proba(self, frame: pd.DataFrame) -> np.ndarray:
+        return np.full(len(frame), 0.95)
+
+
+def make_enricher(tmp_path, response=None) -> DeepSeekEnricher:
+    enricher = DeepSeekEnricher(
+        'key', cache_path=str(tmp_path / 'cache.sqlite'),
+        success_model=ConfidentModel())
+    enricher._make_api_call = lambda prompt: response
+    return enricher
+
+
+def test_cached_llm_analysis_beats_the_local_screen(tmp_path):
+    response = {'choices': [{'message': {'content':
+                '{"success_probability": 71, "overall_assessment": "LLM"}'
+                }}]}
+    enricher = make_enricher(tmp_path, response)
+    try:
+        assert (enricher.analyze_player(PLAYER)['analysis_source'] ==
+                'local_model')
+        llm = enricher.analyze_player(PLAYER, screen=False)
+        assert llm['analysis_source'] == 'llm'
+
+        # The LLM answer is now cached, so screening no longer hides it
+        enricher._make_api_call = None
+        cached = enricher.analyze_player(PLAYER)
+        assert cached['analysis_source'] == 'llm'
+        assert cached['success_probability'] == 71
+    finally:
+        enricher.close()
+
+
+def test_failed_call_is_marked_fallback(tmp_path):
+    enricher = make_enricher(tmp_path)
+    try:
+        analysis = enricher.analyze_player(PLAYER, screen=False)
+        assert analysis['analysis_source'] == 'fallback'
+        frame = enricher.score_fallback_frame(PLAYER.to_frame().T)
+        assert list(frame['analysis_source']) == ['fallback']
+    finally:
+        enricher.close()
+
+
+def test_store_keeps_analysis_source_and_upgrades_old_stores(tmp_path):
+    db_path = str(tmp_path / 'enriched.sqlite')
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE analyses (id INTEGER PRIMARY KEY "
+                 "AUTOINCREMENT, player_name TEXT NOT NULL, analyzed_at "
+                 "TEXT NOT NULL, success_probability REAL, "
+                 "college_to_nfl_transition TEXT, overall_assessment TEXT, "
+                 "comparisons TEXT, key_strengths TEXT, key_weaknesses "
+                 "TEXT, statistical_indicators TEXT, development_areas "
+                 "TEXT, stats TEXT)")
+    conn.commit()
+    conn.close()
+
+    store = EnrichedStore(db_path)
+    try:
+        store.append([{'player_name': 'Joe Burrow', 'success_probability': 71,
+                       'analysis_source': 'llm'},
+                      {'player_name': 'Joe Burrow', 'success_probability': 95,
+                       'analysis_source': 'local_model'}])
+        assert list(store.history('Joe Burrow')['analysis_source']) == [
+            'llm', 'local_model']
+        assert list(store.latest('Joe Burrow')['analysis_source']) == [
+            'local_model']
+    finally:
+        store.close()
@@ -0,0 +1,40 @@
+from concurrent.futures import Future
+
+import pytest
+
+from main import COLLEGE_CATEGORIES, QBStatsETL
+
+
+def done(result) -> Future:
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+def passing_row(stat_type: str, stat: str, category: str = 'passing'):
+    return {'playerId': 1, 'player': 'Joe Burrow', 'team': 'LSU',
+            'conference': 'SEC', 'position': 'QB', 'category': category,
+            'statType': stat_type, 'stat': stat}
+
+
+def test_passing_is_the_only_default_category():
+    etl = QBStatsETL(None, 'missing.csv', cache_dir=None)
+    assert etl.college_categories == COLLEGE_CATEGORIES == ['passing']
+    with pytest.raises(ValueError):
+        QBStatsETL(None, 'missing.csv', cache_dir=None,
+                   extra_categories=['kicking'])
+
+
+def test_failed_optional_category_keeps_passing_stats():
+    etl = QBStatsETL(None, 'missing.csv', cache_dir=None,
+                     extra_categories=['rushing', 'fumbles'])
+    # rushing failed
+    fetches = [done([passing_row('ATT', '527'), passing_row('YDS', '5671')]),
+               done(None), done([passing_row('FUM', '3', 'fumbles')])]
+
+    season = etl._extract_college_year(2019, fetches)
+    assert season[['pass_attempts', 'pass_yards', 'rush_yards',
+                   'fumbles']].values.tolist() == [[527, 5671, 0, 3]]
+
+    fetches[0] = done(None)
+    assert etl._extract_college_year(2019, fetches).empty
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from comparables import COMPARABLE_FEATURES, ComparableIndex
+
+
+def make_careers(count: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    careers = pd.DataFrame(rng.normal(50, 15, (count, len(
+        COMPARABLE_FEATURES))).round(1), columns=COMPARABLE_FEATURES)
+    careers['player_name'] = [f"QB {i}" for i in range(count)]
+    careers['nfl_games'] = rng.integers(0, 150, count)
+    careers['nfl_qb_rating'] = rng.normal(85, 10, count).round(1)
+    careers.loc[rng.random(count) < 0.1, 'college_td_int_ratio'] = np.nan
+    return careers
+
+
+def test_comparables_batch_matches_single_searches():
+    careers = make_careers(1500)
+    index = ComparableIndex(careers)
+    # Indexed players (excluded from their own list) and new ones
+    queries = pd.concat([careers.sample(300, random_state=1),
+                         make_careers(100, seed=1).assign(
+                             player_name=lambda df: 'New ' + df.player_name)])
+
+    assert index.comparables_batch(queries) == [
+        index.comparables(row) for _, row in queries.iterrows()]
+
+
+def test_comparables_batch_with_few_players():
+    careers = make_careers(3)
+    index = ComparableIndex(careers)
+    assert index.comparables_batch(careers) == [
+        index.comparables(row) for _, row in careers.iterrows()]
+    assert all(len(found) == 2 for found in index.comparables_batch(careers))
+    assert ComparableIndex(careers.head(0)).comparables_batch(careers) == [
+        [], [], []]
@@ -0,0 +1,113 @@
+import pytest
+import requests
+from urllib3.exceptions import MaxRetryError, NewConnectionError
+
+from rate_limiter import TokenBucket
+from resilient_http import (CircuitBreaker, CircuitOpenError,
+                           ResilientHTTPClient)
+
+
+class FakeResponse:
+    def __init__(self, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+class ScriptedSession:
+    """Session whose request() raises or returns the scripted outcomes"""
+
+    def __init__(self, outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+
+def make_client(outcomes, breaker, max_retries=0):
+    session = ScriptedSession(outcomes)
+    client = ResilientHTTPClient(TokenBucket(rate=1000, capacity=10),
+                                 session=session, max_retries=max_retries,
+                                 backoff_base=0.0, breaker=breaker)
+    return client, session
+
+
+def refused() -> requests.exceptions.ConnectionError:
+    reason = NewConnectionError(None, 'Connection refused')
+    return requests.exceptions.ConnectionError(
+        MaxRetryError(None, 'http://example.test', reason))
+
+
+def test_probe_failing_with_other_request_exception_reopens_circuit():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    client, session = make_client([
+        requests.exceptions.ConnectionError('down'),
+        requests.exceptions.ChunkedEncodingError('truncated body'),
+        FakeResponse(200)
+    ], breaker)
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get('http://example.test')
+    # Half-open probe fails with a non-connection error
+    with pytest.raises(requests.exceptions.ChunkedEncodingError):
+        client.get('http://example.test')
+    assert not breaker.probing
+
+    # The next probe goes out and closes the circuit again
+    assert client.get('http://example.test').status_code == 200
+    assert breaker.state == 'closed'
+    assert session.calls == 3
+
+
+def test_open_circuit_fails_fast():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60.0)
+    client, session = make_client(
+        [requests.exceptions.ConnectionError('down')], breaker)
+
+    with pytest.raises(requests.exceptions.ConnectionError):
+        client.get('http://example.test')
+    with pytest.raises(CircuitOpenError):
+        client.get('http://example.test')
+    assert session.calls == 1
+
+
+@pytest.mark.parametrize('failure', [
+    requests.exceptions.ReadTimeout('no reply'),
+    requests.exceptions.ConnectionError('Connection aborted'),
+    FakeResponse(500),
+    FakeResponse(503)
+])
+def test_non_idempotent_post_is_not_resent_after_the_server_got_it(failure):
+    client, session = make_client([failure, FakeResponse(200)], None,
+                                  max_retries=3)
+    if isinstance(failure, Exception):
+        with pytest.raises(type(failure)):
+            client.post('http://example.test', idempotent=False)
+    else:
+        response = client.post('http://example.test', idempotent=False)
+        assert response.status_code == failure.status_code
+    assert session.calls == 1
+
+    # The same failure is retried for an idempotent request
+    client, session = make_client([failure, FakeResponse(200)], None,
+                                  max_retries=3)
+    assert client.post('http://example.test').status_code == 200
+    assert session.calls == 2
+
+
+@pytest.mark.parametrize('failure', [
+    refused(),
+    requests.exceptions.ConnectTimeout('no connection'),
+    FakeResponse(429),
+    FakeResponse(503, {'Retry-After': '0'})
+])
+def test_non_idempotent_post_is_resent_when_the_server_never_ran_it(failure):
+    client, session = make_client([failure, FakeResponse(200)], None,
+                                  max_retries=3)
+    response = client.post('http://example.test', idempotent=False)
+    assert response.status_code == 200
+    assert session.calls == 2
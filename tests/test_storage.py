@@ -0,0 +1,49 @@
+import pandas as pd
+
+from main import QBStatsETL
+from storage import compact_frame, save_table, widen_numeric
+
+NFL_CSV = """Player,Tm,Year,G,Att,Cmp,Yds,TD,Int,Rate
+Kurt Warner,STL,2001,16,546,375,4830,36,22,101.4
+Tom Brady,NWE,2007,16,578,398,4806,50,8,117.2
+Joe Burrow,CIN,2021,16,520,366,4611,34,14,108.3
+Jared Goff,DET,2023,17,605,407,4575,30,12,97.9
+"""
+
+
+def test_compacted_rates_save_with_source_values(tmp_path):
+    source = pd.DataFrame({
+        'player_name': ['A', 'B', 'C'],
+        'college_yards_per_attempt': [7.7, 8.25, 6.1],
+        'nfl_qb_rating': [101.7, 88.3, 79.9],
+        'nfl_games': [16.0, 3.0, 0.0]
+    })
+    compacted = widen_numeric(compact_frame(source, ['player_name']))
+    path = save_table(compacted, str(tmp_path / 'combined'), fmt='csv')
+
+    saved = pd.read_csv(path, dtype=str)
+    for col in ['college_yards_per_attempt', 'nfl_qb_rating']:
+        assert list(saved[col]) == [repr(value) for value in source[col]]
+    assert list(saved['nfl_games'].astype(float)) == list(source['nfl_games'])
+
+
+def test_cleaned_nfl_stats_save_with_source_values(tmp_path):
+    csv_path = tmp_path / 'nfl.csv'
+    csv_path.write_text(NFL_CSV)
+    source = pd.read_csv(csv_path)
+
+    etl = QBStatsETL('test-key', str(csv_path), cache_dir=None)
+    try:
+        etl.extract_nfl_data()
+        etl.clean_nfl_data()
+        path = save_table(etl.nfl_stats, str(tmp_path / 'nfl_out'),
+                          fmt='csv')
+    finally:
+        etl.close()
+
+    saved = pd.read_csv(path)
+    assert list(saved['nfl_qb_rating']) == list(source['Rate'])
+    assert list(saved['nfl_yards_per_attempt']) == list(
+        source['Yds'] / source['Att'])
+    assert list(saved['nfl_completion_percentage']) == list(
+        source['Cmp'] / source['Att'] * 100)
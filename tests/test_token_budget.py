@@ -0,0 +1,41 @@
+import pytest
+import requests
+
+from deepseek_enrichment import DeepSeekEnricher
+
+
+@pytest.fixture
+def enricher():
+    enricher = DeepSeekEnricher('key', cache_path=None, token_budget=100000,
+                                max_tokens=500)
+    yield enricher
+    enricher.close()
+
+
+def fail_with(error):
+    def post(url, **kwargs):
+        assert kwargs['idempotent'] is False
+        raise error
+    return post
+
+
+def test_read_timeout_counts_the_worst_case(enricher):
+    enricher.http.post = fail_with(requests.exceptions.ReadTimeout('slow'))
+    assert enricher._make_api_call('prompt') is None
+
+    tokens = enricher.tokens
+    assert tokens.reserved == 0
+    assert tokens.completion_tokens == 500
+    assert tokens.prompt_tokens > 0
+    assert len(tokens.calls) == 1
+
+
+def test_unsent_call_releases_its_reservation(enricher):
+    enricher.http.post = fail_with(
+        requests.exceptions.ConnectTimeout('no connection'))
+    assert enricher._make_api_call('prompt') is None
+
+    tokens = enricher.tokens
+    assert tokens.reserved == 0
+    assert tokens.used == 0
+    assert tokens.calls == []
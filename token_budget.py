@@ -0,0 +1,89 @@
+import math
+import threading
+from typing import Dict, List, Optional
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count for budgeting before a call (~4 characters
+    per token for English and JSON)"""
+    return math.ceil(len(text) / 4)
+
+
+class TokenBudget:
+    """Thread-safe token accounting for LLM calls
+
+    Every call reserves its worst case (estimated prompt plus the
+    completion cap) before it is sent and settles to the usage the API
+    reports afterwards, so concurrent calls can never overrun limit
+    (None = unlimited). Per-call usage is kept in calls.
+    """
+
+    def __init__(self, limit: Optional[int] = None):
+        self.limit = limit
+        self.lock = threading.Lock()
+        self.reserved = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_tokens = 0  # prompt tokens served from the prefix cache
+        self.refused = 0
+        self.calls: List[Dict[str, int]] = []
+
+    @property
+    def used(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def remaining(self) -> Optional[int]:
+        """Tokens left after settled and in-flight calls"""
+        if self.limit is None:
+            return None
+        with self.lock:
+            return max(self.limit - self.used - self.reserved, 0)
+
+    def reserve(self, tokens: int) -> bool:
+        """Hold tokens for a call; False if that would exceed the limit"""
+        with self.lock:
+            if (self.limit is not None and
+                    self.used + self.reserved + tokens > self.limit):
+                self.refused += 1
+                return False
+            self.reserved += tokens
+            return True
+
+    def settle(self, reserved: int, usage: Optional[Dict],
+               estimated_prompt: int = 0) -> Dict[str, int]:
+        """Release a reservation and record the call's actual usage
+        (the estimate stands in if the API reported none)"""
+        usage = usage or {}
+        call = {
+            'prompt_tokens': int(usage.get('prompt_tokens',
+                                           estimated_prompt)),
+            'completion_tokens': int(usage.get('completion_tokens', 0)),
+            'cached_tokens': int(usage.get('prompt_cache_hit_tokens', 0))
+        }
+        with self.lock:
+            self.reserved -= reserved
+            self.prompt_tokens += call['prompt_tokens']
+            self.completion_tokens += call['completion_tokens']
+            self.cached_tokens += call['cached_tokens']
+            self.calls.append(call)
+        return call
+
+    def release(self, reserved: int):
+        """Drop a reservation for a call that never completed"""
+        with self.lock:
+            self.reserved -= reserved
+
+    def summary(self) -> str:
+        """One-line usage report"""
+        with self.lock:
+            calls = len(self.calls)
+            line = (f"{calls} calls, {self.prompt_tokens:,} prompt "
+                    f"({self.cached_tokens:,} cached) + "
+                    f"{self.completion_tokens:,} completion tokens")
+            if calls:
+                line += f", {self.used / calls:,.0f} per call"
+            if self.limit is not None:
+                line += f", budget {self.used:,}/{self.limit:,}"
+            if self.refused:
+                line += f", {self.refused} calls refused"
+        return line